@@ -0,0 +1,65 @@
+"""
+Measures the cost of the ability lookups performed by the combat AI on each of
+its turns.
+
+Compares the previous behavior, where every lookup deep-copied the Ability,
+against the current behavior, where the frozen master Ability is shared by
+reference.
+
+Run from the repository root:
+    python benchmarks/bench_ai_turn.py
+"""
+import sys
+import timeit
+
+sys.path.insert(0, 'src')
+
+from loguru import logger
+
+logger.remove()
+
+import game  # noqa: E402  Loading the engine loads all assets
+from game.cache import from_cache  # noqa: E402
+
+ENTITY_ID = 4  # Intelligent Cobol: three abilities, one of which has a cost
+REPEATS = 5
+NUMBER = 2000
+
+
+def ai_turn_lookups(entity) -> None:
+    """
+    Perform the same Ability lookups that the AI performs while choosing a move.
+    """
+    entity.usable_abilities
+    entity.offensive_abilities
+    for ability in entity.ability_controller.abilities:
+        entity.ability_controller.is_ability_usable(ability)
+
+
+def measure(entity) -> float:
+    return min(timeit.repeat(lambda: ai_turn_lookups(entity),
+                             repeat=REPEATS, number=NUMBER)) / NUMBER
+
+
+def main() -> None:
+    ability_manager = from_cache("managers.AbilityManager")
+    entity = from_cache("managers.EntityManager").get_instance(ENTITY_ID)
+
+    # Emulate per-lookup deepcopy by routing get_ref through get_instance
+    ability_manager.get_ref = ability_manager.get_instance
+    try:
+        before = measure(entity)
+    finally:
+        del ability_manager.get_ref
+
+    after = measure(entity)
+
+    print(f"AI turn ability lookups ({len(entity.ability_controller.abilities)}"
+          f" abilities)")
+    print(f"  deepcopy per lookup : {before * 1e6:10.2f} us/turn")
+    print(f"  shared reference    : {after * 1e6:10.2f} us/turn")
+    print(f"  speedup             : {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
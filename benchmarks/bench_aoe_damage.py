@@ -0,0 +1,75 @@
+"""
+Measures damage resolution for an area-of-effect Ability as the number of
+targets grows.
+
+Compares calling calculate_damage_to_entity once per target against a single
+call to calculate_damage_to_entities, and checks that both produce the same
+damage for every target.
+
+Run from the repository root:
+    python benchmarks/bench_aoe_damage.py
+"""
+import sys
+import timeit
+
+sys.path.insert(0, 'src')
+
+from loguru import logger
+
+logger.remove()
+
+import game  # noqa: E402  Loading the engine loads all assets
+from game.cache import from_cache  # noqa: E402
+from game.systems.combat.combat_engine.combat_helpers import \
+    calculate_damage_to_entity, calculate_damage_to_entities  # noqa: E402
+
+ENTITY_ID = 4  # Intelligent Cobol: wears a helmet
+ABILITY_NAME = "Heavy Swing"
+TARGET_COUNTS = [10, 100, 1000]
+REPEATS = 5
+
+
+def build_targets(count: int) -> list:
+    """
+    Spawn targets with two different loadouts: every other target has its
+    head slot disabled.
+    """
+    entity_manager = from_cache("managers.EntityManager")
+    targets = [entity_manager.get_instance(ENTITY_ID) for _ in range(count)]
+
+    for target in targets[::2]:
+        target.equipment_controller["head"] = False
+
+    return targets
+
+
+def scalar(ability, targets) -> list[int]:
+    return [calculate_damage_to_entity(ability, t) for t in targets]
+
+
+def main() -> None:
+    ability = from_cache("managers.AbilityManager").get_ref(ABILITY_NAME)
+
+    print(f"AoE damage resolution for '{ABILITY_NAME}'")
+    print(f"  {'targets':>8} {'per-target':>14} {'batched':>14} {'speedup':>9}")
+
+    for count in TARGET_COUNTS:
+        targets = build_targets(count)
+
+        if scalar(ability, targets) != \
+                calculate_damage_to_entities(ability, targets):
+            raise AssertionError("Batched damage does not match scalar damage!")
+
+        number = max(1, 2000 // count)
+        before = min(timeit.repeat(lambda: scalar(ability, targets),
+                                   repeat=REPEATS, number=number)) / number
+        after = min(timeit.repeat(
+            lambda: calculate_damage_to_entities(ability, targets),
+            repeat=REPEATS, number=number)) / number
+
+        print(f"  {count:>8} {before * 1e3:>11.3f} ms {after * 1e3:>11.3f} ms "
+              f"{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Measures complete headless fights across roster sizes, effect loads and
+equipment loads.
+
+Each scenario pits a roster of Intelligent Cobols, led by an AI-controlled copy
+of the player, against an equally sized roster of Intelligent Cobols. Every
+combatant starts with a number of long-lived ResourceEffects in each phase and a
+number of equipped items. Combatants are given enough health that nobody
+falls, so every fight runs for a fixed number of turn cycles. Fights are
+seeded, so every run of a scenario plays out the same fight.
+
+For each scenario, reports:
+- time per turn cycle (best of several runs, with tracing off)
+- net memory blocks allocated per turn cycle. CPython has no allocation
+  counter, so this is sys.getallocatedblocks() growth; it exposes leaks and
+  objects that pile up over a fight rather than short-lived churn
+- peak traced memory over the fight
+
+Results are compared against the stored baselines in
+benchmarks/baselines/bench_combat.json, and the script exits non-zero if any
+scenario's time per turn cycle regresses beyond the tolerance. Baselines are
+machine-specific; regenerate them with --save after intentional changes.
+
+Run from the repository root:
+    python benchmarks/bench_combat.py [--quick] [--save] [--tolerance 0.25]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, 'src')
+
+from loguru import logger
+
+logger.remove()
+
+import game  # noqa: E402  Loading the engine loads all assets
+from game.cache import delete_element, get_cache  # noqa: E402
+from game.structures.enums import CombatPhase  # noqa: E402
+from game.systems.combat.combat_engine.combat_engine import CombatEngine  # noqa: E402
+from game.systems.combat.combat_engine.simulator import \
+    HeadlessStateController, Outcome  # noqa: E402
+from game.systems.combat.effect import ResourceEffect  # noqa: E402
+from game.systems.entity.prototype import EntityPrototype  # noqa: E402
+
+ENTITY_ID = 4  # Intelligent Cobol
+SEED = 1234
+HEALTH = 10 ** 7
+REPEATS = 3
+
+# Roster size: turn cycles per fight
+TURN_CYCLES = {1: 100, 5: 20, 50: 2}
+
+ROSTER_SIZES = [1, 5, 50]
+EFFECTS_PER_ENTITY = [0, 4, 16]
+EQUIPMENT = [(), (("head", 14),), (("head", 14), ("chest", 6), ("weapon", 13))]
+QUICK_ROSTER_SIZES = [1, 5]
+
+BASELINE_PATH = os.path.join("benchmarks", "baselines", "bench_combat.json")
+
+
+def scenario_name(size: int, effects: int, equipment: tuple) -> str:
+    return f"{size}v{size}/effects={effects}/equipment={len(equipment)}"
+
+
+def equip(entity, effects: int, equipment: tuple) -> None:
+    """
+    Load an entity with effects and equipment.
+    """
+    for slot in entity.equipment_controller.enabled_slots:
+        entity.equipment_controller[slot] = None
+
+    for slot, item_id in equipment:
+        entity.equipment_controller[slot] = item_id
+
+    health = entity.resource_controller.primary_resource
+    health.max = health.value = HEALTH
+
+    # A regenerating effect per phase that outlasts the fight
+    for i in range(effects):
+        phase = list(CombatPhase)[i % len(CombatPhase)]
+        effect = ResourceEffect("Stamina", 1, "{target} recovered stamina.",
+                                duration=10 ** 9)
+        effect.assign(entity, entity)
+        entity.acquire_effect(effect, phase)
+
+
+def run_fight(size: int, effects: int, equipment: tuple) -> tuple[int, float]:
+    """
+    Run a single seeded fight.
+
+    Returns: The number of turn cycles and the elapsed time, in seconds
+    """
+    cache = get_cache()
+    player = cache["player"]
+    cache["player"] = EntityPrototype(player).spawn()
+    previous_controller = game.state_device_controller
+    controller = HeadlessStateController()
+    game.state_device_controller = controller
+
+    engine = None
+    try:
+        engine = CombatEngine([ENTITY_ID] * (size - 1), [ENTITY_ID] * size,
+                              seed=SEED, auto_resolve=True)
+        for entity in engine._allies + engine._enemies:
+            equip(entity, effects, equipment)
+
+        start = time.perf_counter()
+        outcome = controller.run(engine, TURN_CYCLES[size])
+        elapsed = time.perf_counter() - start
+
+    finally:
+        if engine is not None:
+            for condition in engine._termination_conditions:
+                condition.unbind()
+            engine.battle_state.release()
+        delete_element("combat")
+        cache["player"] = player
+        game.state_device_controller = previous_controller
+
+    if outcome != Outcome.TIMEOUT:
+        raise AssertionError(f"A {size}v{size} fight ended early: {outcome}")
+
+    return TURN_CYCLES[size], elapsed
+
+
+def measure(size: int, effects: int, equipment: tuple) -> dict[str, float]:
+    times = []
+    for _ in range(REPEATS):
+        cycles, elapsed = run_fight(size, effects, equipment)
+        times.append(elapsed / cycles)
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    cycles, _ = run_fight(size, effects, equipment)
+    gc.collect()
+    blocks_per_cycle = (sys.getallocatedblocks() - blocks) / cycles
+
+    tracemalloc.start()
+    run_fight(size, effects, equipment)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "turn_cycles": cycles,
+        "ms_per_turn_cycle": min(times) * 1e3,
+        "blocks_per_turn_cycle": blocks_per_cycle,
+        "peak_kib": peak / 1024
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the largest roster size")
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown relative to the baseline")
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"  {'scenario':<30} {'cycles':>6} {'ms/cycle':>10} {'baseline':>10}"
+          f" {'blocks/cycle':>13} {'peak KiB':>10}")
+
+    for size in QUICK_ROSTER_SIZES if args.quick else ROSTER_SIZES:
+        for effects in EFFECTS_PER_ENTITY:
+            for equipment in EQUIPMENT:
+                name = scenario_name(size, effects, equipment)
+                result = measure(size, effects, equipment)
+                results[name] = result
+
+                baseline = baselines.get(name, {}).get("ms_per_turn_cycle")
+                if baseline is not None and result["ms_per_turn_cycle"] > \
+                        baseline * (1 + args.tolerance):
+                    regressions.append(name)
+
+                print(f"  {name:<30} {result['turn_cycles']:>6} "
+                      f"{result['ms_per_turn_cycle']:>10.3f} "
+                      f"{baseline if baseline is not None else float('nan'):>10.3f} "
+                      f"{result['blocks_per_turn_cycle']:>13.1f} "
+                      f"{result['peak_kib']:>10.1f}")
+
+    if args.save:
+        baselines.update(results)
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baselines to {BASELINE_PATH}")
+
+    if regressions:
+        print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Measures the construction cost of common FiniteStateDevice subclasses.
+
+Also compares an Event whose states are registered per-instance through
+closures against an equivalent Event whose states are declared at class level.
+
+Run from the repository root:
+    python benchmarks/bench_state_device.py
+"""
+import sys
+import timeit
+
+sys.path.insert(0, 'src')
+
+from loguru import logger
+
+logger.remove()
+
+import game  # noqa: E402  Loading the engine loads all assets
+from game.structures.enums import InputType  # noqa: E402
+from game.structures.messages import ComponentFactory  # noqa: E402
+from game.structures.state_device import FiniteStateDevice  # noqa: E402
+from game.systems.combat.effect import ResourceEffect  # noqa: E402
+from game.systems.event.add_item_event import AddItemEvent  # noqa: E402
+from game.systems.event.events import Event, ResourceEvent, TextEvent  # noqa: E402
+
+REPEATS = 5
+NUMBER = 5000
+
+
+class ClosureTextEvent(Event):
+    """
+    A TextEvent that registers its states per-instance.
+    """
+
+    def __init__(self, text: str):
+        super().__init__(InputType.ANY, self.States, self.States.DEFAULT)
+        self.text = text
+
+        @FiniteStateDevice.state_logic(self, self.States.DEFAULT, InputType.ANY)
+        def logic(_: any) -> None:
+            self.set_state(self.States.TERMINATE)
+
+        @FiniteStateDevice.state_content(self, self.States.DEFAULT)
+        def content() -> dict:
+            return ComponentFactory.get([self.text])
+
+
+CASES = {
+    "TextEvent": lambda: TextEvent("Hello"),
+    "TextEvent (per-instance states)": lambda: ClosureTextEvent("Hello"),
+    "ResourceEvent": lambda: ResourceEvent("Health", -1),
+    "AddItemEvent": lambda: AddItemEvent(0, 1),
+    "ResourceEffect": lambda: ResourceEffect("Health", -1, "{target} hurt"),
+}
+
+
+def main() -> None:
+    print("Construction cost")
+    for name, factory in CASES.items():
+        t = min(timeit.repeat(factory, repeat=REPEATS, number=NUMBER)) / NUMBER
+        print(f"  {name:<32}: {t * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
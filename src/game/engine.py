@@ -18,6 +18,7 @@ from game.systems.event.view_summary_event import *
 
 from .cache import get_config, set_config
 from .formatting import register_arguments, register_style
+from .structures.state_device import state_tracer
 from .systems.entity.entities import Player
 
 conf_dir_path: str = "./config/"
@@ -202,6 +203,10 @@ class Engine:
 
         get_cache()["player_location"] = get_config()["room"]["default_id"]
 
+        if "debug" in get_config() and \
+                get_config()["debug"].get("state_trace_path"):
+            state_tracer.enable(get_config()["debug"]["state_trace_path"])
+
         self._load_assets()
         self._debug_init_late()
 
@@ -216,6 +221,8 @@ class Engine:
         for manager in get_cache()['managers']:
             get_cache()['managers'][manager].save()
 
+        state_tracer.disable()
+
     def __init__(self):
         self._startup()  # Call startup logic.
 
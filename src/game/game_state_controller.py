@@ -6,7 +6,10 @@ StateDevices are executed in LIFO order. Adding a StateDevice to the stack of
 devices mid-state does not interrupt the state (states within FiniteStateDevices
 are atomic).
 """
+import collections
 import dataclasses
+import time
+from typing import Callable
 
 from loguru import logger
 
@@ -29,43 +32,109 @@ class StackState:
     recoverable: bool | None = None
 
 
+@dataclasses.dataclass
+class AdvanceStats:
+    """
+    A record of a single run of the silent-state scheduler.
+    """
+    steps: int = 0  # Number of silent inputs delivered
+    elapsed: float = 0.0  # Wall-clock time spent, in seconds
+    devices_burned: int = 0  # Number of dead devices popped from the stack
+
+
+class SilentStateBudgetExceeded(RuntimeError):
+    """
+    Raised when silent states fail to reach a non-silent state within the
+    scheduler's step or time budget.
+    """
+
+
 class GameStateController:
     """
     An object that manages game states.
 
     GameStateController is singleton class that transforms sd.StateDevices into
     Frames and delivering user inputs to the correct sd.StateDevices.
+
+    Before a frame is produced, silent states are advanced in a tight loop until
+    a device that expects input is on top of the stack. The loop is bounded by
+    a maximum step count and a wall-clock budget, both of which may be set via
+    the 'scheduler' section of the config.
     """
 
-    def __init__(self):
+    MAX_SILENT_STEPS: int = 10000
+    SILENT_TIME_BUDGET: float = 5.0  # Seconds
+    STATS_HISTORY_LENGTH: int = 100
+    TRACE_LENGTH: int = 8  # States reported when the silent budget runs out
+
+    def __init__(self, max_silent_steps: int = None,
+                 silent_time_budget: float = None):
+        if max_silent_steps is None:
+            max_silent_steps = self._scheduler_config(
+                "max_silent_steps", self.MAX_SILENT_STEPS)
+
+        if silent_time_budget is None:
+            silent_time_budget = self._scheduler_config(
+                "silent_time_budget", self.SILENT_TIME_BUDGET)
+
+        self.max_silent_steps: int = max_silent_steps
+        self.silent_time_budget: float = silent_time_budget
+
+        # Stats for the most recent scheduler runs, oldest first
+        self.advance_stats: collections.deque[AdvanceStats] = \
+            collections.deque(maxlen=self.STATS_HISTORY_LENGTH)
+
+        # Set when a device reports its death via set_dead. Dead devices are
+        # only burned when this is set.
+        self._death_reported: bool = False
+        self._burned_count: int = 0
+
         self.state_device_stack: list[tuple[sd.StateDevice, StackState]] = []
-        self.add_state_device(
-            room.room_manager.get_room(
-                cache.get_cache()["player_location"]
-            )
-        )
+        self._add_default_device()
 
     # Built-ins
 
     # Private functions
 
+    @staticmethod
+    def _scheduler_config(key: str, default: any) -> any:
+        """
+        Read a value from the 'scheduler' section of the config, falling back
+        to the given default if it is not set.
+        """
+        config = cache.get_config()
+
+        if config is None or "scheduler" not in config:
+            return default
+
+        return config["scheduler"].get(key, default)
+
     def _burn_dead_devices(self) -> None:
         """
         Pops the state device stack until a live state device is on top
         """
+        self._death_reported = False
+
         while len(
                 self.state_device_stack
                 ) > 0 and self.state_device_stack[-1][1].dead:
 
-
             self._pop_state_device()
+            self._burned_count += 1
 
         if len(self.state_device_stack) < 1:
-            self.add_state_device(
-                room.room_manager.get_room(
-                    cache.get_cache()["player_location"]
-                )
+            self._add_default_device()
+
+    def _add_default_device(self) -> None:
+        """
+        Add the device that the stack falls back to when it is empty: the room
+        that the player is currently in.
+        """
+        self.add_state_device(
+            room.room_manager.get_room(
+                cache.get_cache()["player_location"]
             )
+        )
 
     def _get_state_device(self, idx: int = -1) -> sd.StateDevice:
         """
@@ -82,7 +151,8 @@ class GameStateController:
         if len(self.state_device_stack) < 1:
             raise ValueError("No sd.StateDevice loaded!")
 
-        self._burn_dead_devices()
+        if self._death_reported:
+            self._burn_dead_devices()
 
         return self.state_device_stack[idx][0]
 
@@ -96,28 +166,70 @@ class GameStateController:
         logger.info(f"Popping state device: {str(self.state_device_stack[-1])}")
         return self.state_device_stack.pop()[0]
 
-    def _advance_if_silent(self):
+    def _advance_if_silent(self, until: Callable[[], bool] = None
+                           ) -> AdvanceStats:
+        """
+        Deliver empty inputs to the top device until it is no longer silent.
 
-        # There has got to be a better way to do this.
-        while self._get_state_device().input_type == enums.InputType.SILENT:
-            logger.info(
-                f"Detected silent state in device: "
-                f"{self._get_state_device()}. Skipping..."
-            )
-            if hasattr(self._get_state_device(), "current_state"):
-                logger.info(f"State: {self._get_state_device().current_state}")
+        Args:
+            until: If given, the advance also stops as soon as this returns
+                True. It is checked after each input is delivered.
+
+        Returns: The stats of this run, which are also stored in advance_stats
+        """
+        stats = AdvanceStats()
+        self.advance_stats.append(stats)
+        self._burned_count = 0
+
+        start = time.perf_counter()
+        deadline = start + self.silent_time_budget
+
+        # The most recent states, reported if the budget runs out. Revisiting a
+        # state is not a sign of a loop by itself (a CombatEngine passes
+        # through the same states once per phase), so only the budget decides.
+        trace: collections.deque[tuple[str, any]] = collections.deque(
+            maxlen=self.TRACE_LENGTH)
+
+        device = self._get_state_device()
+        while device.input_type == enums.InputType.SILENT:
+            state = getattr(device, "current_state", None)
+            trace.append((device.__class__.__name__, state))
+
+            if stats.steps >= self.max_silent_steps \
+                    or time.perf_counter() > deadline:
+                stats.elapsed = time.perf_counter() - start
+                stats.devices_burned = self._burned_count
+                raise SilentStateBudgetExceeded(
+                    f"Silent states failed to settle after {stats.steps} steps "
+                    f"and {stats.elapsed:.3f}s! Last states: "
+                    f"{' -> '.join(f'{name}.{s}' for name, s in trace)}"
+                )
 
-            if not self._get_state_device().input(""):
+            if not device.input(""):
                 logger.error("Input rejected while in a Silent state!")
-                logger.debug(repr(self._get_state_device()))
-                logger.debug(self._get_state_device().to_frame())
+                logger.debug(repr(device))
+                logger.debug(device.to_frame())
 
-                if hasattr(self._get_state_device(), "current_state"):
-                    logger.info(
-                        f"State: {self._get_state_device().current_state}")
-                    logger.debug(self._get_state_device().state_data)
+                if state is not None:
+                    logger.info(f"State: {state}")
+                    logger.debug(device.state_data)
                 raise RuntimeError("Input rejected while in Silent State!")
 
+            stats.steps += 1
+            if until is not None and until():
+                break
+
+            device = self._get_state_device()
+
+        stats.elapsed = time.perf_counter() - start
+        stats.devices_burned = self._burned_count
+
+        if stats.steps > 0:
+            logger.debug(f"Advanced {stats.steps} silent steps in "
+                         f"{stats.elapsed:.6f}s")
+
+        return stats
+
     # Public functions
     def deliver_input(self, user_input: any) -> bool:
         """
@@ -131,6 +243,12 @@ class GameStateController:
         """
 
         if self._get_state_device().validate_input(user_input):
+
+            # Inputs delivered during a combat are recorded for its replay log
+            combat = cache.from_cache("combat")
+            if combat is not None:
+                combat.record_input(user_input)
+
             self._get_state_device().input(user_input)
             return True
 
@@ -165,9 +283,12 @@ class GameStateController:
 
         Returns: None
         """
-        logger.info(f"Marking {self._get_state_device()} as dead...")
+        logger.info(f"Marking {self.state_device_stack[-1][0]} as dead...")
         self.state_device_stack[-1][1].dead = val
 
+        if val:
+            self._death_reported = True
+
     def get_current_frame(self) -> messages.Frame:
         """
         Convert the top sd.StateDevice into a Frame and return it.
@@ -1,5 +1,6 @@
 import typing
 from abc import ABC
+from enum import Enum
 
 from loguru import logger
 
@@ -12,8 +13,16 @@ class Manager(ABC):
     - Define loading behavior
     - Define saving behavior
     typically for an entire system.
+
+    A manager may also declare secondary indexes over its manifest via INDEXES.
+    Each entry maps the name of an index to a function that returns the list
+    of keys that an object should be indexed under. Subclasses call `_index`
+    when an object is registered, and may then look objects up by index via
+    `query` rather than scanning the manifest.
     """
 
+    INDEXES: dict[str, typing.Callable[[any], list]] = {}
+
     def __init__(self):
         self.name = self.__class__.__name__
         self._manifest: dict = {}
@@ -26,8 +35,14 @@ class Manager(ABC):
             logger.debug(f"[{self.name}] Registering manager with cache...")
             cache.get_cache()["managers"][self.name] = self
 
+        # index name -> index key -> manifest key -> object
+        self._indexes: dict[str, dict[any, dict[any, any]]] = {
+            index: {} for index in self.INDEXES
+        }
+
         self.command_handlers: dict[str, typing.Callable] = {
-            "list": self._command_list
+            "list": self._command_list,
+            "query": self._command_query
         }
 
     def load(self) -> None:
@@ -43,6 +58,110 @@ class Manager(ABC):
 
         return id in self._manifest
 
+    def _index(self, manifest_key: any, obj: any) -> None:
+        """
+        Insert a newly registered object into each of the manager's indexes.
+
+        Args:
+            manifest_key: The key that the object is stored under in _manifest
+            obj: The object to index
+
+        Returns: None
+        """
+
+        for index, key_func in self.INDEXES.items():
+            for key in key_func(obj):
+                self._indexes[index].setdefault(key, {})[manifest_key] = obj
+
+    def _index_lookup(self, index: str, key: any) -> dict[any, any]:
+        """
+        Retrieve the live entries of a single index key.
+
+        Entries whose object is no longer the object stored in the manifest
+        under the same key are skipped, so that objects removed from the
+        manifest directly are never returned.
+        """
+        if index not in self._indexes:
+            raise ValueError(f"{self.name} has no index named {index}!")
+
+        bucket = self._indexes[index].get(key, {})
+
+        return {
+            manifest_key: obj for manifest_key, obj in bucket.items()
+            if self._manifest.get(manifest_key) is obj
+        }
+
+    def _query(self, criteria: dict[str, any]) -> dict[any, any]:
+        """
+        Intersect the live entries of each criterion's index key.
+
+        Returns: A dict mapping manifest keys to matching objects
+        """
+        if len(criteria) == 0:
+            return dict(self._manifest)
+
+        results: dict[any, any] | None = None
+        for index, key in criteria.items():
+            entries = self._index_lookup(index, key)
+
+            if results is None:
+                results = entries
+            else:
+                results = {k: v for k, v in results.items() if k in entries}
+
+        return results
+
+    def query(self, **criteria) -> list:
+        """
+        Find all objects in the manifest that match every criterion.
+
+        Each keyword must be the name of an index declared in INDEXES. For
+        example, `item_manager.query(cls="Equipment", slot="ring")`.
+
+        Returns: A list of matching objects
+        """
+
+        return list(self._query(criteria).values())
+
+    def _parse_index_key(self, index: str, raw_key: str) -> any:
+        """
+        Convert the string form of an index key back into the key itself. Enum
+        keys may be referenced either by name or by value.
+        """
+        if index not in self._indexes:
+            raise ValueError(f"{self.name} has no index named {index}!")
+
+        for key in self._indexes[index]:
+            if str(key) == raw_key:
+                return key
+
+            if isinstance(key, Enum) and raw_key in (key.name, str(key.value)):
+                return key
+
+        return raw_key
+
+    def _command_query(self, fields: str) -> list[str]:
+        """
+        Return a list of strings where each line corresponds to the manifest key
+        of an object that matches every `index=key` pair.
+
+        For example, 'query cls=Equipment slot=ring' would return the IDs of
+        every ring.
+        """
+
+        criteria = {}
+        for part in fields.split(" "):
+            if part == "":
+                continue
+
+            if "=" not in part:
+                raise ValueError(f"Expected query of form index=key, got {part}")
+
+            index, raw_key = part.split("=", 1)
+            criteria[index] = self._parse_index_key(index, raw_key)
+
+        return [str(manifest_key) for manifest_key in self._query(criteria)]
+
     def _command_list(self, fields: str) -> list[str]:
         """
         Return a list of strings where each line corresponds to the selected fields of
@@ -5,9 +5,11 @@ Every "activity" in TXEngine is encapsulated in a self-contained StateDevice
 object, the vast majority of which are actually further sub-divided into states
 within a FiniteStateDevice object.
 """
-import copy
+import collections
 import enum
 import inspect
+import time
+import types
 import weakref
 from abc import abstractmethod, ABC
 from typing import Callable
@@ -23,6 +25,57 @@ from game.util.input_utils import is_valid_range, to_range, affirmative_range, \
     affirmative_to_bool
 
 
+class StateTracer:
+    """
+    Streams FiniteStateDevice state transitions to an append-only trace file.
+
+    Tracing is disabled by default. Each transition is written as a single
+    tab-separated line: timestamp, device, previous state, next state.
+    """
+
+    def __init__(self):
+        self.path: str | None = None
+        self._file = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    def enable(self, path: str) -> None:
+        """
+        Begin appending transitions to the file at `path`.
+
+        Args:
+            path: The path of the trace file. It is created if it doesn't exist.
+
+        Returns: None
+        """
+        self.disable()
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+        logger.info(f"Tracing state transitions to {path}")
+
+    def disable(self) -> None:
+        """
+        Stop tracing and close the trace file.
+        """
+        if self._file is not None:
+            self._file.close()
+
+        self._file = None
+        self.path = None
+
+    def record(self, device: "StateDevice", from_state, to_state) -> None:
+        """
+        Write a single transition to the trace file.
+        """
+        self._file.write(f"{time.time():.6f}\t{device}\t{from_state}\t"
+                         f"{to_state}\n")
+
+
+state_tracer = StateTracer()
+
+
 class StateDevice(ABC):
     """
     An abstract class that defines an object that represents game logic.
@@ -361,6 +414,14 @@ class FiniteStateDevice(StateDevice, ABC):
     """
     A subclass of StateDevice that adds support for explicit state ordering and
     transitions.
+
+    States may be defined in one of two ways:
+    - Per-instance, by decorating closures with `state_logic` and
+      `state_content` inside of __init__.
+    - Per-class, by decorating methods with `logic_provider` and
+      `content_provider` in the class body. These are validated and compiled
+      into a state table once, when the class is created, and are shared by
+      every instance of the class.
     """
 
     state_data_dict = {
@@ -369,7 +430,9 @@ class FiniteStateDevice(StateDevice, ABC):
         "max": None,
         "len": None,
         "logic": None,
-        "content": None
+        "content": None,
+        "method": False,  # True if logic and content are unbound methods
+        "memo": None  # Dependencies of memoized content, or None
     }
 
     class States(enum.Enum):
@@ -387,46 +450,249 @@ class FiniteStateDevice(StateDevice, ABC):
         DEFAULT = 0
         TERMINATE = -1
 
+    # The number of recent states kept in state_history
+    STATE_HISTORY_LENGTH: int = 32
+
+    # The compiled class-level state table. Maps state values to state data.
+    # Built by _compile_states when the class is created.
+    _compiled_states: dict[int, dict] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_states()
+
     def __init__(self, default_input_type: InputType, states: type[enum.Enum],
                  default_state=States.DEFAULT):
         super().__init__(default_input_type)
 
         self.states: type[enum.Enum] = states
         self.current_state = self.default_state = default_state
+
+        # Compiled states are shared with the class. Every other state gets its
+        # own (shallow) copy of the defaults, which only hold immutable values.
+        compiled = self._compiled_states
         self.state_data: dict[states, dict] = {
-            k.value: copy.deepcopy(self.state_data_dict) for k in self.states}
-        self.state_history: list[states] = [self.current_state]
+            k.value: compiled[k.value] if k.value in compiled
+            else dict(self.state_data_dict) for k in self.states}
+        self.state_history: collections.deque[states] = collections.deque(
+            [self.current_state], maxlen=self.STATE_HISTORY_LENGTH)
+
+        # Maps state values to (dependency tokens, components) for states
+        # with memoized content
+        self._content_cache: dict[int, tuple[tuple, dict]] = {}
         self.set_defaults()
 
+    @classmethod
+    def _compile_states(cls) -> None:
+        """
+        Collect every logic and content provider defined by the class and its
+        parents, validate them, and store them in the class's state table.
+
+        Providers defined in a subclass replace providers defined in a parent
+        for the same state.
+        """
+        table: dict[int, dict] = {}
+
+        for klass in reversed(cls.__mro__):
+            local_logic = set()
+            local_content = set()
+
+            for attr in vars(klass).values():
+                logic_spec = getattr(attr, "_state_logic_spec", None)
+                content_spec = getattr(attr, "_state_content_spec", None)
+
+                if logic_spec is not None:
+                    state = logic_spec["state"]
+                    if state.value in local_logic:
+                        raise StateDeviceInternalError(
+                            f"State.logic collision! {state} already has a "
+                            f"logic provider in {klass.__name__}.")
+                    local_logic.add(state.value)
+
+                    entry = table.setdefault(
+                        state.value, dict(cls.state_data_dict, method=True))
+                    entry["input_type"] = logic_spec["input_type"]
+                    entry["min"] = logic_spec["min"]
+                    entry["max"] = logic_spec["max"]
+                    entry["len"] = logic_spec["len"]
+                    entry["logic"] = attr
+
+                if content_spec is not None:
+                    content_state = content_spec["state"]
+                    if content_state.value in local_content:
+                        raise StateDeviceInternalError(
+                            f"State.content collision! {content_state} already "
+                            f"has a content provider in {klass.__name__}.")
+                    local_content.add(content_state.value)
+
+                    entry = table.setdefault(
+                        content_state.value,
+                        dict(cls.state_data_dict, method=True))
+                    entry["content"] = attr
+                    entry["memo"] = content_spec["memo"]
+
+        cls._compiled_states = table
+
+    def _writable_state_data(self, state_value: int) -> dict:
+        """
+        Get the state data for a state such that it may be modified without
+        affecting any other instance. Compiled states are shared with the class,
+        so they are copied, and their providers bound to this instance, before
+        being handed out.
+        """
+        entry = self.state_data[state_value]
+
+        if entry is self._compiled_states.get(state_value):
+            entry = {
+                key: types.MethodType(value, self) if callable(value) else value
+                for key, value in entry.items()
+            }
+            entry["method"] = False
+
+            if entry["memo"] is not None:
+                entry["memo"] = tuple(
+                    types.MethodType(dep, self) for dep in entry["memo"])
+            self.state_data[state_value] = entry
+
+        return entry
+
+    def _resolve_state_attr(self, entry: dict, key: str) -> any:
+        """
+        Retrieve a value from a state's data, calling it if it is dynamic.
+        Dynamic values of compiled states receive the instance.
+        """
+        value = entry[key]
+
+        if callable(value):
+            return value(self) if entry["method"] else value()
+
+        return value
+
     def set_state(self, next_state) -> None:
         if next_state.value not in self.state_data:
             raise StateDeviceInternalError(f"Unknown state {next_state}!")
 
-        self.current_state = next_state
-        self.input_type = self.state_data[next_state.value]['input_type']
+        entry = self.state_data[next_state.value]
 
-        # Assign min
-        if callable(self.state_data[next_state.value]['min']):
-            self.domain_min = self.state_data[next_state.value]['min']()
-        else:
-            self.domain_min = self.state_data[next_state.value]['min']
+        if state_tracer.enabled:
+            state_tracer.record(self, self.current_state, next_state)
 
-        # Assign max
-        if callable(self.state_data[next_state.value]['max']):
-            self.domain_max = self.state_data[next_state.value]['max']()
-        else:
-            self.domain_max = self.state_data[next_state.value]['max']
-
-        # Assign length
-        if callable(self.state_data[next_state.value]['len']):
-            self.domain_length = self.state_data[next_state.value]['len']()
-        else:
-            self.domain_length = self.state_data[next_state.value]['len']
+        if self._content_cache:
+            self._content_cache.clear()
 
-        # Append history for debugging purposes
+        self.current_state = next_state
+        self.input_type = self._resolve_state_attr(entry, 'input_type')
+        self.domain_min = self._resolve_state_attr(entry, 'min')
+        self.domain_max = self._resolve_state_attr(entry, 'max')
+        self.domain_length = self._resolve_state_attr(entry, 'len')
+
+        # Append history for debugging purposes. Only the most recent
+        # STATE_HISTORY_LENGTH states are kept; enable state_tracer for a full
+        # history.
         self.state_history.append(next_state)
 
     # Custom Decorators
+    @staticmethod
+    def logic_provider(state, input_type: enums.InputType | Callable,
+                       input_min: int | Callable = None,
+                       input_max: int | Callable = None,
+                       input_len: int | Callable = None):
+        """
+        A decorator factory that declares a method as the logic provider for a
+        state of every instance of the class it is defined in.
+
+        The method must accept `self` and the user's input. Any of input_type,
+        input_min, input_max, and input_len may be a callable that accepts the
+        instance and returns the value to use.
+
+        Args:
+            state: The state to map the method to
+            input_type: The input type for this state
+            input_min: The input range's min for this state
+            input_max: The input range's max for this state
+            input_len: The input range's length for this state
+
+        Returns:
+            callable: A decorator that marks the method as a logic provider
+        """
+
+        if not isinstance(state, enum.Enum):
+            raise StateDeviceInternalError(
+                f"Expected state to be an Enum member! Got {type(state)} "
+                f"instead.")
+
+        if not isinstance(input_type, InputType) and not callable(input_type):
+            raise StateDeviceInternalError(
+                f"input_type must be an InputType or a callable! Got "
+                f"{type(input_type)} instead.")
+
+        for name, val in [("input_min", input_min), ("input_max", input_max),
+                          ("input_len", input_len)]:
+            if val is not None and not callable(val) and not type(val) == int:
+                raise StateDeviceInternalError(
+                    f"{name} must be an int or a callable! Got {type(val)}"
+                    f" instead.")
+
+        def decorate(fn):
+            if fn.__code__.co_argcount != 2:
+                raise ValueError(
+                    f"""Error registering logic provider for state {state}.
+                    State logic methods must accept only self and a single
+                    positional argument, not {fn.__code__.co_argcount}!""")
+
+            fn._state_logic_spec = {
+                "state": state,
+                "input_type": input_type,
+                "min": input_min,
+                "max": input_max,
+                "len": input_len
+            }
+            return fn
+
+        return decorate
+
+    @staticmethod
+    def content_provider(state, memoize: bool = False,
+                         depends_on: list[Callable] = None):
+        """
+        A decorator factory that declares a method as the content provider for
+        a state of every instance of the class it is defined in.
+
+        The method must accept only `self`.
+
+        Args:
+            state: The state to map the method to
+            memoize:
+                If True, the rendered components are cached until the device
+                changes state or a dependency changes.
+            depends_on:
+                Callables that accept the instance and return a token. The
+                cached components are discarded when any token changes.
+
+        Returns:
+            callable: A decorator that marks the method as a content provider
+        """
+
+        if not isinstance(state, enum.Enum):
+            raise StateDeviceInternalError(
+                f"Expected state to be an Enum member! Got {type(state)} "
+                f"instead.")
+
+        def decorate(fn):
+            if fn.__code__.co_argcount != 1:
+                raise ValueError(
+                    f"""Error registering content provider for state {state}.
+                    State content methods must accept only self, not 
+                    {fn.__code__.co_argcount} arguments!""")
+
+            fn._state_content_spec = {
+                "state": state,
+                "memo": tuple(depends_on or ()) if memoize else None
+            }
+            return fn
+
+        return decorate
+
     @staticmethod
     def state_logic(instance, state, input_type: enums.InputType,
                     input_min: int | Callable = None,
@@ -496,25 +762,33 @@ class FiniteStateDevice(StateDevice, ABC):
             Register to instance and then return the function untouched.
             """
 
-            spec = inspect.getfullargspec(fn)
-            if len(spec.args) != 1:
+            # Closures are plain functions, so their arg count can be read
+            # directly without the cost of a full signature inspection
+            code = getattr(fn, "__code__", None)
+            arg_count = code.co_argcount if code is not None \
+                else len(inspect.getfullargspec(fn).args)
+
+            if arg_count != 1:
                 raise ValueError(
                     f"""Error registering logic provider for state {state}.
                     State logic functions must accept only a single positional 
-                    argument, not {len(spec.args)}!""")
+                    argument, not {arg_count}!""")
 
-            instance.state_data[state.value]['input_type'] = input_type
-            instance.state_data[state.value]['min'] = input_min
-            instance.state_data[state.value]['max'] = input_max
-            instance.state_data[state.value]['len'] = input_len
-            instance.state_data[state.value]['logic'] = fn
+            entry = instance._writable_state_data(state.value)
+            entry['input_type'] = input_type
+            entry['min'] = input_min
+            entry['max'] = input_max
+            entry['len'] = input_len
+            entry['logic'] = fn
 
             return fn
 
         return decorate
 
     @staticmethod
-    def state_content(instance, state, override: bool = False):
+    def state_content(instance, state, override: bool = False,
+                      memoize: bool = False,
+                      depends_on: list[Callable] = None):
         """
         A decorator factory that returns a factory that registers the wrapped
         function as the content provider for state 'state'.
@@ -523,6 +797,12 @@ class FiniteStateDevice(StateDevice, ABC):
             instance: An instance of the FiniteStateDevice to modify
             state: The state to register the content function to
             override: If True, ignore collisions
+            memoize:
+                If True, the rendered components are cached until the device
+                changes state or a dependency changes.
+            depends_on:
+                Callables that return a token. The cached components are
+                discarded when any token changes.
 
         Returns:
             A decorator function that registers the wrapped function as a
@@ -547,7 +827,10 @@ class FiniteStateDevice(StateDevice, ABC):
             A simple decorator that registers the wrapped function to the passed
             instance.
             """
-            instance.state_data[state.value]['content'] = fn
+            entry = instance._writable_state_data(state.value)
+            entry['content'] = fn
+            entry['memo'] = tuple(depends_on or ()) if memoize else None
+            instance._content_cache.pop(state.value, None)
             return fn
 
         return decorate
@@ -557,69 +840,109 @@ class FiniteStateDevice(StateDevice, ABC):
         When the user transitions to a state, check if the min and/or max are
         defined dynamically. If so, force the value to refresh.
         """
+        entry = self.state_data[self.current_state.value]
 
-        if callable(self.state_data[self.current_state.value]['max']):
-            self.domain_max = self.state_data[self.current_state.value]['max']()
+        if callable(entry['max']):
+            self.domain_max = self._resolve_state_attr(entry, 'max')
 
-        if callable(self.state_data[self.current_state.value]['min']):
-            self.domain_min = self.state_data[self.current_state.value]['min']()
+        if callable(entry['min']):
+            self.domain_min = self._resolve_state_attr(entry, 'min')
 
     def _logic(self, user_input: any) -> None:
 
-        self._update_dynamic_input_domains()
-
         # Check for bad state data
         if self.current_state.value not in self.state_data:
             raise ValueError(
                 f"State {self.current_state} "
                 f"has not been registered with {self.name}!")
 
-        if 'logic' not in self.state_data[self.current_state.value] \
-                or not self.state_data[self.current_state.value]['logic']:
+        self._update_dynamic_input_domains()
+        entry = self.state_data[self.current_state.value]
+
+        if 'logic' not in entry or not entry['logic']:
             raise StateDeviceInternalError(
                 f"No logical provider has been registered for state "
                 f"{self.current_state}!",
                 {KeyError: ""})
-        self.state_data[self.current_state.value]['logic'](user_input)
+
+        if entry["method"]:
+            entry['logic'](self, user_input)
+        else:
+            entry['logic'](user_input)
 
     @property
     def components(self) -> dict[str, any]:
 
-        self._update_dynamic_input_domains()
-
         # Check for bad state data
         if self.current_state.value not in self.state_data:
             raise ValueError(
                 f"State {self.current_state} "
                 f"has not been registered with {self.name}!")
 
+        self._update_dynamic_input_domains()
+        entry = self.state_data[self.current_state.value]
+
         # If the state is silent, simply return an empty component dict.
         # This circumvents checks for silent states
-        if self.state_data[self.current_state.value][
-            "input_type"] == InputType.SILENT:
+        if self._resolve_state_attr(entry, "input_type") == InputType.SILENT:
             return ComponentFactory.get()
 
-        if 'content' not in self.state_data[self.current_state.value] \
-                or not self.state_data[self.current_state.value]['content']:
+        if 'content' not in entry or not entry['content']:
             raise KeyError(
                 f"No content provider has been registered for state "
                 f"{self.current_state}!")
 
-        return self.state_data[self.current_state.value]['content']()
+        if entry["memo"] is None:
+            return self._render_content(entry)
+
+        # Memoized content is only re-rendered when a dependency has changed
+        if entry["method"]:
+            tokens = tuple(dep(self) for dep in entry["memo"])
+        else:
+            tokens = tuple(dep() for dep in entry["memo"])
+
+        cached = self._content_cache.get(self.current_state.value)
+        if cached is not None and cached[0] == tokens:
+            return cached[1]
+
+        components = self._render_content(entry)
+        self._content_cache[self.current_state.value] = (tokens, components)
+
+        return components
+
+    def _render_content(self, entry: dict) -> dict[str, any]:
+        """
+        Call the content provider of a state.
+        """
+        if entry["method"]:
+            return entry['content'](self)
+
+        return entry['content']()
+
+    def invalidate_content(self) -> None:
+        """
+        Discard all memoized content. Use this when a memoized state's content
+        has changed in a way that none of its dependencies capture.
+        """
+        self._content_cache.clear()
 
     def reset(self) -> None:
         self.set_state(self.default_state)
 
     def set_defaults(self) -> None:
+        """
+        A hook for setting up per-instance default states. The default
+        TERMINATE state is declared at class level, below.
+        """
+        pass
 
-        @FiniteStateDevice.state_logic(self, self.States.TERMINATE,
-                                       InputType.SILENT)
-        def logic(_: any):
-            game.state_device_controller.set_dead()
+    @logic_provider(States.TERMINATE, InputType.SILENT)
+    def _terminate_logic(self, _: any) -> None:
+        game.state_device_controller.set_dead()
 
-        @FiniteStateDevice.state_content(self, self.States.TERMINATE)
-        def content():
-            return ComponentFactory.get()
+    @content_provider(States.TERMINATE)
+    def _terminate_content(self) -> dict:
+        return ComponentFactory.get()
 
     @staticmethod
     def user_branching_state(instance: "FiniteStateDevice", state,
@@ -708,3 +1031,6 @@ class FiniteStateDevice(StateDevice, ABC):
                 [prompt],
                 [[s] for s in branch_map.keys()]
             )
+
+
+FiniteStateDevice._compile_states()
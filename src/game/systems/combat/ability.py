@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from abc import ABC
 
+import copy
+
 from loguru import logger
 
 from game.cache import cached
@@ -72,6 +74,61 @@ class Ability(LoadableMixin, RequirementsMixin, TagMixin, AbilityBase):
                 ResourceRequirement(resource_name, cost_quantity)
             )
 
+    def __setattr__(self, key, value):
+        if self.__dict__.get("_frozen", False):
+            raise AttributeError(
+                f"Cannot set attribute '{key}' of frozen Ability {self.name}!"
+            )
+
+        super().__setattr__(key, value)
+
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy every attribute of the Ability. The copy is never frozen, so
+        callers that request a private instance may modify it freely.
+        """
+        ab = self.__class__.__new__(self.__class__)
+        memodict[id(self)] = ab
+
+        for attr, value in self.__dict__.items():
+            if attr != "_frozen":
+                ab.__dict__[attr] = copy.deepcopy(value, memodict)
+
+        return ab
+
+    @property
+    def frozen(self) -> bool:
+        return self.__dict__.get("_frozen", False)
+
+    def freeze(self) -> None:
+        """
+        Prevent any further assignment to the Ability's attributes.
+
+        Registered Abilities are shared by reference between every caller of
+        AbilityManager.get_ref, so they must not change after load.
+        """
+        self.__dict__["_frozen"] = True
+
+    def instantiate_effects(self) -> dict[CombatPhase, list[CombatEffect]]:
+        """
+        Build fresh copies of the Ability's effects, ready to be assigned to a
+        target.
+
+        The effects stored on the Ability are templates and are never assigned
+        themselves. Copies are drawn from the shared EffectPool, which recycles
+        expired effects where possible. Note that an improperly defined
+        __copy__ or _reinitialize for an effect class can result in broken
+        instances of the copy.
+
+        Returns: A dict mapping each CombatPhase to a list of new CombatEffects
+        """
+        from game.systems.combat.effect import effect_pool
+
+        return {
+            phase: [effect_pool.acquire(effect) for effect in effects]
+            for phase, effects in self.effects.items()
+        }
+
     @staticmethod
     @cached([LoadableMixin.LOADER_KEY, "Ability", LoadableMixin.ATTR_KEY])
     def from_json(json: dict[str, any]) -> any:
@@ -23,6 +23,17 @@ class AbilityController:
         self.abilities: set[str] = set(
             abilities) if abilities is not None else set()
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the set of learned abilities. If the owner is being copied in the
+        same pass, the copy is bound to the new owner.
+        """
+        ac = self.__class__.__new__(self.__class__)
+        ac.owner = memodict.get(id(self.owner), self.owner)
+        ac.abilities = set(self.abilities)
+
+        return ac
+
     def is_learnable(self, ability_name: str) -> bool:
         """
         Checks if an Ability can be learned by the owning CombatEntity
@@ -34,7 +45,7 @@ class AbilityController:
             True if the Requirements for the Ability are met by the owning
             CombatEntity, False otherwise.
         """
-        return from_cache("managers.AbilityManager").get_instance(
+        return from_cache("managers.AbilityManager").get_ref(
             ability_name).is_requirements_fulfilled(self.owner)
 
     def is_learned(self, ability_name: str) -> bool:
@@ -83,7 +94,7 @@ class AbilityController:
             raise RuntimeError(
                 f"AbilityController instance {self} has no owner set!")
 
-        inst = from_cache("managers.AbilityManager").get_instance(ability_name)
+        inst = from_cache("managers.AbilityManager").get_ref(ability_name)
 
         return self.is_learned(ability_name) and inst.is_requirements_fulfilled(
             self.owner)
@@ -100,7 +111,7 @@ class AbilityController:
 
         from game.systems.event.events import ResourceEvent
 
-        inst = from_cache("managers.AbilityManager").get_instance(ability_name)
+        inst = from_cache("managers.AbilityManager").get_ref(ability_name)
 
         for res, quantity in inst.costs.items():
             game.add_state_device(
@@ -117,7 +128,7 @@ class AbilityController:
         if not from_cache('managers.AbilityManager').is_ability(ability_name):
             raise ValueError(f"{ability_name} is not a known Ability!")
 
-        inst = from_cache("managers.AbilityManager").get_instance(ability_name)
+        inst = from_cache("managers.AbilityManager").get_ref(ability_name)
 
         return [
             StringContent(
@@ -9,6 +9,10 @@ from game.util.asset_utils import get_asset
 class AbilityManager(Manager):
 
     ABILITY_ASSET_PATH = "abilities"
+    INDEXES = {
+        "target_mode": lambda ability: [ability.target_mode],
+        "tag": lambda ability: list(ability.tags)
+    }
 
     def __init__(self):
         super().__init__()
@@ -18,17 +22,38 @@ class AbilityManager(Manager):
         if ability.name in self._manifest:
             raise ValueError(f"Ability with name {ability.name} already exists!")
 
+        ability.freeze()
         self._manifest[ability.name] = ability
+        self._index(ability.name, ability)
 
     def is_ability(self, ability_name: str) -> bool:
         return ability_name in self._manifest
 
     def get_instance(self, ability_name) -> Ability:
+        """
+        Get a private, mutable copy of a registered Ability.
+
+        Callers that only read the Ability should use `get_ref` instead.
+        """
         if ability_name not in self._manifest:
             raise ValueError(f"{ability_name} is not a valid ability!")
 
         return copy.deepcopy(self._manifest[ability_name])
 
+    def get_ref(self, ability_name) -> Ability:
+        """
+        Get a direct reference to the frozen master copy of a registered
+        Ability.
+
+        Registered Abilities cannot be modified, so the reference is safe to
+        share. Effects must be instantiated via `Ability.instantiate_effects`
+        before being assigned to an entity.
+        """
+        if ability_name not in self._manifest:
+            raise ValueError(f"{ability_name} is not a valid ability!")
+
+        return self._manifest[ability_name]
+
     def load(self) -> None:
         """
         Load Ability objects from JSON.
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import functools
+from array import array
+from typing import TYPE_CHECKING
+
+from game.cache import get_config
+
+if TYPE_CHECKING:
+    from game.systems.entity.entities import CombatEntity
+    from game.systems.entity.resource import Resource, ResourceController
+
+
+class BattleState:
+    """
+    The combat-relevant state of every participant in a combat, stored in
+    parallel arrays indexed by slot.
+
+    Entities remain the source of truth: effects, items and abilities change
+    their resources directly. The BattleState subscribes to the primary resource
+    of every participant and mirrors each change into its arrays, so that the
+    engine's per-turn queries (who is alive, which side are they on, how much
+    health do they have) are array lookups rather than attribute chains through
+    the ResourceController and the config.
+
+    The BattleState must be released when the combat ends, which stops it from
+    listening to the participants' resources.
+    """
+
+    ALLY: int = 0
+    ENEMY: int = 1
+
+    def __init__(self, allies: list[CombatEntity], enemies: list[CombatEntity]):
+        self.entities: tuple[CombatEntity, ...] = tuple(allies) + tuple(enemies)
+        self._slots: dict[int, int] = {}  # id(entity) -> slot
+        for slot, entity in enumerate(self.entities):
+            if id(entity) in self._slots:
+                raise ValueError(f"{entity.name} is already in the battle!")
+
+            self._slots[id(entity)] = slot
+
+        # Read once, rather than on every access to a primary resource
+        self.primary_resource_name: str = \
+            get_config()['resources']['primary_resource']
+
+        size = len(self.entities)
+        self.side: bytearray = bytearray([self.ALLY] * len(allies) +
+                                         [self.ENEMY] * len(enemies))
+        self.alive: bytearray = bytearray(size)
+        self.health: array = array('d', [0.0]) * size
+
+        # Living entities of each side, in slot order. Rebuilt lazily after an
+        # entity of that side dies or is revived.
+        self._living: list[list[CombatEntity] | None] = [None, None]
+
+        self._subscriptions: list[tuple[ResourceController, functools.partial]] = []
+        for slot, entity in enumerate(self.entities):
+            controller = entity.resource_controller
+            callback = functools.partial(self._on_resource_change, slot)
+            controller.subscribe(self.primary_resource_name, callback)
+            self._subscriptions.append((controller, callback))
+
+            self._on_resource_change(slot, controller[self.primary_resource_name])
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __contains__(self, entity: CombatEntity) -> bool:
+        return id(entity) in self._slots
+
+    def _on_resource_change(self, slot: int, resource: Resource) -> None:
+        self.health[slot] = resource.value
+
+        alive = resource.value >= 1
+        if alive != self.alive[slot]:
+            self.alive[slot] = alive
+            self._living[self.side[slot]] = None
+
+    def slot_of(self, entity: CombatEntity) -> int:
+        """
+        Get the slot of a participant.
+
+        Raises: ValueError if the entity is not a participant
+        """
+        try:
+            return self._slots[id(entity)]
+        except KeyError:
+            raise ValueError(f"{entity.name} is not in the battle!")
+
+    def is_alive(self, entity: CombatEntity) -> bool:
+        return bool(self.alive[self.slot_of(entity)])
+
+    def health_of(self, entity: CombatEntity) -> float:
+        return self.health[self.slot_of(entity)]
+
+    def side_of(self, entity: CombatEntity) -> int:
+        return self.side[self.slot_of(entity)]
+
+    def living(self, side: int) -> list[CombatEntity]:
+        """
+        Get the living participants of a side, in slot order. The returned list
+        is a copy and may be modified freely.
+        """
+        return list(self._get_living(side))
+
+    def _get_living(self, side: int) -> list[CombatEntity]:
+        living = self._living[side]
+        if living is None:
+            living = self._living[side] = [
+                entity for entity, s, a in
+                zip(self.entities, self.side, self.alive) if s == side and a
+            ]
+
+        return living
+
+    def release(self) -> None:
+        """
+        Stop mirroring the participants' resources. Safe to call more than once.
+        """
+        for controller, callback in self._subscriptions:
+            controller.unsubscribe(self.primary_resource_name, callback)
+
+        self._subscriptions = []
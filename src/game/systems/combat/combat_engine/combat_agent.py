@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import random
+import dataclasses
 
 from loguru import logger
 
@@ -9,9 +9,115 @@ from game.cache import from_cache
 from game.structures.enums import TargetMode
 from game.structures.errors import CombatError
 from game.systems.combat.combat_engine.choice_data import ChoiceData
+from game.util.rng import rng
 from game.systems.requirement.requirements import ResourceRequirement
 
 
+# Target modes that can only affect the user's own side
+_FRIENDLY_TARGET_MODES = (TargetMode.ALL_ALLY, TargetMode.SELF,
+                          TargetMode.SINGLE_ALLY)
+
+# Target modes that require a single target to be chosen
+_SINGLE_TARGET_MODES = (TargetMode.SINGLE, TargetMode.SINGLE_ENEMY,
+                        TargetMode.NOT_SELF)
+
+
+@dataclasses.dataclass(frozen=True)
+class AbilityProfile:
+    """
+    The static properties of an Ability that the combat AI reads while choosing
+    a move.
+    """
+    name: str
+    damage: int
+    target_mode: TargetMode
+    offensive: bool  # Deals damage and can target enemies
+    single_target: bool
+    cost_resources: frozenset[str]  # Resources required by ResourceRequirements
+    ref: any = dataclasses.field(compare=False, repr=False)
+
+    @classmethod
+    def from_ability(cls, ability) -> AbilityProfile:
+        return cls(
+            name=ability.name,
+            damage=ability.damage,
+            target_mode=ability.target_mode,
+            offensive=ability.damage > 0 and
+                      ability.target_mode not in _FRIENDLY_TARGET_MODES,
+            single_target=ability.target_mode in _SINGLE_TARGET_MODES,
+            cost_resources=frozenset(
+                r.resource_name for r in ability.requirements
+                if isinstance(r, ResourceRequirement)
+            ),
+            ref=ability
+        )
+
+
+class AgentTables:
+    """
+    A per-agent cache of the static data that the combat AI reads every turn.
+
+    Ability profiles are rebuilt only when the set of learned abilities changes,
+    and the resources that each Usable restores are classified once per item.
+    Each turn, only requirements, which depend on the agent's current
+    resources, are re-evaluated.
+
+    Copying an agent gives the copy an empty table.
+    """
+
+    def __init__(self):
+        self._abilities_key: frozenset[str] | None = None
+        self.abilities: tuple[AbilityProfile, ...] = ()
+        self.offensive: tuple[AbilityProfile, ...] = ()  # By damage, descending
+        self._restores: dict[int, frozenset[str]] = {}
+
+    def __deepcopy__(self, memodict={}):
+        return AgentTables()
+
+    def refresh(self, ability_names: set[str]) -> AgentTables:
+        """
+        Rebuild the ability profiles if the set of learned abilities has
+        changed.
+        """
+        key = frozenset(ability_names)
+        if key == self._abilities_key:
+            return self
+
+        # Abilities are learned into a set, whose order depends on the hash
+        # seed of the process. Sorting keeps random choices between them
+        # reproducible from the session seed.
+        ability_manager = from_cache("managers.AbilityManager")
+        self.abilities = tuple(
+            AbilityProfile.from_ability(ability_manager.get_ref(name))
+            for name in sorted(ability_names)
+        )
+        self.offensive = tuple(sorted(
+            (p for p in self.abilities if p.offensive),
+            key=lambda p: p.damage,
+            reverse=True
+        ))
+        self._abilities_key = key
+
+        return self
+
+    def restored_resources(self, usable) -> frozenset[str]:
+        """
+        The names of the resources that a Usable restores.
+        """
+        restores = self._restores.get(usable.id)
+
+        if restores is None:
+            from game.systems.event import ResourceEvent
+
+            restores = frozenset(
+                e.stat_name for e in usable.on_use_events
+                if isinstance(e, ResourceEvent) and not e.harmful
+            )
+            self._restores[usable.id] = restores
+
+        return restores
+
+
 class CombatAgentMixin:
     """
     A mixin that allows for CombatEngine integration. Mixin MUST be applied to a
@@ -19,16 +125,27 @@ class CombatAgentMixin:
     """
     PRIMARY_RESOURCE_DANGER_THRESHOLD: float = 0.33
 
-    def __init__(self, naive: bool = True, **kwargs):
+    def __init__(self, naive: bool = True, lookahead: bool = False, **kwargs):
         super().__init__(**kwargs)
 
         self.naive = naive
+        self.lookahead = lookahead
+        self._agent_tables: AgentTables = AgentTables()
+        self._danger_watch = None  # ResourceThreshold on primary_resource, created on first use
 
         from game.systems.entity.entities import CombatEntity
         if not isinstance(self, CombatEntity):
             raise TypeError(
                 "CombatAgentMixin must mixed with a CombatEntity instance!")
 
+    @property
+    def agent_tables(self) -> AgentTables:
+        """
+        The AI's cached ability and item data, brought up to date with the
+        abilities that the agent currently knows.
+        """
+        return self._agent_tables.refresh(self.ability_controller.abilities)
+
     @property
     def usable_abilities(self) -> list[str]:
         """
@@ -36,9 +153,8 @@ class CombatAgentMixin:
         """
 
         return [
-            ab for ab in self.ability_controller.abilities if from_cache(
-                "managers.AbilityManager"
-            ).get_instance(ab).is_requirements_fulfilled(self)
+            p.name for p in self.agent_tables.abilities
+            if p.ref.is_requirements_fulfilled(self)
         ]
 
     @property
@@ -55,19 +171,6 @@ class CombatAgentMixin:
 
         return [s.ref for s in stacks]
 
-    @classmethod
-    def _is_restorative_item(cls, usable, resource_name: str) -> bool:
-        """Attempt to classify a Usable as 'restorative'. If the Usable adds
-        value to primary_resource, then it is counted as restorative."""
-        from game.systems.event import ResourceEvent
-
-        for e in usable.on_use_events:
-            if isinstance(e, ResourceEvent):
-                if e.stat_name == resource_name and not e.harmful:
-                    return True
-
-        return False
-
     @property
     def in_danger(self) -> bool:
         """
@@ -76,16 +179,29 @@ class CombatAgentMixin:
         """
         primary_resource = self.resource_controller.primary_resource
 
-        return primary_resource.percent_remaining < self.PRIMARY_RESOURCE_DANGER_THRESHOLD
+        # Watch primary_resource rather than re-reading it on every check. The
+        # watch is rebuilt if the primary resource changed, or if this entity
+        # is a copy and the watch belongs to the original.
+        watch = self._danger_watch
+        if watch is None or watch.resource is not primary_resource:
+            if watch is not None:
+                watch.cancel()
+
+            watch = self._danger_watch = self.resource_controller.watch_threshold(
+                primary_resource.name, self.PRIMARY_RESOURCE_DANGER_THRESHOLD)
+
+        return watch.below
 
     @property
     def restorative_items(self) -> list:
         """A list of Usables that restore primary_resource."""
 
+        tables = self.agent_tables
+        primary_resource = self.resource_controller.primary_resource.name
+
         return [
-            u for u in self.usable_items if self._is_restorative_item(
-                u, self.resource_controller.primary_resource.name
-            )
+            u for u in self.usable_items
+            if primary_resource in tables.restored_resources(u)
         ]
 
     def get_resource_fix_items(self, ability: str) -> list:
@@ -93,19 +209,24 @@ class CombatAgentMixin:
         For a given ability, if it can't be used due to resource depletion,
         return a list of Usables that restore the missing resource.
         """
-        instance = from_cache("managers.AbilityManager").get_instance(ability)
-        depleted_resources = set()
-        for requirement in instance.requirements:
-            if isinstance(requirement, ResourceRequirement):
-                depleted_resources.add(requirement.resource_name)
+        tables = self.agent_tables
+        depleted_resources = next(
+            (p.cost_resources for p in tables.abilities if p.name == ability),
+            None
+        )
 
-        results = set()
-        for u in self.usable_items:
-            for resource in depleted_resources:
-                if self._is_restorative_item(u, resource):
-                    results.add(u)
+        if depleted_resources is None:
+            depleted_resources = AbilityProfile.from_ability(
+                from_cache("managers.AbilityManager").get_ref(ability)
+            ).cost_resources
 
-        return list(results)
+        # Several stacks may hold the same item, so de-duplicate by id
+        results = {
+            u.id: u for u in self.usable_items
+            if not depleted_resources.isdisjoint(tables.restored_resources(u))
+        }
+
+        return list(results.values())
 
     @property
     def offensive_abilities(self) -> list:
@@ -113,18 +234,7 @@ class CombatAgentMixin:
         Returns a list of abilities that can be used to deal damage to
         enemies.
         """
-        res = []
-
-        for ability in self.ability_controller.abilities:
-            inst = from_cache("managers.AbilityManager").get_instance(ability)
-
-            # Check if the ability deals damage and can target enemies
-            if inst.damage > 0 and inst.target_mode not in [
-                TargetMode.ALL_ALLY, TargetMode.SELF, TargetMode.SINGLE_ALLY
-            ]:
-                res.append(inst)
-
-        return res
+        return [p.ref for p in self.agent_tables.offensive]
 
     def naive_choice_logic(self) -> ChoiceData:
 
@@ -132,11 +242,10 @@ class CombatAgentMixin:
         if len(self.ability_controller.abilities) < 1:
             return ChoiceData(ChoiceData.ChoiceType.PASS)
 
-        r = random.Random()
-        ab: str = r.choice(self.usable_abilities)
+        ab: str = rng.choice(self.usable_abilities)
         targets = from_cache("combat").get_valid_ability_targets(self, ab)
 
-        target = r.choice(targets)
+        target = rng.choice(targets)
         return ChoiceData(
             ChoiceData.ChoiceType.ABILITY,
             ability_name=ab,
@@ -150,21 +259,18 @@ class CombatAgentMixin:
             restoratives = self.restorative_items
             if len(restoratives) > 0:
                 # TODO: Improve item selection logic
-                return ChoiceData(ChoiceData.ChoiceType.ITEM, item_id=random.Random().choice(restoratives).id)
+                return ChoiceData(ChoiceData.ChoiceType.ITEM, item_id=rng.choice(restoratives).id)
 
-        offensive_abilities = self.offensive_abilities
+        # Offensive abilities, already sorted by damage in desc order
+        offensive_abilities = self.agent_tables.offensive
         if len(offensive_abilities) > 0:
             logger.debug("Found offensive abilities!")
-            # sort by damage in desc order
-            offensive_abilities = sorted(
-                offensive_abilities,
-                key=lambda x: x.damage,
-                reverse=True)
 
             # Attempt to figure out which offensive abilities are usable
 
             # Starting with ability that does the most damage
-            for ab in offensive_abilities:
+            for profile in offensive_abilities:
+                ab = profile.ref
                 logger.debug(f"Evaluating ability: {ab.name}")
 
                 # If the ability cannot be used for some reason
@@ -190,16 +296,11 @@ class CombatAgentMixin:
                 else:
 
                     # Check if it is a single-target ability
-                    single_target_modes = [
-                        TargetMode.SINGLE,
-                        TargetMode.SINGLE_ENEMY,
-                        TargetMode.NOT_SELF
-                    ]
+                    if profile.single_target:
 
-                    if ab.target_mode in single_target_modes:
-
-                        targets = from_cache("combat").get_valid_ability_targets(self, ab.name)
-                        t = sorted(targets, key=lambda x: x.resource_controller.primary_resource.value, reverse=True)[0]
+                        combat = from_cache("combat")
+                        targets = combat.get_valid_ability_targets(self, ab.name)
+                        t = max(targets, key=combat.battle_state.health_of)
 
                         return ChoiceData(
                             ChoiceData.ChoiceType.ABILITY,
@@ -216,6 +317,41 @@ class CombatAgentMixin:
 
         return ChoiceData(ChoiceData.ChoiceType.PASS)
 
+    def lookahead_choice_logic(self) -> ChoiceData:
+        """
+        Choose an Ability by searching possible continuations of the combat
+        with a LookaheadPlanner.
+        """
+        from game.systems.combat.combat_engine.lookahead import \
+            CombatSnapshot, LookaheadPlanner
+
+        if len(self.ability_controller.abilities) < 1:
+            return ChoiceData(ChoiceData.ChoiceType.PASS)
+
+        combat = from_cache("combat")
+        snapshot = CombatSnapshot.from_combat(combat, self)
+        # The rollouts that fit in the time budget are recorded, so that a
+        # replay of the combat makes the same decision
+        planner = LookaheadPlanner()
+        action = planner.plan(snapshot, combat.next_lookahead_rollouts())
+        combat.replay_log.rollouts.append(planner.last_rollouts)
+
+        if action is None:
+            return ChoiceData(ChoiceData.ChoiceType.PASS)
+
+        ability_index, target_indices = action
+        spec = snapshot.combatants[snapshot.order[0]].abilities[ability_index]
+
+        # The snapshot indexes combatants in the same order as this list
+        entities = combat.allies + combat.enemies
+        targets = [entities[t] for t in target_indices]
+
+        return ChoiceData(
+            ChoiceData.ChoiceType.ABILITY,
+            ability_name=spec.name,
+            ability_target=targets[0] if spec.single_target else targets
+        )
+
     def _choice_logic(self) -> ChoiceData:
         """
         Get an Entity's choice for its turn during Combat.
@@ -228,6 +364,10 @@ class CombatAgentMixin:
         To collect information about the combat's context, retrieve it via
         from_cache("combat")
         """
+        # Lookahead takes precedence, since naive is enabled by default
+        if self.lookahead:
+            return self.lookahead_choice_logic()
+
         if self.naive:
             return self.naive_choice_logic()
 
@@ -245,13 +385,20 @@ class CombatAgentMixin:
 class PlayerAgentMixin(CombatAgentMixin):
     """
     A CombatAgentMixin that makes the player choose what to do.
+
+    In an auto-resolved combat, the player's turns are chosen by the
+    CombatAgentMixin policy instead.
     """
 
     def _choice_logic(self) -> ChoiceData:
         """
-        Dead method. Ignore.
+        Only used in auto-resolved combats. The player always plays with the
+        intelligent policy, or the lookahead policy if it is enabled.
         """
-        pass
+        if self.lookahead:
+            return self.lookahead_choice_logic()
+
+        return self.intelligent_choice_logic()
 
     def make_choice(self) -> None:
         """
@@ -261,6 +408,10 @@ class PlayerAgentMixin(CombatAgentMixin):
         if not from_cache("combat"):
             raise CombatError("Unable to retrieve valid combat instance!")
 
+        if from_cache("combat").auto_resolve:
+            super().make_choice()
+            return
+
         # Spawn an event to handle player choice flow.
         # Note that this method does not submit anything to the combat engine
         # directly, all of that is handled within the PlayerCombatChoiceEvent's
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import copy
-import weakref
 from enum import Enum
+from typing import Iterator
 
 from loguru import logger
 
@@ -13,14 +12,19 @@ from game.structures.enums import CombatPhase, InputType, TargetMode
 from game.structures.errors import CombatError
 from game.structures.messages import StringContent, ComponentFactory
 from game.structures.state_device import FiniteStateDevice
+from game.systems.combat.combat_engine.battle_state import BattleState
 from game.systems.combat.combat_engine.choice_data import ChoiceData
 from game.systems.combat.combat_engine.combat_helpers import \
-    calculate_damage_to_entity
+    calculate_damage_to_entities
 from game.systems.combat.combat_engine.phase_handler import PhaseHandler, \
     EffectActivator, ChoiceActivator
+from game.systems.combat.combat_engine.replay import CombatReplay, \
+    digest_combat, fingerprint_entity
 from game.systems.combat.combat_engine.termination_handler import \
     TerminationHandler, PlayerResourceCondition, \
     EnemyResourceCondition, GroupResourceCondition
+from game.systems.combat.combat_engine.turn_timeline import TurnTimeline
+from game.util.rng import rng
 
 
 class CombatEngine(FiniteStateDevice):
@@ -44,13 +48,15 @@ class CombatEngine(FiniteStateDevice):
         EXECUTE_ENTITY_CHOICE = 8
         TERMINATE = -1
 
-    @classmethod
-    def is_dead(cls, entity: entities.CombatEntity) -> bool:
+    def is_dead(self, entity: entities.CombatEntity) -> bool:
         """
         Compute if the entity is dead. Check if the primary_resource has been
         depleted.
         """
-        res: bool = entity.resource_controller.primary_resource.value < 1
+        if entity in self._battle_state:
+            res: bool = not self._battle_state.is_alive(entity)
+        else:
+            res: bool = entity.resource_controller.primary_resource.value < 1
 
         if res:
             logger.debug(f"Entity {entity.name} is dead!")
@@ -59,9 +65,15 @@ class CombatEngine(FiniteStateDevice):
 
     def __init__(self, ally_entity_ids: list[int], enemy_entity_ids: list[int],
                  termination_conditions: list[TerminationHandler] = None,
-                 override_primary_resource: str = None):
+                 override_primary_resource: str = None, seed: int = None,
+                 auto_resolve: bool = False,
+                 recorded_rollouts: list[list[int]] = None):
         super().__init__(InputType.ANY, self.States, self.States.DEFAULT)
 
+        # If set, the player's turns are chosen by the CombatAgentMixin policy
+        # rather than by the player, and loot is awarded without prompts
+        self.auto_resolve: bool = auto_resolve
+
         if override_primary_resource is not None:
             self._backup_primary_resource = get_config()['resources'][
                 'primary_resource']
@@ -100,22 +112,54 @@ class CombatEngine(FiniteStateDevice):
         self._player_ref: entities.Player = from_cache('player')
         self._allies.append(self._player_ref)
 
-        # Ordered lists
-
-        # Proxied list of all entities arranged by index via turn order
-        self._turn_order: list[entities.CombatEntity] = []
+        # Compact mirror of the participants' state for per-turn queries. It
+        # subscribes to the participants' resources before the termination
+        # handlers do, so it is up-to-date whenever they are notified.
+        self._battle_state: BattleState = BattleState(self._allies,
+                                                      self._enemies)
+
+        # Pending turns of all living entities
+        self._timeline: TurnTimeline = TurnTimeline(self._allies + self._enemies)
+
+        # Event-driven termination handlers request a check when their
+        # conditions may have become met. Any other handler must be polled
+        # after every phase.
+        self._termination_check_pending: bool = True
+        self._poll_termination: bool = not all(
+            condition.EVENT_DRIVEN for condition in self._termination_conditions)
+        for condition in self._termination_conditions:
+            condition.bind(self)
 
         # Ordered immutable collection of phases
         self._PHASE_ORDER = tuple(CombatEngine.get_master_phase_order())
 
         # State data for current turn
         self.total_turn_cycles: int = 0
-        self.current_turn: int = -1  # Start at -1 so that when combat begins the index can be incremented to 0
+        self._active_entity: entities.CombatEntity | None = None
         self.current_phase_index: int = 0  # Index of current phase against self._PHASE_ORDER
 
         # Choice made by the active entity during the ACTION_PHASE combat phase
         self.active_entity_choice: ChoiceData = None
 
+        # Every hit dealt by an Ability, as (source, target, damage)
+        self.damage_log: list[tuple[entities.CombatEntity,
+                                    entities.CombatEntity, int]] = []
+
+        # Every random decision made during the combat draws from the session
+        # RNG, which is reseeded so that the combat can be replayed from its
+        # seed and the player's inputs.
+        if seed is None:
+            seed = rng.spawn_seed()
+
+        self.replay_log: CombatReplay = CombatReplay(
+            rng.seed(seed), list(ally_entity_ids), list(enemy_entity_ids),
+            player_fingerprint=fingerprint_entity(self._player_ref))
+
+        # When replaying, lookahead decisions repeat the recorded rollouts
+        # rather than searching until their time budget runs out
+        self._recorded_rollouts: Iterator[list[int]] | None = \
+            None if recorded_rollouts is None else iter(recorded_rollouts)
+
         self._build_states()
 
         # Cache a global weak reference to this instance for later use by
@@ -142,23 +186,6 @@ class CombatEngine(FiniteStateDevice):
             handler: PhaseHandler = handler_class()
             handler.handle_phase()
 
-    def _compute_turn_order(self):
-        """
-        Determine turn order by sorting all entities via turn_speed
-        """
-
-        # Build the weakref list if it doesn't exist
-        if self._turn_order is None or len(self._turn_order) == 0:
-            self._turn_order = [
-                weakref.proxy(e) for e in self._allies + self._enemies
-            ]
-
-        # Sort in place
-        self._turn_order.sort(key=lambda x: x.turn_speed, reverse=True)
-
-        # Remove any dead entities
-        self._turn_order = [e for e in self._turn_order if not self.is_dead(e)]
-
     def _handle_use_item(self, item_id: int) -> None:
         """
         The active entity has chosen to ue an Item. Handle its usage.
@@ -193,7 +220,7 @@ class CombatEngine(FiniteStateDevice):
 
         ability = from_cache(
             "managers.AbilityManager"
-        ).get_instance(ability_name)
+        ).get_ref(ability_name)
 
         if not ability.is_requirements_fulfilled(self.active_entity):
             raise RuntimeError(
@@ -204,33 +231,34 @@ class CombatEngine(FiniteStateDevice):
         # TODO: Single-target should result in an instance of CombatEntity wrapped in a list by default
         _targets = targets if isinstance(targets, list) else [targets]
 
+        # Damage to every target is computed in a single batch. Effects are
+        # only acquired below, not performed, so they cannot change the result.
+        damages = calculate_damage_to_entities(ability, _targets)
+
         from game.systems.event.events import TextEvent
-        for target in _targets:  # For each target
+        for target, dmg in zip(_targets, damages):  # For each target
 
-            # Unpack the ability's effects into phases
-            for phase, effects in ability.effects.items():
+            # Instantiate the ability's effects and unpack them into phases.
+            # The registered Ability is shared, so its effects are never
+            # assigned directly.
+            for phase, effects in ability.instantiate_effects().items():
 
                 # Iterate through effects and assign to that phase on the target
                 for effect in effects:
-                    # Deepcopy each effect. This prevents tangling references
-                    # Note that an improperly defined __copy__ for the effect
-                    # class can result in broken instances of the copy
-                    effect_copy = copy.deepcopy(effect)
-
-                    # Assign sources and targets from the deepcopy
-                    logger.debug(f"Assigning effect {effect_copy} to entity "
+                    logger.debug(f"Assigning effect {effect} to entity "
                                  f"{target.name} in phase {phase}")
-                    effect_copy.assign(self.active_entity, target)
-                    target.acquire_effect(effect_copy, phase)
+                    effect.assign(self.active_entity, target)
+                    target.acquire_effect(effect, phase)
 
             # This is the "damage" step where the primary resource of the target
             # is decremented by the Ability's `damage` value.
-
-            dmg = calculate_damage_to_entity(ability, target)
-
             target.resource_controller[
-                get_config()["resources"]["primary_resource"]
+                self._battle_state.primary_resource_name
             ].adjust(dmg * -1)
+            self.damage_log.append((self.active_entity, target, dmg))
+
+            if self.is_dead(target):
+                self._timeline.remove(target)
 
             game.add_state_device(
                 TextEvent(f"{target.name} took {dmg} damage.")
@@ -270,11 +298,9 @@ class CombatEngine(FiniteStateDevice):
         For example, an entity that is in the enemies list would return the
         enemeies list.
         """
-        if entity in self.allies:
-            return self.allies
-
-        elif entity in self.enemies:
-            return self.enemies
+        if entity in self._battle_state and not self.is_dead(entity):
+            return self._battle_state.living(
+                self._battle_state.side_of(entity))
 
         else:
             raise CombatError(
@@ -289,11 +315,10 @@ class CombatEngine(FiniteStateDevice):
         allies list.
         """
 
-        if entity in self.allies:
-            return self.enemies
-
-        elif entity in self.enemies:
-            return self.allies
+        if entity in self._battle_state and not self.is_dead(entity):
+            return self._battle_state.living(
+                BattleState.ENEMY if self._battle_state.side_of(entity) ==
+                BattleState.ALLY else BattleState.ALLY)
 
         else:
             raise CombatError(
@@ -329,7 +354,7 @@ class CombatEngine(FiniteStateDevice):
                 f"{type(ability_name)} instead.")
 
         target_mode: TargetMode = from_cache(
-            "managers.AbilityManager").get_instance(ability_name).target_mode
+            "managers.AbilityManager").get_ref(ability_name).target_mode
 
         match target_mode:
 
@@ -365,6 +390,46 @@ class CombatEngine(FiniteStateDevice):
             case _:
                 raise CombatError(f'Unknown targeting mode: {target_mode}')
 
+    def set_turn_speed(self, entity: entities.CombatEntity,
+                       turn_speed: int | float) -> None:
+        """
+        Change the turn_speed of an entity mid-combat. The entity's pending turn
+        is rescheduled to match.
+        """
+        entity.turn_speed = turn_speed
+
+        if entity in self._timeline:
+            self._timeline.update_speed(entity)
+
+    def next_lookahead_rollouts(self) -> list[int] | None:
+        """
+        Get the rollout counts recorded for the next lookahead decision of a
+        replayed combat, or None if the combat is not a replay.
+
+        Raises: CombatError if the replay has no more recorded decisions
+        """
+        if self._recorded_rollouts is None:
+            return None
+
+        rollouts = next(self._recorded_rollouts, None)
+        if rollouts is None:
+            raise CombatError(
+                "Ran out of recorded lookahead decisions during a replay!")
+
+        return rollouts
+
+    def request_termination_check(self) -> None:
+        """
+        Evaluate the termination handlers at the next termination check.
+        """
+        self._termination_check_pending = True
+
+    def record_input(self, user_input: any) -> None:
+        """
+        Record an input delivered by the player while this combat is active.
+        """
+        self.replay_log.inputs.append(user_input)
+
     def submit_entity_choice(self, entity, choice: ChoiceData) -> None:
         """
         Submit an entity's turn action to the combat engine from any context.
@@ -415,29 +480,49 @@ class CombatEngine(FiniteStateDevice):
         return self._PHASE_ORDER[self.current_phase_index]
 
     @property
-    def active_entity(self) -> entities.CombatEntity:
+    def digest(self) -> str:
         """
-        Return a weakref to the active entity.
+        A fingerprint of the combat so far. See digest_combat.
         """
+        return digest_combat(self.total_turn_cycles, self.damage_log)
 
-        return self._turn_order[self.current_turn] if self.current_turn < len(
-            self._turn_order) else None
+    @property
+    def active_entity(self) -> entities.CombatEntity:
+        """
+        Return the entity whose turn it currently is.
+        """
+        return self._active_entity
 
     @property
     def next_entity(self) -> entities.CombatEntity | None:
         """
-        Return a weakref to next active Entity.
+        Return the entity that acts after the active entity within the current
+        turn cycle, if any.
         """
-        return self.current_turn + 1 if self.current_turn < len(
-            self._turn_order) - 1 else None
+        return self._timeline.peek(self.total_turn_cycles)
+
+    @property
+    def turn_order(self) -> list[entities.CombatEntity]:
+        """
+        Every entity that is still on the timeline, in the order of their
+        pending turns.
+        """
+        return self._timeline.order()
+
+    @property
+    def battle_state(self) -> BattleState:
+        """
+        The compact state of every participant. See BattleState.
+        """
+        return self._battle_state
 
     @property
     def enemies(self) -> list[entities.CombatEntity]:
-        return [e for e in self._enemies if not self.is_dead(e)]
+        return self._battle_state.living(BattleState.ENEMY)
 
     @property
     def allies(self) -> list[entities.CombatEntity]:
-        return [e for e in self._allies if not self.is_dead(e)]
+        return self._battle_state.living(BattleState.ALLY)
 
     # Class Methods
 
@@ -485,30 +570,29 @@ class CombatEngine(FiniteStateDevice):
         @FiniteStateDevice.state_logic(self, self.States.START_TURN_CYCLE,
                                        InputType.SILENT)
         def logic(_: any) -> None:
-            self._compute_turn_order()
             self.total_turn_cycles += 1
-            self.current_turn = -1
             self.set_state(self.States.START_ENTITY_TURN)
 
         @FiniteStateDevice.state_logic(self, self.States.START_ENTITY_TURN,
                                        InputType.SILENT)
         def logic(_: any) -> None:
-            self.current_turn += 1  # Increment turn index
+            # Take the next turn from the timeline
+            self._active_entity = self._timeline.pop(self.total_turn_cycles)
             self.current_phase_index = 0  # Reset phase index to 0 (Start phase)
 
             if self.active_entity is None:
-                # Detect if the active entity went out of bounds and a new turn
-                # cycle must be started
+                # Every entity has acted, so a new turn cycle must be started
                 self.set_state(self.States.START_TURN_CYCLE)
                 return
 
             logger.debug(f"Starting turn for entity {self.active_entity.name}")
 
             if self.is_dead(self.active_entity):
-                # Skip this entity's turn and then check if combat should have
-                # ended.
+                # Remove the entity from the timeline, skip this entity's turn
+                # and then check if combat should have ended.
                 logger.debug(f"Detected that {self.active_entity.name} is dead."
                              f" Skipping...")
+                self._timeline.remove(self.active_entity)
                 self.set_state(self.States.DETECT_COMBAT_TERMINATION)
                 return
 
@@ -546,7 +630,15 @@ class CombatEngine(FiniteStateDevice):
         def logic(_: any) -> None:
             loss = False
             win = False
-            for termination_condition in self._termination_conditions:
+
+            # Without a pending request, no event-driven condition can be met
+            if self._poll_termination or self._termination_check_pending:
+                conditions = self._termination_conditions
+                self._termination_check_pending = False
+            else:
+                conditions = []
+
+            for termination_condition in conditions:
                 try:
                     if termination_condition.is_conditions_met():
                         if termination_condition.termination_mode.value == \
@@ -561,6 +653,9 @@ class CombatEngine(FiniteStateDevice):
                     logger.error(f"class: {termination_condition.__class__}")
                     raise e
 
+            if loss or win:
+                self.replay_log.digest = self.digest
+
             if loss:
                 self.set_state(self.States.PLAYER_LOSS)
             elif win:
@@ -587,17 +682,32 @@ class CombatEngine(FiniteStateDevice):
             from game.systems.event import AddItemEvent
             from game.systems.event.events import TextEvent
 
-            for i, q in loot.items():
-                game.add_state_device(AddItemEvent(i, q))
-
-            loot_preview = "\n".join(
-                [
-                    f"{from_cache('managers.ItemManager').get_instance(i).name} x{q}"
-                    for i, q in loot.items()
-                ]
-            )
+            def preview(items: dict[int, int]) -> str:
+                return "\n".join(
+                    [
+                        f"{from_cache('managers.ItemManager').get_instance(i).name} x{q}"
+                        for i, q in items.items()
+                    ]
+                )
+
+            text = f"You looted: \n{preview(loot)}"
+
+            if self.auto_resolve:
+                # Nobody is there to make room in the inventory, so loot is
+                # inserted directly and whatever doesn't fit is left behind
+                left_behind = {}
+                for i, q in loot.items():
+                    overflow = self._player_ref.inventory.insert_item(i, q)
+                    if overflow > 0:
+                        left_behind[i] = overflow
+
+                if len(left_behind) > 0:
+                    text += f"\nNo room for: \n{preview(left_behind)}"
+            else:
+                for i, q in loot.items():
+                    game.add_state_device(AddItemEvent(i, q))
 
-            game.add_state_device(TextEvent(f"You looted: \n{loot_preview}"))
+            game.add_state_device(TextEvent(text))
 
         @FiniteStateDevice.state_content(self, self.States.PLAYER_VICTORY)
         def content() -> dict:
@@ -623,6 +733,10 @@ class CombatEngine(FiniteStateDevice):
         @FiniteStateDevice.state_logic(self, self.States.TERMINATE,
                                        InputType.SILENT, override=True)
         def logic(_: any) -> None:
+            for condition in self._termination_conditions:
+                condition.unbind()
+
+            self._battle_state.release()
             delete_element("combat")  # Kill the global combat reference
             game.state_device_controller.set_dead()
 
@@ -94,7 +94,71 @@ def calculate_damage_to_entity(ability: Ability, target: CombatEntity) -> int:
     target_tag_res = calculate_target_resistance(ability, target)
     target_armor_res = target.equipment_controller.total_dmg_resistance
 
-    return max(
-        int((ability.damage - target_armor_res) * (1 - target_tag_res)),
-        0
-    )
+    return _damage_formula(ability.damage, target_armor_res, target_tag_res)
+
+
+def calculate_damage_to_entities(ability: Ability,
+                                 targets: list[CombatEntity]) -> list[int]:
+    """
+    For a given Ability, compute the total amount of damage dealt to each of a
+    group of targets. The result for each target is identical to that of
+    calculate_damage_to_entity.
+
+    Targets are grouped by the Equipment that they have equipped, and the
+    damage to each distinct loadout is computed only once. Large groups of
+    similar targets, such as those hit by an area-of-effect Ability, therefore
+    only pay for each loadout once.
+
+    Args:
+        ability: The Ability to check against
+        targets: The CombatEntities that the ability should be targeting
+
+    Returns: A list containing the damage dealt to each target, in order
+    """
+
+    if not isinstance(ability, Ability):
+        raise TypeError(f"Expected ability to be of type Ability, got "
+                        f"{type(ability)} instead!")
+
+    if not isinstance(ability.tags, dict):
+        raise TypeError("ability.tags should be of type dict! Got type"
+                        f"{type(ability.tags)} instead!")
+
+    # Maps a tuple of equipped item ids to the damage dealt to that loadout
+    damage_by_loadout: dict[tuple[int, ...], int] = {}
+    damages: list[int] = []
+
+    for target in targets:
+        if not isinstance(target, CombatEntity):
+            raise TypeError("Expected target to be of type CombatEntity, got "
+                            f"{type(target)} instead!")
+
+        equipment_controller = target.equipment_controller
+        loadout = equipment_controller.equipped_item_ids
+        damage = damage_by_loadout.get(loadout)
+
+        if damage is None:
+            tags_on_target = equipment_controller.all_tag_resistance
+
+            tag_values: list[float] = [0.0]
+            for ability_tag in ability.tags:
+                if ability_tag in tags_on_target:
+                    tag_values += tags_on_target[ability_tag]
+
+            tag_res = round(sum_a_tag(sorted(tag_values, reverse=True)), 2)
+
+            armor_res = equipment_controller.total_dmg_resistance
+
+            damage = _damage_formula(ability.damage, armor_res, tag_res)
+            damage_by_loadout[loadout] = damage
+
+        damages.append(damage)
+
+    return damages
+
+
+def _damage_formula(base_damage: int, armor_res: int, tag_res: float) -> int:
+    """
+    Apply the damage formula to precomputed resistances.
+    """
+    return max(int((base_damage - armor_res) * (1 - tag_res)), 0)
@@ -0,0 +1,571 @@
+"""
+A search-based combat AI.
+
+The LookaheadPlanner chooses a move for an entity by playing out many short,
+randomized continuations of the current combat and picking the move whose
+continuations turned out best. Moves at the root are chosen with the UCB1
+bandit rule, so promising moves receive more rollouts. Search stops when either
+the per-decision time budget or the maximum number of rollouts is reached.
+
+Rollouts run on a CombatSnapshot rather than on live entities. A snapshot holds
+only plain data: the resource values of every combatant, the ResourceEffects
+that are pending on each of them, and a table of the Abilities that each of
+them can use, with damage against every other combatant precomputed. Copying a
+snapshot therefore only copies a few small dicts and lists, and snapshots can
+be sent to worker processes.
+
+Snapshots model the parts of combat that matter to a decision: damage,
+resource costs, ResourceRequirements and ResourceEffects. Requirements of any
+other type are evaluated once, when the snapshot is taken, and Items are not
+considered.
+"""
+from __future__ import annotations
+
+import atexit
+import concurrent.futures
+import dataclasses
+import math
+import random
+import time
+
+from game.cache import get_config
+from game.structures.enums import TargetMode
+from game.systems.requirement.requirements import ResourceRequirement
+from game.util.rng import rng
+
+# Target modes that hit a single chosen target
+_SINGLE_TARGET_MODES = (TargetMode.SINGLE, TargetMode.SINGLE_ENEMY,
+                        TargetMode.SINGLE_ALLY, TargetMode.NOT_SELF)
+
+
+@dataclasses.dataclass(frozen=True)
+class AbilitySpec:
+    """
+    The properties of an Ability as seen by a CombatSnapshot.
+    """
+    name: str
+    target_mode: TargetMode
+    damage_to: tuple[int, ...]  # Damage dealt to each combatant, by index
+    costs: tuple[tuple[str, int | float], ...]
+    requirements: tuple[tuple[str, int | float], ...]  # ResourceRequirements
+    effects: tuple[tuple[str, int | float, int | None], ...]  # Per target
+
+    @property
+    def single_target(self) -> bool:
+        return self.target_mode in _SINGLE_TARGET_MODES
+
+
+@dataclasses.dataclass(frozen=True)
+class CombatantSpec:
+    """
+    The static properties of a combatant as seen by a CombatSnapshot.
+    """
+    name: str
+    side: int  # 0 for the player's side, 1 for the enemy side
+    maxes: dict[str, int]
+    abilities: tuple[AbilitySpec, ...]
+
+
+# An action is an ability index and a tuple of target indices, or None to pass
+Action = tuple[int, tuple[int, ...]] | None
+
+
+class CombatSnapshot:
+    """
+    A compact, copyable model of the state of a combat.
+    """
+
+    def __init__(self, combatants: tuple[CombatantSpec, ...],
+                 values: list[dict[str, int]],
+                 effects: list[list[list]],
+                 order: tuple[int, ...], primary_resource: str):
+        self.combatants = combatants  # Shared between copies
+        self.values = values
+        self.effects = effects  # [resource, quantity, remaining duration]
+        self.order = order  # Turn order, starting with the next turn
+        self.primary_resource = primary_resource
+
+    def copy(self) -> CombatSnapshot:
+        return CombatSnapshot(
+            self.combatants,
+            [dict(v) for v in self.values],
+            [[list(e) for e in effects] for effects in self.effects],
+            self.order,
+            self.primary_resource
+        )
+
+    @classmethod
+    def from_combat(cls, engine, active_entity) -> CombatSnapshot:
+        """
+        Take a snapshot of a live CombatEngine.
+
+        Args:
+            engine: The CombatEngine to snapshot
+            active_entity: The entity whose turn it currently is
+
+        Returns: A new CombatSnapshot
+        """
+        from game.cache import from_cache
+        from game.systems.combat.combat_engine.combat_helpers import \
+            calculate_damage_to_entities
+        from game.systems.combat.effect import ResourceEffect
+
+        allies = engine.allies
+        enemies = engine.enemies
+        entities = allies + enemies
+        ability_manager = from_cache("managers.AbilityManager")
+
+        combatants = []
+        values = []
+        for entity in entities:
+            abilities = []
+            # Sorted, so that action indexes don't depend on the hash seed
+            for name in sorted(entity.ability_controller.abilities):
+                ability = ability_manager.get_ref(name)
+
+                # Requirements that are not ResourceRequirements are static
+                # for the purposes of the search.
+                if not all(r.fulfilled(entity) for r in ability.requirements
+                           if not isinstance(r, ResourceRequirement)):
+                    continue
+
+                abilities.append(AbilitySpec(
+                    name=name,
+                    target_mode=ability.target_mode,
+                    damage_to=tuple(
+                        calculate_damage_to_entities(ability, entities)),
+                    costs=tuple(ability.costs.items()),
+                    requirements=tuple(
+                        (r.resource_name, r.adjust_quantity)
+                        for r in ability.requirements
+                        if isinstance(r, ResourceRequirement)
+                    ),
+                    effects=tuple(
+                        (e._resource_name, e._adjust_quantity, e.duration)
+                        for effects in ability.effects.values()
+                        for e in effects if isinstance(e, ResourceEffect)
+                    )
+                ))
+
+            resource_controller = entity.resource_controller
+            combatants.append(CombatantSpec(
+                name=entity.name,
+                side=0 if entity in allies else 1,
+                maxes=dict(zip(resource_controller.names,
+                               resource_controller.maxes)),
+                abilities=tuple(abilities)
+            ))
+            values.append(dict(zip(resource_controller.names,
+                                   resource_controller.values)))
+
+        # Pending ResourceEffects on each combatant
+        effects = [[
+            [e._resource_name, e._adjust_quantity, e.duration]
+            for phase_effects in entity.active_effects.values()
+            for e in phase_effects
+            if isinstance(e, ResourceEffect) and
+               (e.duration is None or e.duration > 0)
+        ] for entity in entities]
+
+        # Turn order, rotated so that the active entity acts first
+        index = {id(e): i for i, e in enumerate(entities)}
+        order = [index[id(e)] for e in engine.turn_order if id(e) in index]
+        active = index[id(active_entity)]
+        if active in order:
+            order.remove(active)
+        order.insert(0, active)
+
+        return cls(tuple(combatants), values, effects, tuple(order),
+                   get_config()["resources"]["primary_resource"])
+
+    # Queries
+
+    def alive(self, i: int) -> bool:
+        return self.values[i][self.primary_resource] >= 1
+
+    def outcome(self) -> int:
+        """
+        Returns 1 if the player's side has won, -1 if it has lost, and 0 if the
+        combat is ongoing.
+        """
+        sides_alive = {self.combatants[i].side for i in range(len(self.values))
+                       if self.alive(i)}
+
+        if 1 not in sides_alive:
+            return 1
+
+        if 0 not in sides_alive:
+            return -1
+
+        return 0
+
+    def evaluate(self, side: int) -> float:
+        """
+        Score the state from the point of view of a side. The score is the
+        average fraction of primary resource that the opposing side has lost,
+        minus that of the given side, plus 1 for a win or -1 for a loss.
+        """
+        lost = [0.0, 0.0]
+        count = [0, 0]
+        for i, spec in enumerate(self.combatants):
+            maximum = spec.maxes[self.primary_resource]
+            value = self.values[i][self.primary_resource]
+            lost[spec.side] += 1 - value / maximum if maximum > 0 else 1
+            count[spec.side] += 1
+
+        score = lost[1 - side] / max(count[1 - side], 1) - \
+            lost[side] / max(count[side], 1)
+
+        outcome = self.outcome()
+        if outcome != 0:
+            score += outcome if side == 0 else -outcome
+
+        return score
+
+    def _fulfilled(self, i: int, spec: AbilitySpec) -> bool:
+        values = self.values[i]
+        maxes = self.combatants[i].maxes
+        for resource, quantity in spec.requirements:
+            if isinstance(quantity, int):
+                if values[resource] < quantity:
+                    return False
+
+            elif maxes[resource] <= 0 or \
+                    values[resource] / maxes[resource] < quantity:
+                return False
+
+        return True
+
+    def _targets(self, i: int, mode: TargetMode) -> list[int]:
+        side = self.combatants[i].side
+        living = [j for j in range(len(self.values)) if self.alive(j)]
+
+        match mode:
+            case TargetMode.SELF:
+                return [i]
+            case TargetMode.NOT_SELF:
+                return [j for j in living if j != i]
+            case TargetMode.SINGLE_ALLY | TargetMode.ALL_ALLY:
+                return [j for j in living if self.combatants[j].side == side]
+            case TargetMode.SINGLE_ENEMY | TargetMode.ALL_ENEMY:
+                return [j for j in living if self.combatants[j].side != side]
+            case _:
+                return living
+
+    def legal_actions(self, i: int) -> list[Action]:
+        """
+        Every action available to a combatant, including passing.
+        """
+        actions: list[Action] = [None]
+
+        for a, spec in enumerate(self.combatants[i].abilities):
+            if not self._fulfilled(i, spec):
+                continue
+
+            targets = self._targets(i, spec.target_mode)
+            if len(targets) < 1:
+                continue
+
+            if spec.single_target:
+                actions.extend((a, (t,)) for t in targets)
+            else:
+                actions.append((a, tuple(targets)))
+
+        return actions
+
+    def immediate_damage(self, i: int, action: Action) -> int:
+        """
+        The net damage that an action deals to the acting combatant's enemies.
+        """
+        if action is None:
+            return 0
+
+        spec = self.combatants[i].abilities[action[0]]
+        side = self.combatants[i].side
+
+        return sum(
+            spec.damage_to[t] if self.combatants[t].side != side
+            else -spec.damage_to[t] for t in action[1]
+        )
+
+    # Transitions
+
+    def _adjust(self, i: int, resource: str, quantity: int | float) -> None:
+        maximum = self.combatants[i].maxes[resource]
+        value = self.values[i][resource]
+
+        if isinstance(quantity, float):
+            self.values[i][resource] = round(
+                max(0, min(maximum, value + maximum * quantity)))
+        else:
+            self.values[i][resource] = max(0, min(maximum, value + quantity))
+
+    def start_turn(self, i: int) -> None:
+        """
+        Perform the pending ResourceEffects of a combatant and expire them.
+        """
+        remaining = []
+        for effect in self.effects[i]:
+            resource, quantity, duration = effect
+            if duration is not None and duration < 1:
+                continue
+
+            if resource in self.values[i]:
+                self._adjust(i, resource, quantity)
+
+            if duration is not None:
+                effect[2] -= 1
+                if effect[2] < 1:
+                    continue
+
+            remaining.append(effect)
+
+        self.effects[i] = remaining
+
+    def apply(self, i: int, action: Action) -> None:
+        """
+        Perform an action for a combatant.
+        """
+        if action is None:
+            return
+
+        spec = self.combatants[i].abilities[action[0]]
+        for t in action[1]:
+            self.effects[t].extend(list(e) for e in spec.effects)
+            self._adjust(t, self.primary_resource, -spec.damage_to[t])
+
+        for resource, quantity in spec.costs:
+            self._adjust(i, resource, -abs(quantity))
+
+
+def _rollout_policy(snapshot: CombatSnapshot, i: int, rng: random.Random,
+                    epsilon: float) -> Action:
+    """
+    The policy followed by every combatant during a rollout: usually the
+    action that deals the most immediate damage, but sometimes a random one.
+    """
+    actions = snapshot.legal_actions(i)
+
+    if rng.random() < epsilon:
+        return rng.choice(actions)
+
+    return max(actions, key=lambda a: snapshot.immediate_damage(i, a))
+
+
+def _rollout(snapshot: CombatSnapshot, action: Action, depth: int,
+             rng: random.Random, epsilon: float) -> float:
+    """
+    Play out a single continuation of the snapshot after the first combatant
+    in the turn order performs the given action.
+    """
+    state = snapshot.copy()
+    order = state.order
+    actor = order[0]
+    side = state.combatants[actor].side
+
+    state.apply(actor, action)
+
+    turn = 1
+    while turn <= depth and state.outcome() == 0:
+        i = order[turn % len(order)]
+        turn += 1
+
+        if not state.alive(i):
+            continue
+
+        state.start_turn(i)
+        if not state.alive(i):
+            continue
+
+        state.apply(i, _rollout_policy(state, i, rng, epsilon))
+
+    return state.evaluate(side)
+
+
+def search(snapshot: CombatSnapshot, depth: int, time_budget: float | None,
+           max_rollouts: int, seed: int = None,
+           epsilon: float = 0.25) -> dict[Action, tuple[int, float]]:
+    """
+    Run rollouts for every legal action of the first combatant in the turn
+    order, allocating rollouts to actions with UCB1.
+
+    Args:
+        snapshot: The state to search from
+        depth: The number of turns that each rollout plays out
+        time_budget: The wall-clock budget of the search, in seconds. If None,
+            exactly max_rollouts rollouts are made.
+        max_rollouts: The maximum number of rollouts
+        seed: A seed for the rollout policy
+        epsilon: The probability of a random action during a rollout
+
+    Returns: A dict mapping each action to its rollout count and total score
+    """
+    rng = random.Random(seed)
+    deadline = None if time_budget is None else \
+        time.perf_counter() + time_budget
+    actor = snapshot.order[0]
+
+    stats: dict[Action, list] = {a: [0, 0.0]
+                                 for a in snapshot.legal_actions(actor)}
+
+    for n in range(max_rollouts):
+        # Every action is tried once before UCB1 takes over
+        if n < len(stats):
+            action = list(stats)[n]
+        else:
+            log_n = math.log(n)
+            action = max(
+                stats, key=lambda a: stats[a][1] / stats[a][0] +
+                                     math.sqrt(2 * log_n / stats[a][0])
+            )
+
+        stats[action][0] += 1
+        stats[action][1] += _rollout(snapshot, action, depth, rng, epsilon)
+
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+    return {a: (s[0], s[1]) for a, s in stats.items()}
+
+
+class LookaheadPlanner:
+    """
+    Chooses moves by searching CombatSnapshots within a time budget.
+
+    Settings default to the 'combat.lookahead' section of the config. If more
+    than one worker is configured, the budget is spent in parallel by a shared
+    process pool and the results of each worker are combined.
+
+    How many rollouts fit in the time budget depends on the load of the
+    machine, so the number that each worker made is stored in `last_rollouts`
+    after every plan. Passing those counts to a later plan repeats it exactly,
+    which is how combat replays reproduce lookahead decisions.
+    """
+
+    TIME_BUDGET: float = 0.05  # Seconds
+    DEPTH: int = 12
+    MAX_ROLLOUTS: int = 2000
+    WORKERS: int = 1
+
+    _executor: concurrent.futures.ProcessPoolExecutor | None = None
+    _executor_workers: int = 0
+
+    def __init__(self, time_budget: float = None, depth: int = None,
+                 max_rollouts: int = None, workers: int = None,
+                 seed: int = None):
+        self.time_budget: float = self._setting(
+            time_budget, "time_budget", self.TIME_BUDGET)
+        self.depth: int = self._setting(depth, "depth", self.DEPTH)
+        self.max_rollouts: int = self._setting(
+            max_rollouts, "max_rollouts", self.MAX_ROLLOUTS)
+        self.workers: int = self._setting(workers, "workers", self.WORKERS)
+        self.seed: int | None = seed
+
+        # The number of rollouts made by each worker during the last plan
+        self.last_rollouts: list[int] = []
+
+        if self.time_budget <= 0:
+            raise ValueError(
+                f"time_budget must be positive! Got {self.time_budget}")
+
+        if self.depth < 0 or self.max_rollouts < 1 or self.workers < 1:
+            raise ValueError("depth must not be negative, and max_rollouts and "
+                             "workers must be at least 1!")
+
+    @staticmethod
+    def _setting(value: any, key: str, default: any) -> any:
+        """
+        Read a setting from the 'combat.lookahead' section of the config unless
+        it was given explicitly.
+        """
+        if value is not None:
+            return value
+
+        config = get_config()
+        if config is None or "lookahead" not in config.get("combat", {}):
+            return default
+
+        return config["combat"]["lookahead"].get(key, default)
+
+    @classmethod
+    def _get_executor(cls, workers: int) -> concurrent.futures.Executor:
+        """
+        Get the shared process pool, replacing it if it has the wrong size.
+        """
+        if cls._executor is None or cls._executor_workers != workers:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False)
+            else:
+                atexit.register(cls.shutdown_executor)
+
+            cls._executor = concurrent.futures.ProcessPoolExecutor(workers)
+            cls._executor_workers = workers
+
+        return cls._executor
+
+    @classmethod
+    def shutdown_executor(cls) -> None:
+        """
+        Shut down the shared process pool, if there is one. A new pool is
+        started the next time a planner with more than one worker plans. Called
+        automatically when the interpreter exits.
+        """
+        atexit.unregister(cls.shutdown_executor)
+
+        if cls._executor is not None:
+            cls._executor.shutdown()
+            cls._executor = None
+            cls._executor_workers = 0
+
+    def plan(self, snapshot: CombatSnapshot, rollouts: list[int] = None
+             ) -> Action:
+        """
+        Choose the best action for the first combatant in the snapshot's turn
+        order.
+
+        Args:
+            snapshot: The state to plan from
+            rollouts: The number of rollouts for each worker to make, as stored
+                in `last_rollouts` by an earlier plan. If given, the time
+                budget is ignored so that the earlier plan is repeated exactly.
+        """
+        # Unseeded planners draw from the session RNG so that a seeded
+        # session makes the same rollouts
+        seed = self.seed if self.seed is not None else rng.spawn_seed()
+
+        if rollouts is None:
+            share = max(1, self.max_rollouts // self.workers)
+            jobs = [(self.time_budget, share)] * self.workers
+        elif len(rollouts) != self.workers:
+            raise ValueError(f"Expected rollout counts for {self.workers} "
+                             f"workers! Got {len(rollouts)}")
+        else:
+            jobs = [(None, count) for count in rollouts]
+
+        if self.workers == 1:
+            results = [search(snapshot, self.depth, *jobs[0], seed)]
+        else:
+            executor = self._get_executor(self.workers)
+            futures = [
+                executor.submit(search, snapshot, self.depth,
+                                time_budget, count, seed + w)
+                for w, (time_budget, count) in enumerate(jobs)
+            ]
+            results = [f.result() for f in futures]
+
+        self.last_rollouts = [sum(count for count, _ in result.values())
+                              for result in results]
+
+        totals: dict[Action, list] = {}
+        for result in results:
+            for action, (count, score) in result.items():
+                total = totals.setdefault(action, [0, 0.0])
+                total[0] += count
+                total[1] += score
+
+        # Prefer the action with the best mean score
+        return max(
+            (a for a in totals if totals[a][0] > 0),
+            key=lambda a: totals[a][1] / totals[a][0],
+            default=None
+        )
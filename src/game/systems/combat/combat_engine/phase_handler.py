@@ -4,6 +4,7 @@ import game
 import game.systems.entity.entities as entities
 from game.cache import from_cache
 from game.structures.errors import CombatError
+from game.systems.combat.effect import effect_pool
 
 
 class PhaseHandler(ABC):
@@ -51,7 +52,8 @@ class EffectActivator(PhaseHandler):
                 if effect.on_remove:
                     from game.systems.event.events import TextEvent
 
-                    game.add_state_device(TextEvent(effect.on_remove))
+                    game.add_state_device(TextEvent(
+                        effect.on_remove.format(target=active_entity.name)))
 
                 expired_effects.append(effect)
                 continue
@@ -59,9 +61,14 @@ class EffectActivator(PhaseHandler):
             effect.reset()  # Reset the Effect state device in case it was previously used
             game.add_state_device(effect)  # Add it to the stack
 
-        # Removed expired effecs
-        for effect in expired_effects:
-            active_entity.active_effects[ce.current_phase].remove(effect)
+        # Remove expired effects and recycle them
+        if expired_effects:
+            active_entity.active_effects[ce.current_phase] = [
+                effect for effect in active_entity.active_effects[ce.current_phase]
+                if effect.duration >= 1
+            ]
+            for effect in expired_effects:
+                effect_pool.release(effect)
 
 
 class ChoiceActivator(PhaseHandler):
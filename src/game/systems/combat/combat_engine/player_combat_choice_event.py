@@ -94,7 +94,7 @@ class PlayerCombatChoiceEvent(Event):
                 self.set_state(self.States.CANNOT_USE_ABILITY)
 
             # Check if the ability targets a group. If so, go to the group target confirmation state
-            elif from_cache("managers.AbilityManager").get_instance(
+            elif from_cache("managers.AbilityManager").get_ref(
                     selected_ability).target_mode in [TargetMode.ALL, TargetMode.ALL_ALLY, TargetMode.ALL_ENEMY]:
 
                 self.set_state(self.States.CONFIRM_GROUP_ABILITY_TARGET)
@@ -0,0 +1,116 @@
+"""
+Compact, replayable records of combats.
+
+Every random decision made during a combat draws from the session RNG, which
+the CombatEngine reseeds with a seed of its own when it is created. Given that
+seed, the participants, and the inputs that the player delivered while the
+combat was active, a combat can be played out again exactly, provided that the
+player is in the same state as when the combat started. The replay records a
+fingerprint of that state, and the replay runner, which lives in the simulator
+module, refuses to replay with a player that doesn't match it.
+
+LookaheadPlanners stop at a time budget, so the number of rollouts behind each
+lookahead decision is recorded as well, and a replay repeats those counts.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+from typing import TYPE_CHECKING
+
+from game.structures.loadable_factory import LoadableFactory
+
+if TYPE_CHECKING:
+    from game.systems.entity.entities import CombatEntity
+
+
+@dataclasses.dataclass
+class CombatReplay:
+    """
+    The seed and inputs of a single combat.
+    """
+    seed: int
+    ally_entity_ids: list[int]
+    enemy_entity_ids: list[int]
+    inputs: list = dataclasses.field(default_factory=list)
+    # Rollouts made by each LookaheadPlanner worker, per lookahead decision
+    rollouts: list[list[int]] = dataclasses.field(default_factory=list)
+    headless: bool = False  # Whether text output was suppressed while recording
+    digest: str | None = None  # Fingerprint of the result, set when combat ends
+    player_fingerprint: str | None = None  # See fingerprint_entity
+
+    def to_json(self) -> dict[str, any]:
+        """
+        Serialize the replay to a JSON-compatible dict. Unset fields are
+        omitted.
+        """
+        return {k: v for k, v in dataclasses.asdict(self).items()
+                if v is not None}
+
+    @staticmethod
+    def from_json(json: dict[str, any]) -> CombatReplay:
+        """
+        Instantiate a CombatReplay from a JSON blob produced by to_json.
+
+        Required JSON fields:
+        - seed: (int)
+        - ally_entity_ids: (list)
+        - enemy_entity_ids: (list)
+        - inputs: (list)
+
+        Optional JSON fields:
+        - rollouts: (list)
+        - headless: (bool)
+        - digest: (str)
+        - player_fingerprint: (str)
+        """
+        required_fields = [
+            ("seed", int), ("ally_entity_ids", list),
+            ("enemy_entity_ids", list), ("inputs", list)
+        ]
+
+        optional_fields = [
+            ("rollouts", list), ("headless", bool), ("digest", str),
+            ("player_fingerprint", str)
+        ]
+
+        LoadableFactory.validate_fields(required_fields, json, True, False)
+        LoadableFactory.validate_fields(optional_fields, json, False, False)
+
+        return CombatReplay(json["seed"], list(json["ally_entity_ids"]),
+                            list(json["enemy_entity_ids"]), list(json["inputs"]),
+                            [list(r) for r in json.get("rollouts", [])],
+                            json.get("headless", False), json.get("digest"),
+                            json.get("player_fingerprint"))
+
+
+def fingerprint_entity(entity: CombatEntity) -> str:
+    """
+    Fingerprint the state of an entity that affects how a combat plays out: its
+    resources, abilities, inventory, equipment, turn speed and agent policy.
+    """
+    ec = entity.equipment_controller
+    state = (
+        entity.id, entity.name, entity.turn_speed,
+        getattr(entity, "naive", None), getattr(entity, "lookahead", None),
+        entity.resource_controller.fingerprint,
+        tuple(sorted(entity.ability_controller.abilities)),
+        entity.inventory.fingerprint,
+        tuple((slot, ec[slot].item_id) for slot in ec.enabled_slots)
+    )
+
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def digest_combat(total_turn_cycles: int,
+                  damage_log: list[tuple[CombatEntity, CombatEntity, int]]) -> str:
+    """
+    Fingerprint the result of a combat. Two runs of a combat with the same
+    fingerprint dealt the same damage, in the same order, over the same number
+    of turn cycles.
+    """
+    digest = hashlib.sha1(str(total_turn_cycles).encode())
+    for source, target, damage in damage_log:
+        digest.update(f"|{source.name}>{target.name}:{damage}".encode())
+
+    return digest.hexdigest()
@@ -0,0 +1,552 @@
+"""
+Headless combat simulation for balance testing.
+
+A CombatSimulator runs complete fights through the regular CombatEngine without
+a frontend. The engine is driven by a HeadlessStateController, which stands in
+for the global GameStateController for the duration of a fight: silent and
+display-only devices are advanced immediately, TextEvents are discarded, and
+the player is replaced by a copy that chooses its actions with the
+CombatAgentMixin policy rather than spawning a PlayerCombatChoiceEvent.
+
+Since the same engine, phase handlers, Effects and TerminationHandlers are
+used, simulated fights follow exactly the same damage, effect, turn-order and
+termination rules as interactive ones.
+
+Batches of fights may be spread across a process pool. Each worker runs its
+share of fights serially and returns a SimulationReport, and the reports are
+merged into one.
+
+Every fight, simulated or interactive, produces a CombatReplay, which
+replay_combat plays out again exactly when given the player as it was when the
+fight started.
+
+The same machinery resolves auto-resolved combats against the live game state,
+collecting their text output into a single log rather than discarding it.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import os
+import statistics
+import types
+from enum import Enum
+from typing import Callable, Iterable
+
+from loguru import logger
+
+import game
+from game.cache import from_cache, get_cache, delete_element
+from game.game_state_controller import GameStateController
+from game.structures.enums import InputType
+from game.structures.errors import CombatError
+from game.structures.state_device import StateDevice
+from game.systems.combat.combat_engine.combat_agent import CombatAgentMixin
+from game.systems.combat.combat_engine.combat_engine import CombatEngine
+from game.systems.combat.combat_engine.replay import CombatReplay
+from game.util.rng import rng
+
+
+class Outcome(Enum):
+    """
+    The result of a simulated fight, from the point of view of the player.
+    """
+    WIN = 0
+    LOSS = 1
+    TIMEOUT = 2  # The fight did not end within the turn cycle limit
+
+
+@dataclasses.dataclass
+class FightResult:
+    """
+    A record of a single simulated fight.
+    """
+    outcome: Outcome
+    turn_cycles: int
+    damage_dealt: int  # Damage dealt by the player's side
+    damage_taken: int  # Damage dealt to the player's side
+    replay: CombatReplay | None = None
+
+
+@dataclasses.dataclass
+class SimulationReport:
+    """
+    Aggregated results of a batch of simulated fights.
+    """
+    wins: int = 0
+    losses: int = 0
+    timeouts: int = 0
+    turn_cycles: list[int] = dataclasses.field(default_factory=list)
+    damage_dealt: list[int] = dataclasses.field(default_factory=list)
+    damage_taken: list[int] = dataclasses.field(default_factory=list)
+
+    @property
+    def fights(self) -> int:
+        return self.wins + self.losses + self.timeouts
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights > 0 else 0.0
+
+    def add(self, result: FightResult) -> None:
+        """
+        Record the result of a single fight.
+        """
+        match result.outcome:
+            case Outcome.WIN:
+                self.wins += 1
+            case Outcome.LOSS:
+                self.losses += 1
+            case Outcome.TIMEOUT:
+                self.timeouts += 1
+
+        self.turn_cycles.append(result.turn_cycles)
+        self.damage_dealt.append(result.damage_dealt)
+        self.damage_taken.append(result.damage_taken)
+
+    def merge(self, other: SimulationReport) -> None:
+        """
+        Fold the results of another report into this one.
+        """
+        self.wins += other.wins
+        self.losses += other.losses
+        self.timeouts += other.timeouts
+        self.turn_cycles.extend(other.turn_cycles)
+        self.damage_dealt.extend(other.damage_dealt)
+        self.damage_taken.extend(other.damage_taken)
+
+    @staticmethod
+    def describe(values: list[int]) -> dict[str, float]:
+        """
+        Summarize a distribution of values.
+        """
+        if len(values) < 1:
+            return {}
+
+        return {
+            "mean": statistics.fmean(values),
+            "median": statistics.median(values),
+            "stdev": statistics.pstdev(values),
+            "min": min(values),
+            "max": max(values)
+        }
+
+    def summary(self) -> dict[str, any]:
+        """
+        A summary of the report, suitable for printing or serializing.
+        """
+        return {
+            "fights": self.fights,
+            "wins": self.wins,
+            "losses": self.losses,
+            "timeouts": self.timeouts,
+            "win_rate": self.win_rate,
+            "turn_cycles": self.describe(self.turn_cycles),
+            "damage_dealt": self.describe(self.damage_dealt),
+            "damage_taken": self.describe(self.damage_taken)
+        }
+
+
+class HeadlessStateController(GameStateController):
+    """
+    A GameStateController that runs a single CombatEngine to completion without
+    producing frames.
+
+    Unlike the global controller, the stack does not fall back to the player's
+    room when it is emptied, and TextEvents are discarded as they are added
+    unless suppress_text is False. If a transcript is given, the text of each
+    discarded TextEvent is appended to it.
+    """
+
+    ENDED_STATES = (CombatEngine.States.PLAYER_VICTORY,
+                    CombatEngine.States.PLAYER_LOSS)
+
+    def __init__(self, suppress_text: bool = True, transcript: list = None,
+                 **kwargs):
+        self.suppress_text: bool = suppress_text
+        self.transcript: list[str | list] | None = transcript
+        super().__init__(**kwargs)
+
+    def _add_default_device(self) -> None:
+        pass
+
+    def add_state_device(self, device: StateDevice) -> None:
+        from game.systems.event.events import TextEvent
+
+        if self.suppress_text and type(device) is TextEvent:
+            if self.transcript is not None:
+                self.transcript.append(device.text)
+            return
+
+        super().add_state_device(device)
+
+    def run(self, engine: CombatEngine, max_turn_cycles: int,
+            inputs: Iterable = None, finish: bool = False) -> Outcome:
+        """
+        Advance the engine, and every device that it spawns, until the combat
+        ends or the turn cycle limit is exceeded.
+
+        Args:
+            engine: The CombatEngine to run
+            max_turn_cycles: The maximum number of turn cycles before the fight
+                is considered a timeout
+            inputs: The inputs to deliver to devices that expect input, in
+                order. If None, every such device receives an empty input.
+            finish: If True, the engine's victory or loss logic is run once the
+                combat ends, along with every device it spawns, until the stack
+                is empty.
+
+        Returns: The Outcome of the fight
+        """
+        engine.replay_log.headless = self.suppress_text
+        inputs = None if inputs is None else iter(inputs)
+        self.add_state_device(engine)
+        engine_entry = self.state_device_stack[-1]
+        outcome = None
+
+        while True:
+            if self._death_reported:
+                self._burn_dead_devices()
+
+            # Only reachable when finishing, since the engine is the last
+            # device to die
+            if len(self.state_device_stack) < 1:
+                return outcome
+
+            device = self._get_state_device()
+
+            if device is engine and outcome is None:
+                if engine.current_state == CombatEngine.States.PLAYER_VICTORY:
+                    outcome = Outcome.WIN
+
+                elif engine.current_state == CombatEngine.States.PLAYER_LOSS:
+                    outcome = Outcome.LOSS
+
+                elif engine.total_turn_cycles > max_turn_cycles:
+                    return Outcome.TIMEOUT
+
+                if outcome is not None and not finish:
+                    return outcome
+
+            if device.input_type == InputType.SILENT:
+                # Silent states are advanced under the controller's step and
+                # time budgets, which restart with every turn cycle. The
+                # advance stops early so that the outcome is checked here, and
+                # once the engine dies, since that empties the stack. Other
+                # dead devices are burned by the advance itself.
+                turn_cycle = engine.total_turn_cycles
+                self._advance_if_silent(
+                    until=lambda: engine.total_turn_cycles != turn_cycle or
+                    engine.current_state in self.ENDED_STATES or
+                    engine_entry[1].dead)
+                continue
+
+            # Without recorded inputs, devices that expect input only display
+            # text, so an empty input is enough to advance them.
+            user_input = "" if inputs is None else next(inputs, None)
+            if user_input is None:
+                raise CombatError(
+                    f"Ran out of inputs for {device} during a replay!")
+
+            if not self.deliver_input(user_input):
+                raise CombatError(
+                    f"{device} rejected input during a simulated combat! "
+                    f"State: {getattr(device, 'current_state', None)}"
+                )
+
+
+class CombatSimulator:
+    """
+    Runs batches of headless fights between a fixed set of allies and enemies.
+
+    The player's side consists of the ally entities and a player agent. By
+    default, the player agent is a copy of the cached player whose turns are
+    chosen by the CombatAgentMixin policy. If player_id is given, a fresh
+    instance of that entity is used instead.
+    """
+
+    DEFAULT_MAX_TURN_CYCLES: int = 200
+
+    def __init__(self, ally_entity_ids: list[int], enemy_entity_ids: list[int],
+                 player_id: int = None, naive: bool = None,
+                 max_turn_cycles: int = DEFAULT_MAX_TURN_CYCLES):
+        """
+        Args:
+            ally_entity_ids: The ids of the entities fighting with the player
+            enemy_entity_ids: The ids of the entities fighting the player
+            player_id: The id of an entity to use as the player agent. If None,
+                the cached player is copied.
+            naive: If not None, overrides the agent policy of the player
+            max_turn_cycles: The maximum number of turn cycles per fight
+        """
+        if len(enemy_entity_ids) < 1:
+            raise ValueError("Combat must have at least one enemy entity!")
+
+        if max_turn_cycles < 1:
+            raise ValueError(
+                f"max_turn_cycles must be at least 1! Got {max_turn_cycles}")
+
+        self.ally_entity_ids: list[int] = list(ally_entity_ids)
+        self.enemy_entity_ids: list[int] = list(enemy_entity_ids)
+        self.player_id: int | None = player_id
+        self.naive: bool | None = naive
+        self.max_turn_cycles: int = max_turn_cycles
+
+    def _get_player_factory(self) -> Callable[[], CombatAgentMixin]:
+        """
+        Build a callable that spawns a fresh player agent for each fight.
+        """
+        if self.player_id is not None:
+            entity_manager = from_cache("managers.EntityManager")
+
+            def spawn():
+                return entity_manager.get_instance(self.player_id)
+
+        else:
+            from game.systems.entity.prototype import EntityPrototype
+            prototype = EntityPrototype(get_cache()["player"])
+
+            def spawn():
+                agent = prototype.spawn()
+
+                # Swap out the PlayerAgentMixin's interactive choice logic
+                agent.make_choice = types.MethodType(
+                    CombatAgentMixin.make_choice, agent)
+                agent._choice_logic = types.MethodType(
+                    CombatAgentMixin._choice_logic, agent)
+                return agent
+
+        def factory():
+            agent = spawn()
+            if self.naive is not None:
+                agent.naive = self.naive
+            return agent
+
+        return factory
+
+    def _run_fight(self, player: CombatAgentMixin,
+                   replay: CombatReplay = None) -> FightResult:
+        """
+        Run a single fight with the given player agent. If a replay is given,
+        the fight is seeded and fed inputs from it.
+        """
+        if from_cache("combat") is not None:
+            raise CombatError("Cannot simulate a fight while a combat is active!")
+
+        controller = HeadlessStateController(
+            suppress_text=replay is None or replay.headless)
+        cache = get_cache()
+        previous_player = cache["player"]
+        previous_controller = game.state_device_controller
+
+        # The session RNG advances by one seed per fight, regardless of how
+        # many random decisions the fight makes
+        seed = rng.spawn_seed() if replay is None else replay.seed
+        previous_rng_state = rng.getstate()
+
+        cache["player"] = player
+        game.state_device_controller = controller
+        engine = None
+        try:
+            engine = CombatEngine(
+                self.ally_entity_ids, self.enemy_entity_ids, seed=seed,
+                recorded_rollouts=None if replay is None else replay.rollouts)
+
+            if replay is not None and replay.player_fingerprint is not None \
+                    and engine.replay_log.player_fingerprint != \
+                    replay.player_fingerprint:
+                raise CombatError(
+                    "Cannot replay a combat with a player that is not in the "
+                    "state it was in when the combat was recorded!")
+
+            outcome = controller.run(engine, self.max_turn_cycles,
+                                     None if replay is None else replay.inputs)
+
+        finally:
+            _release(engine)
+            cache["player"] = previous_player
+            game.state_device_controller = previous_controller
+            rng.setstate(previous_rng_state)
+
+        return _get_result(engine, outcome)
+
+    def run_fight(self) -> FightResult:
+        """
+        Run a single fight in this process.
+
+        Returns: The FightResult of the fight, including its replay
+        """
+        logger.disable("game")
+        try:
+            return self._run_fight(self._get_player_factory()())
+        finally:
+            logger.enable("game")
+
+    def run_serial(self, fights: int) -> SimulationReport:
+        """
+        Run a number of fights in this process.
+
+        Args:
+            fights: The number of fights to run
+
+        Returns: A SimulationReport of the fights
+        """
+        report = SimulationReport()
+        spawn_player = self._get_player_factory()
+
+        logger.disable("game")
+        try:
+            for _ in range(fights):
+                report.add(self._run_fight(spawn_player()))
+        finally:
+            logger.enable("game")
+
+        return report
+
+    def replay(self, replay: CombatReplay) -> FightResult:
+        """
+        Play out a fight recorded by this simulator again.
+
+        Args:
+            replay: The CombatReplay of the fight
+
+        Returns: The FightResult of the replayed fight. Its replay digest
+        matches the recorded one if the fight was reproduced exactly.
+        """
+        logger.disable("game")
+        try:
+            return self._run_fight(self._get_player_factory()(), replay)
+        finally:
+            logger.enable("game")
+
+    def run(self, fights: int, workers: int = None) -> SimulationReport:
+        """
+        Run a number of fights, spread across a pool of worker processes.
+
+        Args:
+            fights: The number of fights to run
+            workers: The number of worker processes. Defaults to the number of
+                CPUs. If 1, the fights are run in this process.
+
+        Returns: A SimulationReport of all fights
+        """
+        if fights < 0:
+            raise ValueError(f"fights must not be negative! Got {fights}")
+
+        workers = min(workers or os.cpu_count() or 1, max(fights, 1))
+        if workers == 1:
+            return self.run_serial(fights)
+
+        # Spread the fights as evenly as possible between workers
+        shares = [fights // workers + (1 if i < fights % workers else 0)
+                  for i in range(workers)]
+
+        report = SimulationReport()
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            for partial in executor.map(_run_share, [self] * workers, shares):
+                report.merge(partial)
+
+        return report
+
+
+def _run_share(simulator: CombatSimulator, fights: int) -> SimulationReport:
+    """
+    Process pool entry point. Run a share of a simulator's fights.
+    """
+    return simulator.run_serial(fights)
+
+
+def replay_combat(replay: CombatReplay, player: CombatAgentMixin,
+                  max_turn_cycles: int = CombatSimulator.DEFAULT_MAX_TURN_CYCLES
+                  ) -> FightResult:
+    """
+    Play out a recorded combat again, without a frontend.
+
+    The combat changes the player, so the player must be captured before the
+    combat starts, for example with EntityPrototype(player).spawn().
+
+    Args:
+        replay: The CombatReplay of the combat
+        player: The player entity, in the state it was in when the combat
+            started. Its choices are made from the recorded inputs.
+        max_turn_cycles: The maximum number of turn cycles to replay
+
+    Raises: CombatError if the player does not match the state recorded in the
+    replay
+
+    Returns: The FightResult of the replayed combat. Its replay digest matches
+    the recorded one if the combat was reproduced exactly.
+    """
+    simulator = CombatSimulator(replay.ally_entity_ids,
+                                replay.enemy_entity_ids,
+                                max_turn_cycles=max_turn_cycles)
+    return simulator._run_fight(player, replay)
+
+
+def auto_resolve(engine: CombatEngine,
+                 max_turn_cycles: int = CombatSimulator.DEFAULT_MAX_TURN_CYCLES
+                 ) -> tuple[FightResult, list[str | list]]:
+    """
+    Run a combat to completion in a single call, against the live game state.
+
+    Unlike a simulated fight, the cached player takes part, so damage taken,
+    items consumed and loot gained persist. Text output is collected rather
+    than displayed. Nobody can answer prompts, so loot is inserted directly
+    into the player's inventory and any that doesn't fit is left behind and
+    listed in the text.
+
+    Args:
+        engine: The CombatEngine to resolve. Should be created with
+            auto_resolve set, so that the player's turns are chosen by the AI.
+        max_turn_cycles: The maximum number of turn cycles before the combat is
+            abandoned as a timeout
+
+    Returns: The FightResult of the combat and the text it produced, in order
+    """
+    transcript = []
+    controller = HeadlessStateController(transcript=transcript)
+    previous_controller = game.state_device_controller
+
+    game.state_device_controller = controller
+    try:
+        outcome = controller.run(engine, max_turn_cycles, finish=True)
+    finally:
+        _release(engine)
+        game.state_device_controller = previous_controller
+
+    return _get_result(engine, outcome), transcript
+
+
+def _release(engine: CombatEngine | None) -> None:
+    """
+    Clean up after a combat that may have been cut short. Combats that never
+    reach the engine's TERMINATE state leave their termination handlers bound
+    and the combat cached.
+    """
+    if engine is not None:
+        for condition in engine._termination_conditions:
+            condition.unbind()
+
+        engine.battle_state.release()
+
+    delete_element("combat")
+
+
+def _get_result(engine: CombatEngine, outcome: Outcome) -> FightResult:
+    """
+    Summarize a finished combat.
+    """
+    # Fights that time out never reach a termination state
+    if engine.replay_log.digest is None:
+        engine.replay_log.digest = engine.digest
+
+    damage_dealt = 0
+    damage_taken = 0
+    for _, target, damage in engine.damage_log:
+        if target in engine._allies:
+            damage_taken += damage
+        else:
+            damage_dealt += damage
+
+    return FightResult(outcome, engine.total_turn_cycles, damage_dealt,
+                       damage_taken, engine.replay_log)
@@ -1,3 +1,4 @@
+import functools
 from abc import ABC
 from enum import Enum
 
@@ -11,8 +12,15 @@ class TerminationHandler(LoadableMixin, ABC):
     """
     Termination handlers inspect a CombatEngine object and determine if combat should end and whether it ends in
     a win or a loss.
+
+    Event-driven handlers call request_termination_check on their owner whenever their conditions may have become
+    met. While every handler of a CombatEngine is event-driven, the engine only evaluates its handlers after such a
+    request, rather than after every phase.
     """
 
+    # Whether the handler requests termination checks from its owner
+    EVENT_DRIVEN: bool = False
+
     class TerminationMode(Enum):
         WIN = 0
         LOSS = 1
@@ -41,6 +49,18 @@ class TerminationHandler(LoadableMixin, ABC):
     def trigger_message(self) -> list[str | StringContent]:
         raise NotImplementedError()
 
+    def bind(self, combat_engine) -> None:
+        """
+        Prepare the handler to watch a combat. Called by the CombatEngine once its participants are known.
+        """
+        self.owner = combat_engine
+
+    def unbind(self) -> None:
+        """
+        Stop watching the combat that the handler is bound to.
+        """
+        pass
+
     def is_conditions_met(self) -> bool:
         raise NotImplementedError()
 
@@ -48,8 +68,14 @@ class TerminationHandler(LoadableMixin, ABC):
 class GroupResourceCondition(TerminationHandler, ABC):
     """
     A condition that triggers when all entities in the designated group reach a specified resource value threshold.
+
+    Once bound to a CombatEngine, the condition subscribes to the watched resource and the primary resource of every
+    potential member of the group, and keeps a count of the members that do not yet meet the threshold. Checking the
+    condition is then O(1), and only members whose resources change are re-examined.
     """
 
+    EVENT_DRIVEN = True
+
     class Mode(Enum):
         """
         Operational mode for GroupResourceCondition.
@@ -69,6 +95,12 @@ class GroupResourceCondition(TerminationHandler, ABC):
         self.resource_mode: GroupResourceCondition.Mode = resource_mode
         self.termination_mode: TerminationHandler.TerminationMode = termination_mode
 
+        # Incremental state, maintained while bound
+        self._bound: bool = False
+        self._unmet: dict[int, bool] = {}  # id(entity) -> True if that group member does not meet the threshold
+        self._unmet_count: int = 0
+        self._subscriptions: list[tuple[any, any]] = []  # (Resource, callback)
+
     @property
     def group_name(self) -> str:
         """Returns the name of the group of entities to test against.
@@ -85,32 +117,45 @@ class GroupResourceCondition(TerminationHandler, ABC):
         """
         raise NotImplementedError()
 
-    def is_conditions_met(self) -> bool:
+    @property
+    def members(self) -> list:
+        """
+        Returns every entity that may belong to the group over the course of the combat, living or dead.
+        """
+        raise NotImplementedError()
 
-        resources = [entity.resource_controller[self.resource_name] for entity in self.group]
+    def _in_group(self, entity) -> bool:
+        """
+        Whether a member currently belongs to the group. By default, only living entities do.
+        """
+        return not self._owner.is_dead(entity)
 
+    def _meets_threshold(self, resource) -> bool:
+        """
+        Test a single resource against the condition.
+        """
         match self.resource_mode:
             case self.Mode.EQUAL_TO:
                 if type(self.resource_value) != int:
                     raise TypeError(f"Invalid resource_value type! Expected float, got {type(self.resource_value)}")
-                return all([res.value == self.resource_value for res in resources])
+                return resource.value == self.resource_value
 
             case self.Mode.LESS_THAN:
                 if type(self.resource_value) == int:
-                    return all([res.value < self.resource_value for res in resources])
+                    return resource.value < self.resource_value
 
                 elif type(self.resource_value) == float:
-                    return all([res.percent_remaining < self.resource_value for res in resources])
+                    return resource.percent_remaining < self.resource_value
                 else:
                     raise TypeError(
                         f"Invalid resource_value type! Expected int | float, got {type(self.resource_value)}")
 
             case self.Mode.GREATER_THAN:
                 if type(self.resource_value) == int:
-                    return all([res.value > self.resource_value for res in resources])
+                    return resource.value > self.resource_value
 
                 elif type(self.resource_value) == float:
-                    return all([res.percent_remaining > self.resource_value for res in resources])
+                    return resource.percent_remaining > self.resource_value
                 else:
                     raise TypeError(
                         f"Invalid resource_value type! Expected int | float, got {type(self.resource_value)}")
@@ -118,6 +163,60 @@ class GroupResourceCondition(TerminationHandler, ABC):
             case _:
                 raise RuntimeError(f"Unknown operating mode: {self.mode}!")
 
+    def _is_unmet(self, entity) -> bool:
+        """
+        Whether an entity holds the condition back: it belongs to the group but does not meet the threshold.
+        """
+        return self._in_group(entity) and not self._meets_threshold(entity.resource_controller[self.resource_name])
+
+    def _on_resource_change(self, entity, _) -> None:
+        """
+        Re-examine a single member after one of its watched resources changed.
+        """
+        unmet = self._is_unmet(entity)
+        if unmet == self._unmet[id(entity)]:
+            return
+
+        self._unmet[id(entity)] = unmet
+        self._unmet_count += 1 if unmet else -1
+
+        if self._unmet_count == 0:
+            self._owner.request_termination_check()
+
+    def bind(self, combat_engine) -> None:
+        super().bind(combat_engine)
+        self.unbind()
+
+        for entity in self.members:
+            callback = functools.partial(self._on_resource_change, entity)
+            watched = [entity.resource_controller[self.resource_name]]
+            if entity.resource_controller.primary_resource is not watched[0]:
+                watched.append(entity.resource_controller.primary_resource)
+
+            for resource in watched:
+                resource.subscribe(callback)
+                self._subscriptions.append((resource, callback))
+
+            self._unmet[id(entity)] = self._is_unmet(entity)
+
+        self._unmet_count = sum(self._unmet.values())
+        self._bound = True
+
+    def unbind(self) -> None:
+        for resource, callback in self._subscriptions:
+            resource.unsubscribe(callback)
+
+        self._subscriptions = []
+        self._unmet = {}
+        self._unmet_count = 0
+        self._bound = False
+
+    def is_conditions_met(self) -> bool:
+        if self._bound:
+            return self._unmet_count == 0
+
+        return all(self._meets_threshold(entity.resource_controller[self.resource_name]) for entity in self.group)
+
     @property
     def trigger_message(self) -> list[str | StringContent]:
         if type(self.resource_value) == int:
@@ -166,6 +265,10 @@ class AllyResourceCondition(GroupResourceCondition):
     def group(self) -> list:
         return from_cache("combat").allies
 
+    @property
+    def members(self) -> list:
+        return self._owner._allies
+
     @staticmethod
     @cached([LoadableMixin.LOADER_KEY, "AllyResourceCondition", LoadableMixin.ATTR_KEY])
     def from_json(json: dict[str, any]) -> any:
@@ -204,6 +307,10 @@ class EnemyResourceCondition(GroupResourceCondition):
     def group(self) -> list:
         return from_cache("combat").enemies
 
+    @property
+    def members(self) -> list:
+        return self._owner._enemies
+
     @staticmethod
     @cached([LoadableMixin.LOADER_KEY, "EnemyResourceCondition", LoadableMixin.ATTR_KEY])
     def from_json(json: dict[str, any]) -> any:
@@ -245,6 +352,13 @@ class PlayerResourceCondition(GroupResourceCondition):
     def group(self) -> list:
         return [from_cache("player")]  # GroupResourceCondition::is_conditions_met expects a list of entities
 
+    @property
+    def members(self) -> list:
+        return [self._owner._player_ref]
+
+    def _in_group(self, entity) -> bool:
+        return True
+
     @property
     def trigger_message(self) -> list[str | StringContent]:
         if type(self.resource_value) == int:
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game.systems.entity.entities import CombatEntity
+
+
+class TurnTimeline:
+    """
+    A priority queue of the pending turns of every entity in a combat.
+
+    Each entity acts once per turn cycle. Within a cycle, entities act in order
+    of descending turn_speed, and ties are broken by the order in which the
+    entities joined the timeline. Speeds may be fractional.
+
+    Every entity has exactly one pending turn, which is stored in a heap keyed
+    on (cycle, -turn_speed, join order). When an entity takes its turn, its next
+    turn is scheduled for the following cycle. Removing an entity or changing
+    its speed invalidates its pending turn in place rather than searching the
+    heap for it; invalidated turns are discarded when they reach the top.
+    Selecting the next turn is therefore O(log n) in the number of entities.
+    """
+
+    # Indices into a heap entry
+    _CYCLE = 0
+    _SPEED = 1
+    _ORDER = 2
+    _ENTITY = 3
+    _VALID = 4
+
+    def __init__(self, entities: list[CombatEntity] = None, cycle: int = 1):
+        self._heap: list[list] = []
+        self._entries: dict[int, list] = {}  # id(entity) -> pending turn
+        self._join_order = itertools.count()
+
+        for entity in entities or []:
+            self.add(entity, cycle)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entity: CombatEntity) -> bool:
+        return id(entity) in self._entries
+
+    def _push(self, cycle: int, entity: CombatEntity, order: int) -> None:
+        entry = [cycle, -entity.turn_speed, order, entity, True]
+        self._entries[id(entity)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _discard_invalid(self) -> None:
+        """
+        Pop invalidated turns off the top of the heap.
+        """
+        while len(self._heap) > 0 and not self._heap[0][self._VALID]:
+            heapq.heappop(self._heap)
+
+    def add(self, entity: CombatEntity, cycle: int = 1) -> None:
+        """
+        Schedule the first turn of an entity.
+
+        Args:
+            entity: The entity to add
+            cycle: The turn cycle that the entity first acts in
+        """
+        if entity in self:
+            raise ValueError(f"{entity.name} is already on the timeline!")
+
+        self._push(cycle, entity, next(self._join_order))
+
+    def remove(self, entity: CombatEntity) -> None:
+        """
+        Remove an entity's pending turn from the timeline. Does nothing if the
+        entity is not on the timeline.
+        """
+        entry = self._entries.pop(id(entity), None)
+        if entry is not None:
+            entry[self._VALID] = False
+
+    def update_speed(self, entity: CombatEntity) -> None:
+        """
+        Reschedule an entity's pending turn after its turn_speed has changed.
+        """
+        entry = self._entries.get(id(entity))
+        if entry is None:
+            raise ValueError(f"{entity.name} is not on the timeline!")
+
+        if entry[self._SPEED] == -entity.turn_speed:
+            return
+
+        entry[self._VALID] = False
+        self._push(entry[self._CYCLE], entity, entry[self._ORDER])
+
+    def peek(self, cycle: int) -> CombatEntity | None:
+        """
+        Returns the entity that acts next within the given cycle, or None if
+        every entity has already acted in that cycle.
+        """
+        self._discard_invalid()
+
+        if len(self._heap) < 1 or self._heap[0][self._CYCLE] > cycle:
+            return None
+
+        return self._heap[0][self._ENTITY]
+
+    def pop(self, cycle: int) -> CombatEntity | None:
+        """
+        Take the next turn within the given cycle and schedule that entity's
+        turn in the following cycle.
+
+        Returns: The entity whose turn it is, or None if every entity has
+        already acted in the given cycle.
+        """
+        entity = self.peek(cycle)
+        if entity is None:
+            return None
+
+        entry = heapq.heappop(self._heap)
+        self._push(max(entry[self._CYCLE], cycle) + 1, entity,
+                   entry[self._ORDER])
+
+        return entity
+
+    def order(self) -> list[CombatEntity]:
+        """
+        Returns every entity on the timeline in the order of their pending
+        turns.
+        """
+        return [
+            entry[self._ENTITY] for entry in sorted(self._entries.values())
+        ]
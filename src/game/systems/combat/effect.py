@@ -1,4 +1,7 @@
-import weakref
+from __future__ import annotations
+
+import copy
+import dataclasses
 from abc import ABC
 
 from game.cache import cached
@@ -36,8 +39,15 @@ class CombatEffect(LoadableMixin, FiniteStateDevice, TagMixin, ABC):
     Note that each Effect MUST implement a functional reset() method. A default
     method is provided, but can be overridden if necessary. NEVER modify an
     Effect's duration via reset().
+
+    Effect classes that set POOLABLE and implement _reinitialize() may be
+    recycled by the EffectPool once they expire, rather than being copied anew
+    each time an Ability is used.
     """
 
+    # Whether expired instances of this class may be recycled by an EffectPool
+    POOLABLE: bool = False
+
     def __init__(self,
                  target_entity: CombatEntity = None,
                  source_entity: CombatEntity = None,
@@ -77,6 +87,37 @@ class CombatEffect(LoadableMixin, FiniteStateDevice, TagMixin, ABC):
         self._target_entity = target_entity
         self._source_entity = source_entity
 
+    def reinitialize(self, template: CombatEffect) -> None:
+        """
+        Overwrite this Effect's properties with those of a template, leaving it
+        in the same state as a fresh copy of the template.
+
+        The Effect is unassigned from its source and target, and returned to
+        its default state.
+
+        Args:
+            template: The Effect to copy properties from. Must be of the same
+                type as this Effect.
+        """
+        if type(template) is not type(self):
+            raise TypeError(f"Cannot reinitialize an Effect of type "
+                            f"{type(self)} from a template of type "
+                            f"{type(template)}!")
+
+        self._target_entity = None
+        self._source_entity = None
+        self.duration = template.duration
+        self.on_remove = template.on_remove
+
+        self._reinitialize(template)
+        self.reset()
+
+    def _reinitialize(self, template: CombatEffect) -> None:
+        """
+        Copy the subclass-specific properties of a template onto this Effect.
+        """
+        raise NotImplementedError()
+
     def perform(self):
         """
         Execute the logic for the Effect on the target entity.
@@ -115,11 +156,104 @@ class CombatEffect(LoadableMixin, FiniteStateDevice, TagMixin, ABC):
         self.set_state(self.States.DEFAULT)
 
 
+@dataclasses.dataclass
+class PoolStats:
+    """
+    Counters describing the activity of an EffectPool.
+    """
+    created: int = 0  # Effects copied from a template because the pool was empty
+    reused: int = 0  # Effects recycled from the pool
+    released: int = 0  # Expired effects returned to the pool
+    discarded: int = 0  # Expired effects dropped because they could not be pooled
+
+
+class EffectPool:
+    """
+    Recycles expired CombatEffects.
+
+    Copying an Effect is expensive, since each copy is a full FiniteStateDevice
+    that must set up its states. Rather than dropping expired Effects, the
+    EffectActivator releases them to a pool, which keeps a free list per Effect
+    class. When an Ability is used, its Effects are acquired from the pool and
+    reinitialized from the Ability's templates, and are only copied when the
+    free list for that class is empty.
+
+    Only classes that set POOLABLE are pooled. Each free list holds at most
+    max_size Effects; any further releases are dropped.
+    """
+
+    DEFAULT_MAX_SIZE: int = 256
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 0:
+            raise ValueError(f"max_size must not be negative! Got {max_size}")
+
+        self.max_size: int = max_size
+        self.stats: PoolStats = PoolStats()
+        self._free: dict[type[CombatEffect], list[CombatEffect]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(self, template: CombatEffect) -> CombatEffect:
+        """
+        Get an unassigned Effect equivalent to a fresh copy of the template.
+
+        Args:
+            template: The Effect to copy
+
+        Returns: A recycled Effect if one is available, otherwise a deep copy
+        of the template
+        """
+        free = self._free.get(type(template))
+        if free:
+            effect = free.pop()
+            effect.reinitialize(template)
+            self.stats.reused += 1
+            return effect
+
+        self.stats.created += 1
+        return copy.deepcopy(template)
+
+    def release(self, effect: CombatEffect) -> None:
+        """
+        Return an expired Effect to the pool. The Effect must no longer be held
+        by any entity.
+        """
+        if not effect.POOLABLE:
+            self.stats.discarded += 1
+            return
+
+        free = self._free.setdefault(type(effect), [])
+        if len(free) >= self.max_size:
+            self.stats.discarded += 1
+            return
+
+        # Drop references to the entities so that they may be collected
+        effect._target_entity = None
+        effect._source_entity = None
+        free.append(effect)
+        self.stats.released += 1
+
+    def clear(self) -> None:
+        """
+        Empty the pool and reset its stats.
+        """
+        self._free.clear()
+        self.stats = PoolStats()
+
+
+# The pool shared by every Ability
+effect_pool = EffectPool()
+
+
 class ResourceEffect(CombatEffect):
     """
     Modify a given resource by a given amount for the target.
     """
 
+    POOLABLE = True
+
     def __init__(self, resource_name: str, adjust_quantity: int | float,
                  trigger_message: str = None, **kwargs):
         super().__init__(default_input_type=InputType.ANY, states=self.States,
@@ -141,11 +275,17 @@ class ResourceEffect(CombatEffect):
 
     def __copy__(self):
         return ResourceEffect(self._resource_name, self._adjust_quantity,
-                              self.trigger_message)
+                              self.trigger_message, duration=self.duration,
+                              on_remove=self.on_remove)
 
     def __deepcopy__(self, memodict={}):
         return self.__copy__()
 
+    def _reinitialize(self, template: ResourceEffect) -> None:
+        self._resource_name = template._resource_name
+        self._adjust_quantity = template._adjust_quantity
+        self.trigger_message = template.trigger_message
+
     def _perform(self, target: CombatEntity):
         if self._resource_name not in target.resource_controller:
             raise ValueError(
@@ -173,23 +313,27 @@ class ResourceEffect(CombatEffect):
         ]
 
     def _setup_states(self):
+        """
+        ResourceEffect declares its states at class level.
+        """
+        pass
 
-        @FiniteStateDevice.state_logic(self, self.States.DEFAULT, InputType.ANY)
-        def logic(_: any) -> None:
-            self.perform()
-            self.set_state(self.States.TERMINATE)
-
-        @FiniteStateDevice.state_content(self, self.States.DEFAULT)
-        def content():
-            """
-            This calculation only works because the client must retrieve state_content before executing state_logic!
-            """
-            trigger_message = self.trigger_message.format(
-                target=self._target_entity.name)
-            return ComponentFactory.get(
-                [trigger_message] +
-                self._get_change_message()
-            )
+    @FiniteStateDevice.logic_provider(CombatEffect.States.DEFAULT, InputType.ANY)
+    def _default_logic(self, _: any) -> None:
+        self.perform()
+        self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(CombatEffect.States.DEFAULT)
+    def _default_content(self) -> dict:
+        """
+        This calculation only works because the client must retrieve state_content before executing state_logic!
+        """
+        trigger_message = self.trigger_message.format(
+            target=self._target_entity.name)
+        return ComponentFactory.get(
+            [trigger_message] +
+            self._get_change_message()
+        )
 
     @staticmethod
     @cached(
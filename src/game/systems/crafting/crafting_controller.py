@@ -35,6 +35,17 @@ class CraftingController:
         self._owner: Entity = None
         self.owner: Entity = owner
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the learned recipes. If the owner is being copied in the same
+        pass, the copy is bound to the new owner.
+        """
+        cc = self.__class__.__new__(self.__class__)
+        cc.learned_recipes = list(self.learned_recipes)
+        cc._owner = memodict.get(id(self._owner), self._owner)
+
+        return cc
+
     def can_learn_recipe(self, recipe_id) -> bool:
         """
         Check if the owning Entity meets the requirements to learn the recipe
@@ -132,7 +143,9 @@ class CraftingController:
 
     def perform_recipe(self, recipe_id: int, num_crafts: int = 1) -> None:
         """
-        Execute the specified recipe by consuming the required items and spawning AddItemEvents for the products.
+        Execute the specified recipe by consuming the required items and inserting the products in a single
+        inventory transaction. Products that don't fit in the inventory are handed to AddItemEvents, which prompt
+        the player to make room.
 
         This method assumes that all ingredients are present and that all requirements are met. If either of those
         conditions are not met, an error will be raised.
@@ -152,16 +165,18 @@ class CraftingController:
 
         from game.systems.event.add_item_event import AddItemEvent
 
-        # Consume each ingredient in recipe 'n' times, where 'n' is num_crafts
-        for item_id, quantity in recipe_manager.get_recipe(recipe_id).items_in:
-            self._owner.inventory.consume_item(item_id, quantity * num_crafts)
+        # Consume each ingredient and insert each product of the recipe 'n'
+        # times, where 'n' is num_crafts, as a single batch. Products that
+        # don't fit are handed to AddItemEvents so that the user can make room.
+        with self._owner.inventory.transaction(allow_overflow=True) as transaction:
+            for item_id, quantity in recipe_manager.get_recipe(recipe_id).items_in:
+                transaction.consume(item_id, quantity * num_crafts)
+
+            for item_id, quantity in recipe_manager.get_recipe(recipe_id).items_out:
+                transaction.insert(item_id, quantity * num_crafts)
 
-        # Insert each product of the recipe into the player's inventory 'n'
-        # times, where 'n' is num_crafts
-        for item_id, quantity in recipe_manager.get_recipe(recipe_id).items_out:
-            game.add_state_device(
-                AddItemEvent(item_id, quantity * num_crafts)
-            )
+        for item_id, quantity in transaction.overflow.items():
+            game.add_state_device(AddItemEvent(item_id, quantity))
 
         from game.systems.event.events import SkillXPEvent
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import copy
 import dataclasses
 from typing import Iterator
 
@@ -48,6 +49,18 @@ class CoinPurse(LoadableMixin):
         """
         return self._iterator.__next__()
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy each Currency balance. Stage definitions are never modified after
+        load, so they are shared between copies.
+        """
+        cp = self.__class__.__new__(self.__class__)
+        cp.currencies = {
+            cur_id: copy.copy(cur) for cur_id, cur in self.currencies.items()
+        }
+
+        return cp
+
     def __post_init__(self):
 
         # Initialize the currencies map.
@@ -55,6 +68,15 @@ class CoinPurse(LoadableMixin):
             self.currencies[currency.id] = currency_manager.to_currency(
                 currency.id, 0)
 
+    @property
+    def fingerprint(self) -> tuple[tuple[int, int], ...]:
+        """
+        A cheap snapshot of every balance in the purse.
+        """
+        return tuple(
+            (cur_id, cur.quantity) for cur_id, cur in self.currencies.items()
+        )
+
     def balance(self, cur: Currency | int) -> int:
         """
         Retrieve the quantity of the currency passed in
@@ -88,11 +88,11 @@ class CombatEntity(mixins.AbilityMixin, mixins.EquipmentMixin,
 
     def __init__(self,
                  xp_yield: int = 1,
-                 turn_speed: int = 1,
+                 turn_speed: int | float = 1,
                  **kwargs):
         super().__init__(**kwargs)
         self.xp_yield: int = xp_yield
-        self.turn_speed = turn_speed
+        self.turn_speed: int | float = turn_speed
         self.active_effects: dict[CombatPhase, list[CombatEffect]] = {phase: []
                                                                       for phase
                                                                       in
@@ -140,7 +140,7 @@ class CombatEntity(mixins.AbilityMixin, mixins.EquipmentMixin,
         - name: str
         - id: int
         - xp_yield: int
-        - turn_speed: int
+        - turn_speed: int | float
         - abilities: list[str]
         - loot_table: int | LootTable
 
@@ -151,18 +151,19 @@ class CombatEntity(mixins.AbilityMixin, mixins.EquipmentMixin,
         - equipment_controller: EquipmentController
         - coin_purse: CoinPurse
         - naive: bool
+        - lookahead: bool
 
         """
 
         required_fields = [
-            ("name", str), ("id", int), ("xp_yield", int), ("turn_speed", int),
+            ("name", str), ("id", int), ("xp_yield", int), ("turn_speed", (int, float)),
             ("abilities", list), ("loot_table", object)
         ]
 
         optional_fields = [
             ("combat_provider", str), ("inventory_controller", dict),
             ("resource_controller", dict), ("equipment_controller", dict),
-            ("coin_purse", dict), ("naive", bool)
+            ("coin_purse", dict), ("naive", bool), ("lookahead", bool)
         ]
 
         LoadableFactory.validate_fields(required_fields, json)
@@ -1,8 +1,7 @@
-import copy
-
 from game.structures import manager as manager
 from game.structures.loadable_factory import LoadableFactory
 from game.systems.entity import entities as entities
+from game.systems.entity.prototype import EntityPrototype
 from game.util.asset_utils import get_asset
 
 
@@ -13,10 +12,15 @@ class EntityManager(manager.Manager):
 
     ENTITY_ASSET_PATH = "entities"
     RESERVED_ENTITY_IDS = [0]
+    INDEXES = {
+        "cls": lambda entity: [type(entity).__name__],
+        "name": lambda entity: [entity.name]
+    }
 
     def __init__(self):
         super().__init__()
         self._manifest: dict[int, entities.Entity] = {}
+        self._prototypes: dict[int, EntityPrototype] = {}
         self.player_entity: entities.Entity = None
 
     def __getitem__(self, item) -> entities.Entity:
@@ -48,9 +52,44 @@ class EntityManager(manager.Manager):
             raise ValueError(f"Cannot register entity with reserved ID {entity.id}!")
 
         self._manifest[entity.id] = entity
+        self._prototypes[entity.id] = EntityPrototype(entity)
+        self._index(entity.id, entity)
 
     def get_instance(self, entity_id) -> entities.Entity:
-        return copy.deepcopy(self._manifest[entity_id])
+        """
+        Spawn a new instance of the entity registered under `entity_id`.
+
+        Instances are built from a compiled EntityPrototype rather than a full
+        deepcopy of the master entity. If the manifest entry was replaced
+        without going through `register_entity`, the prototype is recompiled.
+
+        Args:
+            entity_id: The ID of the entity to spawn
+
+        Returns: A new, independent instance of the entity
+        """
+        template = self._manifest[entity_id]
+        prototype = self._prototypes.get(entity_id)
+
+        if prototype is None or prototype.template is not template:
+            prototype = EntityPrototype(template)
+            self._prototypes[entity_id] = prototype
+
+        return prototype.spawn()
+
+    def invalidate_prototype(self, entity_id: int) -> None:
+        """
+        Rebuild the spawn plan of a registered entity. Must be called after
+        attributes are added to or removed from the registered entity, or when
+        an attribute changes from an immutable to a mutable value. Changes to
+        the values of existing attributes need no invalidation.
+
+        Args:
+            entity_id: The ID of the registered entity
+
+        Returns: None
+        """
+        self._prototypes.pop(entity_id, None)
 
     def load(self) -> None:
         raw_asset: dict[str, any] = get_asset(self.ENTITY_ASSET_PATH)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import copy
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from game.systems.item.loot import LootTable
+
+if TYPE_CHECKING:
+    from game.systems.entity.entities import Entity
+
+
+class EntityPrototype:
+    """
+    A compiled spawn recipe for a registered Entity.
+
+    When the prototype is compiled, each attribute of the template is sorted
+    into one of two groups: attributes whose values are immutable (or are never
+    modified after load, such as a shared LootTable) are re-used by reference,
+    while all other attributes are deep-copied. Spawning an instance therefore
+    only pays for the mutable, per-instance state of the template.
+
+    The plan records attribute names rather than values, so a spawn always
+    reads the template's current values: changing a scalar attribute of a
+    registered template is reflected in later spawns. If the template gains or
+    loses attributes, or an attribute changes from an immutable to a mutable
+    value, the plan must be rebuilt with `compile` (see
+    EntityManager.invalidate_prototype).
+
+    Components that hold a reference back to their owner (EquipmentController,
+    CraftingController, AbilityController) are re-bound to the spawned instance
+    through the deepcopy memo.
+    """
+
+    SHARED_TYPES = (int, float, str, bool, type(None), tuple, frozenset, Enum,
+                    LootTable)
+
+    def __init__(self, template: Entity):
+        self.template: Entity = template
+        self._shared: tuple[str, ...] = ()
+        self._copied: tuple[str, ...] = ()
+        self.compile()
+
+    def compile(self) -> None:
+        """
+        Sort the template's attributes into those that are shared by reference
+        and those that are deep-copied on spawn.
+        """
+        shared = []
+        copied = []
+        for attr, value in vars(self.template).items():
+            if isinstance(value, self.SHARED_TYPES):
+                shared.append(attr)
+            else:
+                copied.append(attr)
+
+        self._shared = tuple(shared)
+        self._copied = tuple(copied)
+
+    def spawn(self) -> Entity:
+        """
+        Create a new, independent instance of the template.
+
+        Returns: A new instance of the template's class
+        """
+        instance = self.template.__class__.__new__(self.template.__class__)
+        memo = {id(self.template): instance}
+
+        source = self.template.__dict__
+        attrs = instance.__dict__
+        for attr in self._shared:
+            attrs[attr] = source[attr]
+
+        for attr in self._copied:
+            attrs[attr] = copy.deepcopy(source[attr], memo)
+
+        return instance
@@ -1,5 +1,6 @@
-import copy
 import inspect
+from array import array
+from typing import Callable, Iterator
 
 from loguru import logger
 
@@ -12,6 +13,14 @@ from game.structures.messages import StringContent
 class Resource:
     """
     Represents an entity resource, ex: Health, Mana, Stamina, etc
+
+    A Resource stores its value, max and base max at an index into integer
+    arrays. A free-standing Resource owns arrays of length 1, while the
+    Resources of a ResourceController are views into the controller's arrays.
+    Copies of a Resource are always free-standing.
+
+    Listeners may subscribe to a Resource to be notified whenever its value or
+    max changes. Listeners are not carried over to copies of the Resource.
     """
 
     def __init__(self, name: str, max: int, description: str, value: int = None):
@@ -27,10 +36,94 @@ class Resource:
         if description is None or description == "":
             raise ValueError("Resource must have a description!")
 
+        # Callbacks to notify when value or max changes
+        self._listeners: list[Callable[[Resource], None]] = []
+
         self.name = name
-        self.base_max = self.max = max  # Base max being the base value, max being the current max due to modifiers
         self.description = description
-        self.value = value or self.max
+
+        # Base max being the base value, max being the current max due to modifiers
+        self._index: int = 0
+        self._values: array = array('q', [value or max])
+        self._maxes: array = array('q', [max])
+        self._base_maxes: array = array('q', [max])
+
+    @classmethod
+    def _view(cls, controller: "ResourceController", index: int) -> "Resource":
+        """
+        Create a Resource that reads and writes the arrays of a ResourceController at `index`.
+        """
+        resource = cls.__new__(cls)
+        resource._listeners = []
+        resource.name = controller.schema.names[index]
+        resource.description = controller.schema.descriptions[index]
+        resource._index = index
+        resource._values = controller.values
+        resource._maxes = controller.maxes
+        resource._base_maxes = controller.base_maxes
+        return resource
+
+    def __getstate__(self) -> dict:
+        # Copies and pickles are free-standing and start with no listeners
+        return {
+            "_listeners": [],
+            "name": self.name,
+            "description": self.description,
+            "_index": 0,
+            "_values": array('q', [self.value]),
+            "_maxes": array('q', [self.max]),
+            "_base_maxes": array('q', [self.base_max])
+        }
+
+    @property
+    def value(self) -> int:
+        return self._values[self._index]
+
+    @value.setter
+    def value(self, value: int) -> None:
+        if value != self._values[self._index]:
+            self._values[self._index] = value
+            self._notify()
+
+    @property
+    def max(self) -> int:
+        return self._maxes[self._index]
+
+    @max.setter
+    def max(self, value: int) -> None:
+        if value != self._maxes[self._index]:
+            self._maxes[self._index] = value
+            self._notify()
+
+    @property
+    def base_max(self) -> int:
+        return self._base_maxes[self._index]
+
+    @base_max.setter
+    def base_max(self, value: int) -> None:
+        self._base_maxes[self._index] = value
+
+    def subscribe(self, callback: Callable[["Resource"], None]) -> None:
+        """
+        Call `callback` with this Resource whenever its value or max changes.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[["Resource"], None]) -> None:
+        """
+        Stop notifying a subscribed callback. Does nothing if the callback is
+        not subscribed.
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self) -> None:
+        if not self._listeners:
+            return
+
+        # Iterate over a copy in case a callback unsubscribes itself
+        for callback in tuple(self._listeners):
+            callback(self)
 
     @property
     def percent_remaining(self) -> float:
@@ -130,6 +223,56 @@ class Resource:
         )
 
 
+class ResourceThreshold:
+    """
+    Watches a Resource and tracks whether it is below a threshold.
+
+    An int threshold is compared against the value of the Resource, and a float threshold against the fraction of its
+    max that remains, as with Resource.adjust. For example, a threshold of 1 is crossed when the Resource is depleted or
+    restored, and a threshold of 0.33 when it falls below or recovers above a third of its max.
+
+    The watch is updated by change notifications from the Resource, so reading `below` never touches the Resource.
+    """
+
+    def __init__(self, resource: Resource, threshold: int | float,
+                 callback: Callable[[Resource, bool], None] = None):
+        """
+        Args:
+            resource: The Resource to watch
+            threshold: The threshold to watch for
+            callback: Called with the Resource and whether it is now below the threshold each time that the Resource
+                crosses the threshold
+        """
+        if type(threshold) not in (int, float):
+            raise TypeError(f"Invalid threshold type! Expected int | float, got {type(threshold)}")
+
+        self.resource: Resource = resource
+        self.threshold: int | float = threshold
+        self.callback: Callable[[Resource, bool], None] | None = callback
+        self.below: bool = self._is_below(resource)
+
+        resource.subscribe(self)
+
+    def _is_below(self, resource: Resource) -> bool:
+        if type(self.threshold) == int:
+            return resource.value < self.threshold
+
+        return resource.value < resource.max * self.threshold
+
+    def __call__(self, resource: Resource) -> None:
+        below = self._is_below(resource)
+        if below != self.below:
+            self.below = below
+            if self.callback is not None:
+                self.callback(resource, below)
+
+    def cancel(self) -> None:
+        """
+        Stop watching the Resource.
+        """
+        self.resource.unsubscribe(self)
+
+
 class ResourceModifierMixin:
     """
     This mixin allows an object to be attached as a modifier to one or more Resources via the ResourceController
@@ -169,22 +312,59 @@ class ResourceModifierMixin:
         self.resource_modifiers: dict[str, int | float] = resource_modifiers or {}
 
 
+class ResourceSchema:
+    """
+    The names and default values of every registered Resource, in a fixed order.
+
+    A single schema is shared by every ResourceController, which stores only the per-entity values, maxes and base
+    maxes in arrays indexed by the schema.
+    """
+
+    def __init__(self, resources: list[Resource]):
+        self.names: tuple[str, ...] = tuple(r.name for r in resources)
+        self.descriptions: tuple[str, ...] = tuple(r.description for r in resources)
+        self.index: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        self.default_values: array = array('q', [r.value for r in resources])
+        self.default_maxes: array = array('q', [r.max for r in resources])
+        self.default_base_maxes: array = array('q', [r.base_max for r in resources])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, resource_name: str) -> bool:
+        return resource_name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+
 class ResourceController:
     """
     A controller that manages an individual entity's resources.
+
+    The values, maxes and base maxes of every resource are stored in arrays indexed by the shared ResourceSchema.
+    Resource objects are created on demand as views into those arrays, and the same view is returned for every access
+    to a resource.
     """
 
     def __init__(self, resources: list[tuple[str, int, int] | Resource] = None):
 
-        self.resources: dict[str, dict[str, any]] = {
-            r.name: {
-                "instance": r,
-                "modifiers": {
-                    "int": [],
-                    "float": [],
-                }
-            } for r in from_cache("managers.ResourceManager").all_resources
-        }
+        self.schema: ResourceSchema = from_cache("managers.ResourceManager").schema
+        self.values: array = array('q', self.schema.default_values)
+        self.maxes: array = array('q', self.schema.default_maxes)
+        self.base_maxes: array = array('q', self.schema.default_base_maxes)
+
+        # Attached modifiers of each resource, by index, then by modifier type, then by id(modifier). Each entry is
+        # [modifier, number of attachments]. Only resources with attached modifiers have an entry.
+        self._modifiers: dict[int, dict[str, dict[int, list]]] = {}
+
+        # Running totals of the attached flat (int) and percentage (float) modifiers of each resource
+        self._flat_modifiers: array = array('q', bytes(8 * len(self.schema)))
+        self._percent_modifiers: array = array('d', bytes(8 * len(self.schema)))
+
+        # Views of each resource, by index. Created on first access.
+        self._views: list[Resource | None] = [None] * len(self.schema)
 
         if resources:
             if type(resources) != list:
@@ -192,14 +372,14 @@ class ResourceController:
 
             for overloaded_resource in resources:
                 if type(overloaded_resource) == Resource:
-                    if overloaded_resource.name not in self.resources:
+                    if overloaded_resource.name not in self:
                         raise ValueError(
                             f"Cannot overload a resource that doesn't exist! Unknown resource: {overloaded_resource.name}")
 
-                    self.set_instance(copy.deepcopy(overloaded_resource))
+                    self.set_instance(overloaded_resource)
 
                 elif type(overloaded_resource) == tuple[str, int, int]:
-                    if overloaded_resource[0] not in self.resources:
+                    if overloaded_resource[0] not in self:
                         raise ValueError(
                             f"Cannot overload a resource that doesn't exist! Unknown resource: {overloaded_resource[0]}")
 
@@ -208,9 +388,9 @@ class ResourceController:
 
     def __contains__(self, resource: str | Resource) -> bool:
         if type(resource) == str:
-            return resource in self.resources
+            return resource in self.schema.index
         elif type(resource) == Resource:
-            return resource.name in self.resources
+            return resource.name in self.schema.index
 
         return False
 
@@ -220,38 +400,159 @@ class ResourceController:
         else:
             raise KeyError("resource_name must be str!")
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the resource arrays without re-querying the ResourceManager. The schema is shared.
+
+        Attached modifiers belong to whatever object attached them (usually an
+        Equipment), so the copy shares them by reference rather than cloning
+        them. Views and their listeners are not copied.
+        """
+        rc = self.__class__.__new__(self.__class__)
+        rc.schema = self.schema
+        rc.values = array('q', self.values)
+        rc.maxes = array('q', self.maxes)
+        rc.base_maxes = array('q', self.base_maxes)
+        rc._modifiers = {
+            index: {
+                modifier_type: {key: list(entry) for key, entry in registry.items()}
+                for modifier_type, registry in modifiers.items()
+            } for index, modifiers in self._modifiers.items()
+        }
+        rc._flat_modifiers = array('q', self._flat_modifiers)
+        rc._percent_modifiers = array('d', self._percent_modifiers)
+        rc._views = [None] * len(self.schema)
+
+        return rc
+
+    def __getstate__(self) -> dict:
+        # Views hold listeners, which are not carried over
+        state = self.__dict__.copy()
+        state["_views"] = [None] * len(self.schema)
+        return state
+
+    @property
+    def resources(self) -> dict[str, Resource]:
+        """
+        Every resource of the controller, by name.
+        """
+        return {name: self.get_instance(name) for name in self.schema.names}
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self.schema.names
+
+    @property
+    def fingerprint(self) -> tuple[tuple[str, int, int], ...]:
+        """
+        A cheap snapshot of the value and max of every resource.
+        """
+        return tuple(zip(self.schema.names, self.values, self.maxes))
+
     @property
     def primary_resource(self) -> "Resource":
         return self[get_config()['resources']['primary_resource']]
 
-    def get_instance(self, resource_name) -> Resource:
+    def subscribe(self, resource_name: str, callback: Callable[[Resource], None]) -> None:
         """
-        Get a live-instance of the Resource object within the ResourceController
+        Call `callback` with the named Resource whenever its value or max changes, including through bulk operations.
+        Resources without subscribers pay nothing for notifications.
+        """
+        self.get_instance(resource_name).subscribe(callback)
+
+    def unsubscribe(self, resource_name: str, callback: Callable[[Resource], None]) -> None:
+        """
+        Stop notifying a callback subscribed with `subscribe`.
         """
+        self.get_instance(resource_name).unsubscribe(callback)
+
+    def watch_threshold(self, resource_name: str, threshold: int | float,
+                        callback: Callable[[Resource, bool], None] = None) -> ResourceThreshold:
+        """
+        Watch the named Resource for crossings of a threshold. See ResourceThreshold.
+
+        Returns: The watch. Call its `cancel` method to stop watching.
+        """
+        return ResourceThreshold(self.get_instance(resource_name), threshold, callback)
+
+    def _index_of(self, resource_name: str) -> int:
         try:
-            return self.resources[resource_name]['instance']
+            return self.schema.index[resource_name]
         except KeyError as e:
             logger.error(f"No resource {resource_name} found!")
-            logger.debug(f"Available resources: {self.resources.items()}")
+            logger.debug(f"Available resources: {self.schema.names}")
             raise e
 
+    def get_instance(self, resource_name) -> Resource:
+        """
+        Get a live-instance of the Resource object within the ResourceController
+        """
+        index = self._index_of(resource_name)
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = Resource._view(self, index)
+
+        return view
+
     def set_instance(self, resource: Resource) -> None:
         """
-        Set the live-instance of the Resource object within the ResourceController to a new Resource object
+        Set the value, max and base max of a resource within the ResourceController to those of a Resource object
         """
-        if resource.name not in self.resources:
+        if resource.name not in self:
             raise ValueError(f"Unknown resource {resource.name}!")
 
-        self.resources[resource.name]['instance'] = resource
+        index = self.schema.index[resource.name]
+        self.base_maxes[index] = resource.base_max
+        view = self.get_instance(resource.name)
+        view.max = resource.max
+        view.value = resource.value
 
-    def get_modifiers(self, resource_name, modifier_type: str | type) -> list[ResourceModifierMixin]:
+    def adjust_all(self, amount: int | float, resource_names: list[str] = None) -> None:
         """
-        Retrieve the modifiers for a given resource and modifier type
+        Adjust the value of several resources at once, as if by Resource.adjust.
+
+        Args:
+            amount: An int or float that determines how each resource's value is changed.
+            resource_names: The resources to adjust. If None, every resource is adjusted.
         """
+        if type(amount) not in (int, float):
+            raise TypeError(f"Cannot adjust Resource by type {type(amount)}! Must be int or float.")
 
-        if resource_name not in self.resources:
-            raise ValueError(f"Unknown resource: {resource_name}!")
+        indices = range(len(self.schema)) if resource_names is None else \
+            [self._index_of(name) for name in resource_names]
 
+        values, maxes = self.values, self.maxes
+        if type(amount) == int:
+            adjusted = [max(0, min(maxes[i], values[i] + amount)) for i in indices]
+        else:
+            adjusted = [round(max(0, min(maxes[i], values[i] + maxes[i] * amount))) for i in indices]
+
+        self._write_values(indices, adjusted)
+
+    def restore_all(self, resource_names: list[str] = None) -> None:
+        """
+        Restore the value of several resources to their max.
+
+        Args:
+            resource_names: The resources to restore. If None, every resource is restored.
+        """
+        indices = range(len(self.schema)) if resource_names is None else \
+            [self._index_of(name) for name in resource_names]
+
+        self._write_values(indices, [self.maxes[i] for i in indices])
+
+    def _write_values(self, indices, new_values: list[int]) -> None:
+        """
+        Store new values and notify the listeners of each resource that changed.
+        """
+        values, views = self.values, self._views
+        for i, value in zip(indices, new_values):
+            if values[i] != value:
+                values[i] = value
+                if views[i] is not None:
+                    views[i]._notify()
+
+    def _modifier_type_name(self, modifier_type: str | type) -> str:
         if type(modifier_type) == str:
             true_modifier_type = modifier_type
         elif inspect.isclass(modifier_type):
@@ -262,89 +563,111 @@ class ResourceController:
         if true_modifier_type not in ["int", "float"]:
             raise ValueError(f"Unknown modifier type: {modifier_type}!")
 
-        return self.resources[resource_name]['modifiers'][true_modifier_type]
+        return true_modifier_type
+
+    def get_modifiers(self, resource_name, modifier_type: str | type) -> list[ResourceModifierMixin]:
+        """
+        Retrieve the modifiers for a given resource and modifier type, ordered by when each was first attached. A
+        modifier that is attached more than once appears once per attachment, and its repeats are grouped together
+        (attaching A, B, A returns A, A, B).
+        """
+
+        if resource_name not in self:
+            raise ValueError(f"Unknown resource: {resource_name}!")
+
+        registry = self._modifiers.get(self.schema.index[resource_name])
+        if registry is None:
+            return []
+
+        return [
+            modifier for modifier, count in registry[self._modifier_type_name(modifier_type)].values()
+            for _ in range(count)
+        ]
 
     def attach_modifier(self, modifier: ResourceModifierMixin) -> None:
         """
-        For each resource specified in the modifier object, attach a reference to it inside the controller and remove
-        any cached maxes.
+        For each resource specified in the modifier object, register the modifier with the controller, add it to the
+        resource's running totals and recompute the resource's max.
         """
 
         if not isinstance(modifier, ResourceModifierMixin):
             raise TypeError(f"Unexpected modifier type {type(modifier)}!")
 
-        for resource_name in modifier.resource_modifiers:
-            if resource_name not in self.resources:
+        for resource_name, amount in modifier.resource_modifiers.items():
+            if resource_name not in self:
                 raise ValueError(f"Unknown resource: {resource_name}!")
 
-            # Determine if the modifier is float or int typed and assign it accordingly
-            if type(modifier.resource_modifiers[resource_name]) == int:
-                self.get_modifiers(resource_name, int).append(modifier)
+            # Determine if the modifier is float or int typed and add it to the matching total
+            index = self.schema.index[resource_name]
+            if type(amount) == int:
+                self._flat_modifiers[index] += amount
+            elif type(amount) == float:
+                self._percent_modifiers[index] += amount
+            else:
+                raise ValueError(f"Unknown modifier type: {type(amount)}!")
 
-            elif type(modifier.resource_modifiers[resource_name]) == float:
-                self.get_modifiers(resource_name, float).append(modifier)
+            registry = self._modifiers.setdefault(index, {"int": {}, "float": {}})[type(amount).__name__]
+            entry = registry.get(id(modifier))
+            if entry is None:
+                registry[id(modifier)] = [modifier, 1]
             else:
-                raise ValueError(f"Unknown modifier type: {type(modifier.resource_modifiers[resource_name])}!")
+                entry[1] += 1
 
             self.get_instance(resource_name).max = self.compute_max(resource_name)
 
     def detach_modifier(self, modifier: ResourceModifierMixin) -> None:
         """
-        Search through the list of attached modifiers and remove any references to the specified object
+        Remove one attachment of the specified modifier from each resource that it modifies
         """
 
-        for resource_name in modifier.resource_modifiers:
-            if resource_name not in self.resources:
+        for resource_name, amount in modifier.resource_modifiers.items():
+            if resource_name not in self:
                 raise ValueError(f"Unknown resource: {resource_name}!")
 
-            # Determine if the modifier is float or int typed and assign it accordingly
-            if type(modifier.resource_modifiers[resource_name]) == int:
-                if modifier in self.get_modifiers(resource_name, int):
-                    self.get_modifiers(resource_name, int).remove(modifier)
-                else:
-                    raise RuntimeError(f"Unable to detach modifier {str(modifier)}! No such object attached.")
-
-            elif type(modifier.resource_modifiers[resource_name]) == float:
-                if modifier in self.get_modifiers(resource_name, float):
-                    self.get_modifiers(resource_name, float).remove(modifier)
-                else:
-                    raise RuntimeError(f"Unable to detach modifier {str(modifier)}! No such object attached.")
+            if type(amount) not in (int, float):
+                raise TypeError()
 
+            index = self.schema.index[resource_name]
+            modifiers = self._modifiers.get(index)
+            registry = modifiers[type(amount).__name__] if modifiers is not None else {}
+            entry = registry.get(id(modifier))
+            if entry is None:
+                raise RuntimeError(f"Unable to detach modifier {str(modifier)}! No such object attached.")
+
+            entry[1] -= 1
+            if entry[1] == 0:
+                del registry[id(modifier)]
+
+            # Subtract the modifier from its total. Totals are reset once empty, so float error can't accumulate.
+            if type(amount) == int:
+                self._flat_modifiers[index] -= amount
+            elif len(registry) == 0:
+                self._percent_modifiers[index] = 0.0
             else:
-                raise TypeError()
+                self._percent_modifiers[index] -= amount
+
+            if len(modifiers["int"]) == 0 and len(modifiers["float"]) == 0:
+                del self._modifiers[index]
 
             # Recompute the max for the Resource
-            self.resources[resource_name]['instance'].max = self.compute_max(resource_name)
+            self.get_instance(resource_name).max = self.compute_max(resource_name)
 
     def compute_max(self, resource_name: str) -> int:
         """
-        Compute the maximum value of the specified resource via modifier
+        Compute the maximum value of the specified resource from its base max and the running totals of its modifiers
         """
 
-        if resource_name not in self.resources:
+        if resource_name not in self:
             raise ValueError(f"Unknown resource {resource_name}!")
 
-        computed_max: int = self.get_base_max(resource_name)  # Base value from Resource.max
-
-        # Compute the total % change specified by the float-based modifiers
-        percent_change: float = 0.0
-        for modifier in self.get_modifiers(resource_name, float):
-            if not isinstance(modifier, ResourceModifierMixin):
-                raise TypeError(f"Unexpected ResourceModifier type: {type(modifier)}")
-
-            percent_change += modifier.resource_modifiers[resource_name]
-
-        computed_max += (computed_max * percent_change)
-
-        # Compute the total flat changed specified by the int-based modifiers
-        flat_change: int = 0
-        for modifier in self.get_modifiers(resource_name, int):
-            if not isinstance(modifier, ResourceModifierMixin):
-                raise TypeError(f"Unexpected ResourceModifier type: {type(modifier)}")
+        index = self.schema.index[resource_name]
+        computed_max: int = self.base_maxes[index]
 
-            flat_change += modifier.resource_modifiers[resource_name]
+        # Apply the total % change specified by the float-based modifiers
+        computed_max += (computed_max * self._percent_modifiers[index])
 
-        computed_max += flat_change
+        # Apply the total flat change specified by the int-based modifiers
+        computed_max += self._flat_modifiers[index]
 
         return round(computed_max)
 
@@ -352,22 +675,22 @@ class ResourceController:
         """
         Get the current value of a given resource
         """
-        return self.get_instance(resource_name).value
+        return self.values[self._index_of(resource_name)]
 
     def get_max(self, resource_name: str) -> int:
         """
         Get the current max-value of a given resource
         """
-        return self.get_instance(resource_name).max
+        return self.maxes[self._index_of(resource_name)]
 
     def get_base_max(self, resource_name: str) -> int:
         """
         Get the base maximum value of the given resource
         """
-        return self.get_instance(resource_name).base_max
+        return self.base_maxes[self._index_of(resource_name)]
 
     def get_resource_as_option(self, resource_name: str) -> list[str | StringContent]:
         return [str(self.get_instance(resource_name))]
 
     def get_resources_as_options(self) -> list[list[str | StringContent]]:
-        return [self.get_resource_as_option(res) for res in self.resources]
+        return [self.get_resource_as_option(res) for res in self.schema.names]
@@ -3,6 +3,7 @@ import copy
 from game.structures.loadable_factory import LoadableFactory
 from game.structures.manager import Manager
 from game.systems.entity import Resource
+from game.systems.entity.resource import ResourceSchema
 from game.util.asset_utils import get_asset
 
 
@@ -17,6 +18,7 @@ class ResourceManager(Manager):
         super().__init__()
 
         self._manifest: dict[str, Resource] = {}
+        self._schema: ResourceSchema | None = None  # Built on first use, reset by registration
 
     @property
     def all_resources(self) -> list[Resource]:
@@ -28,6 +30,17 @@ class ResourceManager(Manager):
         """
         return [copy.deepcopy(r) for r in self._manifest.values()]
 
+    @property
+    def schema(self) -> ResourceSchema:
+        """
+        The ResourceSchema of every registered Resource, shared by every ResourceController created since the last
+        registration.
+        """
+        if self._schema is None:
+            self._schema = ResourceSchema(list(self._manifest.values()))
+
+        return self._schema
+
     def get_resource(self, resource_name: str) -> Resource:
         """
         Retrieves a deep copy of a master resource
@@ -55,6 +68,7 @@ class ResourceManager(Manager):
             raise ValueError(f"Cannot register duplicate Resource of name {resource_object.name}")
 
         self._manifest[resource_object.name] = resource_object
+        self._schema = None
 
     def load(self) -> None:
         """
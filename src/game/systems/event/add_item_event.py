@@ -52,7 +52,6 @@ class AddItemEvent(Event):
         self.item_quantity = item_quantity
         self.remaining_quantity = item_quantity
         self.player_ref: entities.Player = None
-        self._build_states()
 
     def __str__(self) -> str:
         return f"FiniteStateDevice::AddItemEvent::(item_id: {self.item_id}" \
@@ -64,72 +63,70 @@ class AddItemEvent(Event):
     def __deepcopy__(self, memodict={}):
         return self.__copy__()
 
-    def _build_states(self) -> None:
-        @FiniteStateDevice.state_logic(self, self.States.DEFAULT, IT.SILENT)
-        def logic(_: any) -> None:
-
-            if self.player_ref is None:
-                logger.debug("Setting player ref...")
-                # Grab a weak reference to Player
-                self.player_ref = weakref.proxy(cache.get_cache()['player'])
-
-            # Detect collision
-            if self.player_ref.inventory.is_collidable(
-                    self.item_id, self.remaining_quantity):
-                logger.debug("Moving to PROMPT_KEEP_NEW_ITEM")
-                # Make player choose to keep or drop new item
-                self.set_state(self.States.PROMPT_KEEP_NEW_ITEM)
-            else:
-                logger.debug("MOVING TO INSERT_ITEM")
-                self.set_state(self.States.INSERT_ITEM)  # Insert items
-                logger.debug(f"{self.current_state}: {id(self)}")
-
-        @FiniteStateDevice.state_logic(self, self.States.PROMPT_KEEP_NEW_ITEM,
-                                       IT.AFFIRMATIVE)
-        def logic(user_input: bool) -> None:
-            if user_input:
-                self.set_state(self.States.INSERT_ITEM)
-            else:
-                self.set_state(self.States.TERMINATE)
-
-        @FiniteStateDevice.state_content(self, self.States.PROMPT_KEEP_NEW_ITEM)
-        def content() -> dict:
-            c = ["Would you like to make room in your inventory for ",
-                 StringContent(
-                     value=f"{self.remaining_quantity}x ",
-                     formatting="item_quantity"),
-                 StringContent(
-                     value=f"{item.item_manager.get_name(self.item_id)}",
-                     formatting="item_name"),
-                 "?"
-                 ]
-            return ComponentFactory.get(c)
-
-        @FiniteStateDevice.state_logic(self, self.States.INSERT_ITEM, IT.ANY)
-        def logic(_: any) -> None:
-            self.remaining_quantity = self.player_ref.inventory.insert_item(
-                self.item_id, self.item_quantity)
-
-            if self.remaining_quantity > 0:
-                self.set_state(self.States.PROMPT_KEEP_NEW_ITEM)
-            else:
-                self.set_state(self.States.TERMINATE)
-
-        @FiniteStateDevice.state_content(self, self.States.INSERT_ITEM)
-        def content() -> dict:
-            return ComponentFactory.get(
-                [
-                    f"You added ",
-                    StringContent(
-                        value=str(self.item_quantity),
-                        formatting="item_quantity"),
-                    "x ",
-                    StringContent(
-                        value=f"{item.item_manager.get_name(self.item_id)}",
-                        formatting="item_name"),
-                    " to your inventory."
-                ]
-            )
+    @FiniteStateDevice.logic_provider(States.DEFAULT, IT.SILENT)
+    def _default_logic(self, _: any) -> None:
+        if self.player_ref is None:
+            logger.debug("Setting player ref...")
+            # Grab a weak reference to Player
+            self.player_ref = weakref.proxy(cache.get_cache()['player'])
+
+        # Detect collision
+        if self.player_ref.inventory.is_collidable(
+                self.item_id, self.remaining_quantity):
+            logger.debug("Moving to PROMPT_KEEP_NEW_ITEM")
+            # Make player choose to keep or drop new item
+            self.set_state(self.States.PROMPT_KEEP_NEW_ITEM)
+        else:
+            logger.debug("MOVING TO INSERT_ITEM")
+            self.set_state(self.States.INSERT_ITEM)  # Insert items
+            logger.debug(f"{self.current_state}: {id(self)}")
+
+    @FiniteStateDevice.logic_provider(States.PROMPT_KEEP_NEW_ITEM,
+                                      IT.AFFIRMATIVE)
+    def _prompt_keep_new_item_logic(self, user_input: bool) -> None:
+        if user_input:
+            self.set_state(self.States.INSERT_ITEM)
+        else:
+            self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(States.PROMPT_KEEP_NEW_ITEM)
+    def _prompt_keep_new_item_content(self) -> dict:
+        c = ["Would you like to make room in your inventory for ",
+             StringContent(
+                 value=f"{self.remaining_quantity}x ",
+                 formatting="item_quantity"),
+             StringContent(
+                 value=f"{item.item_manager.get_name(self.item_id)}",
+                 formatting="item_name"),
+             "?"
+             ]
+        return ComponentFactory.get(c)
+
+    @FiniteStateDevice.logic_provider(States.INSERT_ITEM, IT.ANY)
+    def _insert_item_logic(self, _: any) -> None:
+        self.remaining_quantity = self.player_ref.inventory.insert_item(
+            self.item_id, self.item_quantity)
+
+        if self.remaining_quantity > 0:
+            self.set_state(self.States.PROMPT_KEEP_NEW_ITEM)
+        else:
+            self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(States.INSERT_ITEM)
+    def _insert_item_content(self) -> dict:
+        return ComponentFactory.get(
+            [
+                f"You added ",
+                StringContent(
+                    value=str(self.item_quantity),
+                    formatting="item_quantity"),
+                "x ",
+                StringContent(
+                    value=f"{item.item_manager.get_name(self.item_id)}",
+                    formatting="item_name"),
+                " to your inventory."
+            ]
+        )
 
     @staticmethod
     @cache.cached([LoadableMixin.LOADER_KEY, "AddItemEvent", LoadableMixin.ATTR_KEY])
@@ -10,7 +10,7 @@ from enum import Enum
 import game
 import game.systems.currency as currency
 import game.systems.flag as flag
-from game.cache import from_cache, cached
+from game.cache import from_cache, cached, get_config
 from game.structures.enums import InputType
 from game.structures.loadable import LoadableMixin
 from game.structures.loadable_factory import LoadableFactory
@@ -223,7 +223,7 @@ class LearnAbilityEvent(Event):
                  "."],
                 # Retrieve the requirements for this ability and pass them
                 # through the options argument
-                from_cache("managers.AbilityManager").get_instance(
+                from_cache("managers.AbilityManager").get_ref(
                     ability_name).get_requirements_as_options()
             )
 
@@ -536,39 +536,37 @@ class ResourceEvent(EntityTargetMixin, Event):
         self._summary: list[str | StringContent] = None
         self._silent = silent
 
-        @FiniteStateDevice.state_logic(self, self.States.DEFAULT,
-                                       InputType.SILENT)
-        def logic(_):
-            from game.systems.entity.entities import \
-                Entity  # Import locally to prevent circular import issues
-
-            if not isinstance(self.target, Entity):
-                raise TypeError(
-                    f"Cannot apply a ResourceEvent to an object of type "
-                    f"{self.target}")
-
-            self.set_state(self.States.APPLY)
-
-        @FiniteStateDevice.state_logic(self, self.States.APPLY,
-                                       InputType.SILENT)
-        def logic(_: any):
-            resource_controller: ResourceController = self.target.resource_controller
-            self._build_summary(
-                resource_controller.resources[self.stat_name]['instance'].value,
-                # Current value
-                resource_controller.resources[self.stat_name][
-                    'instance'].adjust(
-                    self.amount))  # Post-adjust value
-            self.set_state(self.States.SUMMARY)
-
-        @FiniteStateDevice.state_logic(self, self.States.SUMMARY,
-                                       InputType.SILENT if self._silent else InputType.ANY)
-        def logic(_: any):
-            self.set_state(self.States.TERMINATE)
+    @FiniteStateDevice.logic_provider(States.DEFAULT, InputType.SILENT)
+    def _default_logic(self, _: any) -> None:
+        from game.systems.entity.entities import \
+            Entity  # Import locally to prevent circular import issues
 
-        @FiniteStateDevice.state_content(self, self.States.SUMMARY)
-        def content():
-            return ComponentFactory.get(self._summary)
+        if not isinstance(self.target, Entity):
+            raise TypeError(
+                f"Cannot apply a ResourceEvent to an object of type "
+                f"{self.target}")
+
+        self.set_state(self.States.APPLY)
+
+    @FiniteStateDevice.logic_provider(States.APPLY, InputType.SILENT)
+    def _apply_logic(self, _: any) -> None:
+        resource_controller: ResourceController = self.target.resource_controller
+        self._build_summary(
+            resource_controller[self.stat_name].value,  # Current value
+            resource_controller[self.stat_name].adjust(
+                self.amount))  # Post-adjust value
+        self.set_state(self.States.SUMMARY)
+
+    @FiniteStateDevice.logic_provider(
+        States.SUMMARY,
+        lambda self: InputType.SILENT if self._silent else InputType.ANY
+    )
+    def _summary_logic(self, _: any) -> None:
+        self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(States.SUMMARY)
+    def _summary_content(self) -> dict:
+        return ComponentFactory.get(self._summary)
 
     def __copy__(self):
         return ResourceEvent(self.stat_name, self.amount, self.target,
@@ -630,15 +628,15 @@ class TextEvent(Event):
         super().__init__(InputType.ANY, self.States, self.States.DEFAULT)
         self.text: str | list[str | StringContent] = text
 
-        @FiniteStateDevice.state_logic(self, self.States.DEFAULT, InputType.ANY)
-        def logic(_: any) -> None:
-            self.set_state(self.States.TERMINATE)
+    @FiniteStateDevice.logic_provider(Event.States.DEFAULT, InputType.ANY)
+    def _default_logic(self, _: any) -> None:
+        self.set_state(self.States.TERMINATE)
 
-        @FiniteStateDevice.state_content(self, self.States.DEFAULT)
-        def content() -> dict:
-            return ComponentFactory.get(
-                self.text if type(text) == list else [self.text]
-            )
+    @FiniteStateDevice.content_provider(Event.States.DEFAULT)
+    def _default_content(self) -> dict:
+        return ComponentFactory.get(
+            self.text if type(self.text) == list else [self.text]
+        )
 
     def __copy__(self):
         return TextEvent(self.text)
@@ -792,6 +790,10 @@ class CombatEvent(Event):
     Since only a single CombatEngine can go on the StateDeviceStack at once, the
     instantiation of the CombatEngine is placed behind the Default state to
     avoid premature creation.
+
+    If auto_resolve is set, the combat is not placed on the stack. Instead, it
+    is run to completion immediately with the player's turns chosen by the AI,
+    and a single TextEvent summarizes the outcome, the combat log and any loot.
     """
 
     class States(Enum):
@@ -803,13 +805,15 @@ class CombatEvent(Event):
         TERMINATE = -1
 
     def __init__(self, allies: list[int], enemies: list[int],
-                 termination_conditions: list[TerminationHandler] = None):
+                 termination_conditions: list[TerminationHandler] = None,
+                 auto_resolve: bool = False):
         super().__init__(InputType.SILENT, self.States, self.States.DEFAULT)
 
         self._allies: list[int] = allies
         self._enemies: list[int] = enemies
         self._termination_conditions: list[
                                           TerminationHandler] | None = termination_conditions
+        self.auto_resolve: bool = auto_resolve
 
         self._setup_states()
 
@@ -823,10 +827,45 @@ class CombatEvent(Event):
                                        InputType.SILENT)
         def logic(_: any) -> None:
             combat = CombatEngine(self._allies, self._enemies,
-                                  self._termination_conditions)
-            game.add_state_device(combat)
+                                  self._termination_conditions,
+                                  auto_resolve=self.auto_resolve)
+
+            if self.auto_resolve:
+                game.add_state_device(TextEvent(self._resolve(combat)))
+            else:
+                game.add_state_device(combat)
+
             self.set_state(self.States.TERMINATE)
 
+    @staticmethod
+    def _resolve(combat: CombatEngine) -> list[str | StringContent]:
+        """
+        Run an auto-resolved combat and build its summary.
+        """
+        from game.systems.combat.combat_engine.simulator import auto_resolve, \
+            Outcome
+
+        result, transcript = auto_resolve(combat)
+
+        match result.outcome:
+            case Outcome.WIN:
+                header = get_config()['combat']['victory_message']
+            case Outcome.LOSS:
+                header = get_config()['combat']['loss_message']
+            case _:
+                header = "The fight ended in a stalemate."
+
+        summary = [
+            header, "\n",
+            f"Turn cycles: {result.turn_cycles}, damage dealt: "
+            f"{result.damage_dealt}, damage taken: {result.damage_taken}", "\n"
+        ]
+        for entry in transcript:
+            summary.extend(entry if type(entry) is list else [entry])
+            summary.append("\n")
+
+        return summary
+
     @staticmethod
     @cached([LoadableMixin.LOADER_KEY, "CombatEvent", LoadableMixin.ATTR_KEY])
     def from_json(json: dict[str, any]) -> any:
@@ -839,13 +878,14 @@ class CombatEvent(Event):
 
         Optional JSON fields:
         - termination_conditions: list[dict[str, any]]
+        - auto_resolve: bool
         """
         required_fields = [
             ("allies", list), ("enemies", list)
         ]
 
         optional_fields = [
-            ("termination_conditions", list)
+            ("termination_conditions", list), ("auto_resolve", bool)
         ]
 
         LoadableFactory.validate_fields(required_fields, json)
@@ -860,4 +900,4 @@ class CombatEvent(Event):
                 kw["termination_conditions"]
             ]
 
-        return CombatEvent(json["allies"], json["enemies"])
+        return CombatEvent(json["allies"], json["enemies"], **kw)
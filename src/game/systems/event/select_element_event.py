@@ -174,7 +174,7 @@ class SelectElementEventFactory:
                 Access the AbilityManager to get an instance of the Ability,
                 then test its requirements against the given CombatEntity.
                 """
-                inst = from_cache("managers.AbilityManager").get_instance(
+                inst = from_cache("managers.AbilityManager").get_ref(
                     ability_name)
                 print(inst)
                 return inst.is_requirements_fulfilled(combat_entity)
@@ -29,7 +29,7 @@ class ViewAbilitiesEvent(Event):
 
         inst = from_cache(
             "managers.AbilityManager"
-        ).get_instance(self.selected_ability)
+        ).get_ref(self.selected_ability)
         self._selected_instance = inst  # Cache instance in attr
 
         return inst
@@ -89,7 +89,10 @@ class ViewInventoryEvent(EntityTargetMixin, Event):
                 self.stack_index = user_input
                 self.set_state(self.States.CALCULATE_INSPECTION_OPTIONS)
 
-        @FiniteStateDevice.state_content(self, self.States.CHOOSE_ITEM)
+        @FiniteStateDevice.state_content(
+            self, self.States.CHOOSE_ITEM, memoize=True,
+            depends_on=[lambda: self.target.inventory.fingerprint]
+        )
         def content() -> dict:
             return ComponentFactory.get(["What stack would you like to inspect?"],
                                         self.target.inventory.to_options())
@@ -9,9 +9,11 @@ class FlagManager(Manager):
     def __init__(self):
         super().__init__()
         self._manifest: dict[str, any] = {}
+        self.version: int = 0  # Incremented every time a flag changes
 
     def clear(self) -> None:
         self._manifest = {}
+        self.version += 1
 
     def get_flag(self, key: str) -> bool:
         """
@@ -82,6 +84,8 @@ class FlagManager(Manager):
             # Set the final sub-key's value in the lowest-traversed dict
             level[parts[-1]] = value
 
+        self.version += 1
+
     def load(self) -> None:
         raw_asset: dict[str, dict[str, bool]] = get_asset(self.FLAG_ASSET_PATH)
 
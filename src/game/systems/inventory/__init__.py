@@ -1,5 +1,5 @@
 from game.systems.inventory.equipment_controller import EquipmentController
 from game.systems.inventory.equipment_manager import EquipmentManager
-from game.systems.inventory.inventory_controller import InventoryController, Stack
+from game.systems.inventory.inventory_controller import InventoryController, InventoryTransaction, Stack
 
 equipment_manager = EquipmentManager()
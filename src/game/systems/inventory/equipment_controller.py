@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+
 from loguru import logger
 
 import game
@@ -12,6 +14,7 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from game.systems.inventory.structures import EquipSlot
+    from game.systems.item.item import Equipment
 
 
 class EquipmentController(LoadableMixin):
@@ -24,6 +27,10 @@ class EquipmentController(LoadableMixin):
     and EntityMode. While in PlayerMode, all attempts to equip equipment are
     checked against that item's Requirements. While in EntityMode, Requirements
     are ignored.
+
+    The armor, damage buff and tag resistances of the equipped items are kept
+    as running aggregates, which are updated whenever a slot is changed through
+    the controller. Slots are therefore only exposed as copies.
     """
 
     def __init__(self, owner=None, equipment: list[int] = None,
@@ -34,6 +41,15 @@ class EquipmentController(LoadableMixin):
         self._slots: dict[str, EquipSlot] = get_cache()['managers'][
             'EquipmentManager'].get_slots()
 
+        # Aggregates of the Equipment in all enabled, occupied slots
+        self._equipped_refs: dict[str, Equipment] = {}
+        self._dmg_resistance: int = 0
+        self._dmg_buff: int = 0
+        self._tag_resistance: dict[str, list[float]] = {}
+        self._tag_sums: dict[str, float] = {}
+        for slot in self._slots:
+            self._update_aggregates(slot)
+
         # If the equipment list is not None
         if equipment is not None and isinstance(equipment, list):
 
@@ -61,8 +77,29 @@ class EquipmentController(LoadableMixin):
     def __contains__(self, item: str) -> bool:
         return self._slots.__contains__(item)
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the slot states. If the owner is being copied in the same pass,
+        the copy is bound to the new owner.
+        """
+        ec = self.__class__.__new__(self.__class__)
+        ec.__dict__.update(self.__dict__)
+        ec._owner = memodict.get(id(self._owner), self._owner)
+        ec._slots = {name: copy.copy(slot) for name, slot in self._slots.items()}
+
+        # Tag lists are replaced rather than modified, so they may be shared
+        ec._equipped_refs = dict(self._equipped_refs)
+        ec._tag_resistance = dict(self._tag_resistance)
+        ec._tag_sums = dict(self._tag_sums)
+
+        return ec
+
     def __getitem__(self, item: str) -> EquipSlot:
-        return self._slots.__getitem__(item)
+        """
+        Get a copy of a slot. Changes to the copy do not affect the controller;
+        use __setitem__, `equip` or `unequip` to modify a slot.
+        """
+        return copy.copy(self._slots[item])
 
     def __setitem__(self, key: str, value: bool | int | None) -> None:
         """
@@ -80,6 +117,7 @@ class EquipmentController(LoadableMixin):
         # If value is a bool, treat is an enable/disable slot
         if type(value) == bool:
             self._slots[key].enabled = value
+            self._update_aggregates(key)
 
         # If an int, treat it as set-id
         elif type(value) == int:
@@ -100,10 +138,12 @@ class EquipmentController(LoadableMixin):
                     f"{key} != {ref.slot}")
 
             self._slots[key].item_id = value
+            self._update_aggregates(key)
 
         # If None, treat it as clear-slot
         elif value is None:
             self._slots[key].item_id = value
+            self._update_aggregates(key)
 
         # That's not right
         else:
@@ -111,6 +151,51 @@ class EquipmentController(LoadableMixin):
                 f"Unknown type for value! Expected int, bool, or None. Got "
                 f"{type(value)}!")
 
+    def _update_aggregates(self, slot: str) -> None:
+        """
+        Bring the equipment aggregates up to date after a change to a slot.
+
+        The previous contribution of the slot is removed and its new
+        contribution is added. Only the tags of the affected items are
+        re-folded.
+        """
+        s = self._slots[slot]
+        before = self._equipped_refs.pop(slot, None)
+        after = None
+
+        if s.enabled and s.item_id is not None:
+            after = from_cache("managers.ItemManager").get_ref(s.item_id)
+            self._equipped_refs[slot] = after
+
+        if before is after:
+            return
+
+        changed_tags = set()
+        if before is not None:
+            self._dmg_resistance -= before.damage_resist
+            self._dmg_buff -= before.damage_buff
+            changed_tags.update(before.tags)
+
+        if after is not None:
+            self._dmg_resistance += after.damage_resist
+            self._dmg_buff += after.damage_buff
+            changed_tags.update(after.tags)
+
+        from game.systems.combat.combat_engine.combat_helpers import sum_a_tag
+
+        for tag in changed_tags:
+            values = [
+                e.tags[tag] for e in self._equipped_refs.values()
+                if tag in e.tags
+            ]
+
+            if len(values) > 0:
+                self._tag_resistance[tag] = values
+                self._tag_sums[tag] = sum_a_tag(values)
+            else:
+                self._tag_resistance.pop(tag, None)
+                self._tag_sums.pop(tag, None)
+
     def equip(self, item_id: int) -> bool:
         """
         Pops the item currently in the slot for the item and returns its ID,
@@ -219,80 +304,49 @@ class EquipmentController(LoadableMixin):
         return [slot for slot in self._slots if self._slots[slot].enabled]
 
     @property
-    def total_dmg_resistance(self) -> int:
+    def equipped_item_ids(self) -> tuple[int, ...]:
         """
-        Calculate and return the total resistance of equipment attached to the
-        entity in all enabled slots
+        The ids of the items equipped in all enabled slots, in slot order
         """
-        instances = [
-            from_cache(
-                "managers.ItemManager"
-            ).get_instance(
-                s.item_id
-            ) for s in self._slots.values() if (
-                    s.enabled and s.item_id is not None
-            )
-        ]
+        return tuple(
+            s.item_id for s in self._slots.values() if (
+                    s.enabled and s.item_id is not None)
+        )
 
-        return sum([e.damage_resist for e in instances])
+    @property
+    def total_dmg_resistance(self) -> int:
+        """
+        The total resistance of equipment attached to the entity in all enabled
+        slots
+        """
+        return self._dmg_resistance
 
     @property
     def total_dmg_buff(self) -> int:
         """
-        Calculate and return the total resistance of equipment attached to the
-        entity in all enabled slots
+        The total damage buff of equipment attached to the entity in all enabled
+        slots
         """
-        instances = [
-            from_cache(
-                "managers.ItemManager"
-            ).get_instance(
-                s.item_id
-            ) for s in self._slots.values() if (
-                    s.enabled and s.item_id is not None)
-        ]
-
-        return sum([e.damage_buff for e in instances])
+        return self._dmg_buff
 
     @property
     def all_tag_resistance(self) -> dict[str, list[float]]:
         """
-        Collect and return lists of tag resistances from all enabled slots
+        Lists of tag resistances from all enabled slots. The returned dict is
+        shared with the controller and must not be modified.
         """
-
-        instances = [
-            from_cache(
-                "managers.ItemManager"
-            ).get_instance(
-                s.item_id)
-            for s in self._slots.values() if s.enabled and s.item_id is not None
-        ]
-        total_tags: dict[str, list[float]] = {}
-        for equipment in instances:
-            for tag, value in equipment.tags.items():
-                if tag not in total_tags:
-                    total_tags[tag] = []
-
-                total_tags[tag].append(equipment.tags[tag])
-
-        return total_tags
+        return self._tag_resistance
 
     @property
     def sum_tag_resistance(self) -> dict[str, float]:
         """
-        Collect and return a dict mapping the name of a tag to the total
-        resistance associated with that tag.
+        A dict mapping the name of a tag to the total resistance associated
+        with that tag. The returned dict is shared with the controller and must
+        not be modified.
 
         Returns: A dict containing the total resistance for each given tag
         """
-
-        from game.systems.combat.combat_engine.combat_helpers import sum_a_tag
-
-        total_resistances: dict[str, float] = {}
-
-        for tag in self.all_tag_resistance:
-            total_resistances[tag] = sum_a_tag(self.all_tag_resistance[tag])
-
-        return total_resistances
+        return self._tag_sums
 
     def get_tag_resistances_as_options(self) -> list[list[str | StringContent]]:
         """
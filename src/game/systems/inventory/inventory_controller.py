@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
-import weakref
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 
 import game.cache as cache
 from game.structures.loadable import LoadableMixin
@@ -10,28 +9,49 @@ from game.structures.messages import StringContent
 
 from loguru import logger
 
+if TYPE_CHECKING:
+    from game.systems.item.item import Item
+
 
 def get_default_capacity() -> int:
     return cache.get_config()["inventory"]["default_capacity"]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Stack:
+    """
+    A quantity of a single item. Stacks are plain records; the Item that a
+    Stack holds is looked up from the ItemManager when it is needed.
+    """
     id: int
     quantity: int
 
-    def __post_init__(self):
-        from game.systems.item.item import Item
-        self.ref: Item = cache.from_cache("managers.ItemManager").get_ref(self.id)
+    @property
+    def ref(self) -> Item:
+        """
+        The registered Item that this Stack holds.
+        """
+        return cache.from_cache("managers.ItemManager").get_ref(self.id)
 
 
 class InventoryController(LoadableMixin):
+    """
+    An ordered collection of Stacks of items.
+
+    Alongside the list of stacks, the controller maintains an index from each
+    item id to its stacks, in inventory order, and to the total quantity held
+    across them. Every mutation goes through the controller and keeps the index
+    up-to-date, so lookups by item id never scan the inventory. Stacks must not
+    be modified or reordered from outside the controller.
+    """
 
     def __init__(self, capacity: int = None, items: list[tuple[int, int]] = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.capacity: int = capacity
         self.fragmented: bool = False
         self.items: list[Stack] = []
+        self._stacks: dict[int, list[Stack]] = {}  # item_id -> stacks of that item, in inventory order
+        self._totals: dict[int, int] = {}  # item_id -> total quantity across its stacks
 
         # We cannot query the cache for the default capacity on class definition
         # since there's no guarantee the config
@@ -49,41 +69,132 @@ class InventoryController(LoadableMixin):
                 else:
                     raise TypeError(f"Unknown type {type(t)} in inventory item_manifest!")
 
-    # Private Methods
-    def _all_stack_indexes(self, item_id: int) -> list[int]:
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the stacks of the inventory. Stacks only hold an item id and a
+        quantity, so each is rebuilt directly.
         """
-        Returns a list of the indexes of all stacks with a matching item_id.
+        inv = self.__class__.__new__(self.__class__)
+        inv.__dict__.update(self.__dict__)
+        inv.items = [Stack(stack.id, stack.quantity) for stack in self.items]
+        inv._reindex()
 
-        Args:
-            item_id: The ID to look up
+        return inv
 
-        Returns: A list of indexes to valid stacks in the inventory
+    # Private Methods
+    def _reindex(self) -> None:
         """
-        if type(item_id) != int:
-            raise TypeError(f"item_id must be an int! Got object of type {type(item_id)} instead.")
-
-        return [idx for idx, stack in enumerate(self.items) if stack.id == item_id]
+        Rebuild the item index from the list of stacks.
+        """
+        self._stacks = {}
+        self._totals = {}
+        for stack in self.items:
+            self._stacks.setdefault(stack.id, []).append(stack)
+            self._totals[stack.id] = self._totals.get(stack.id, 0) + stack.quantity
 
     def _all_stacks(self, item_id: int) -> list[Stack]:
         """
-        Retrieve a list of references to each stack containing the designated item id
+        Retrieve a list of references to each stack containing the designated item id, in inventory order
         """
         if type(item_id) != int:
             raise TypeError(f"item_id must be an int! Got object of type {type(item_id)} instead.")
 
-        return [weakref.proxy(stack) for stack in self.items if stack.id == item_id]
+        return list(self._stacks.get(item_id, ()))
+
+    def _append_stack(self, stack: Stack) -> None:
+        self.items.append(stack)
+        self._stacks.setdefault(stack.id, []).append(stack)
+        self._totals[stack.id] = self._totals.get(stack.id, 0) + stack.quantity
+
+    def _remove_stacks(self, stacks: list[Stack]) -> None:
+        """
+        Remove specific stacks from the inventory. Stacks are compared by identity, since equal stacks may be held in
+        more than one position.
+        """
+        removed = {id(stack) for stack in stacks}
+        self.items = [stack for stack in self.items if id(stack) not in removed]
+
+        for stack in stacks:
+            self._totals[stack.id] -= stack.quantity
+
+        for item_id in {stack.id for stack in stacks}:
+            item_stacks = [s for s in self._stacks[item_id] if id(s) not in removed]
+            if item_stacks:
+                self._stacks[item_id] = item_stacks
+            else:
+                del self._stacks[item_id]
+                del self._totals[item_id]
+
+    def _consume(self, item_id: int, quantity: int) -> None:
+        """
+        Remove a quantity of an item from its stacks in inventory order, deleting any stack that is used up. The caller
+        must ensure that there is enough of the item.
+        """
+        remaining: int = quantity
+        emptied: list[Stack] = []
+        for stack in self._stacks.get(item_id, ()):
+            if remaining <= 0:
+                break
+
+            consumed = min(stack.quantity, remaining)
+            remaining -= consumed
+            stack.quantity -= consumed
+            if stack.quantity == 0:
+                emptied.append(stack)
+
+        self._totals[item_id] -= quantity - remaining
+        if emptied:
+            self._remove_stacks(emptied)
+
+    def _snapshot(self) -> tuple[list[Stack], list[int]]:
+        return list(self.items), [stack.quantity for stack in self.items]
+
+    def _restore(self, snapshot: tuple[list[Stack], list[int]]) -> None:
+        """
+        Return the inventory to the state recorded by _snapshot.
+        """
+        items, quantities = snapshot
+        for stack, quantity in zip(items, quantities):
+            stack.quantity = quantity
+
+        self.items = items
+        self._reindex()
+
+    def _consolidate_item(self, item_id: int) -> None:
+        """
+        Combine the non-full stacks of a single item. The item's quantity is packed into its earliest stacks, and any
+        stacks left empty are removed. No other stack is touched.
+        """
+        stacks = self._stacks.get(item_id)
+        if not stacks:
+            return
+
+        max_quantity = stacks[0].ref.max_quantity
+        remaining = self._totals[item_id]
+        emptied = []
+        for stack in stacks:
+            if remaining > 0:
+                stack.quantity = min(max_quantity, remaining)
+                remaining -= stack.quantity
+            else:
+                emptied.append(stack)
+
+        if emptied:
+            # Emptied stacks hold nothing, so the total is unaffected
+            for stack in emptied:
+                stack.quantity = 0
+
+            self._remove_stacks(emptied)
 
     def _consolidate_stacks(self):
         """
         Combine multiple non-full stacks of the same item_id into a single stack.
         """
-        quantity_cache = {}
-
-        for stack in self.items:
-            if stack.id not in quantity_cache:
-                quantity_cache[stack.id] = self.total_quantity(stack.id)
+        quantity_cache = dict(self._totals)
 
         self.items = []
+        self._stacks = {}
+        self._totals = {}
         for item_id in quantity_cache:
             self.insert_item(item_id, quantity_cache[item_id])
 
@@ -99,7 +210,7 @@ class InventoryController(LoadableMixin):
         if type(item_id) != int:
             raise TypeError(f"item_id must be an int! Got object of type {type(item_id)} instead.")
 
-        return sum([s.quantity for s in self._all_stacks(item_id)])
+        return self._totals.get(item_id, 0)
 
     def filter_stacks(self, _filter: Callable) -> list[Stack]:
         """
@@ -117,6 +228,14 @@ class InventoryController(LoadableMixin):
 
     # Public Methods
 
+    @property
+    def fingerprint(self) -> tuple[tuple[int, int], ...]:
+        """
+        A cheap snapshot of the contents of the inventory. Two fingerprints are
+        equal only if the inventory holds the same stacks in the same order.
+        """
+        return tuple((stack.id, stack.quantity) for stack in self.items)
+
     @property
     def full(self) -> bool:
         """
@@ -156,44 +275,19 @@ class InventoryController(LoadableMixin):
         if self.total_quantity(item_id) < quantity:
             return False
 
-        already_consumed: int = 0
-        while already_consumed < quantity:
-
-            # If the loop is started over a list of zero stacks, raise an error
-            # to avoid an infinite loop
-            if len(self._all_stack_indexes(item_id)) < 1:
-                raise ValueError(f"Something went wrong while trying to consume"
-                                 f" item::{item_id}.")
-
-            offset = 0
-            for stack_index in self._all_stack_indexes(item_id):
-
-                # If the current stack is bigger than needed, adjust its size
-                # and return True
-                if self.items[stack_index - offset].quantity > quantity - already_consumed:
-                    self.items[stack_index - offset] = Stack(item_id, self.items[stack_index - offset].quantity - (
-                            quantity - already_consumed))
-
-                    self._consolidate_stacks()
-                    return True
+        self._consume(item_id, quantity)
+        self._consolidate_item(item_id)
+        return True
 
-                # If the current stack is exactly the size needed, delete it and
-                # return True
-                elif self.items[stack_index - offset].quantity == quantity - already_consumed:
-
-                    del self.items[stack_index - offset]
-                    offset += 1
-
-                    self._consolidate_stacks()
-                    return True
-
-                # If the stack is too small, record its size as consumed and
-                # delete it.
-                else:
-                    already_consumed = already_consumed + self.items[stack_index - offset].quantity
+    def transaction(self, allow_overflow: bool = False) -> InventoryTransaction:
+        """
+        Start a batch of consumes and inserts that is applied to the inventory as a single unit. See
+        InventoryTransaction.
 
-                    del self.items[stack_index - offset]
-                    offset += 1
+        Args:
+            allow_overflow: If True, inserts that do not fit are reported by the transaction rather than rolling it back
+        """
+        return InventoryTransaction(self, allow_overflow)
 
     def __str__(self) -> str:
         buf = ""
@@ -213,11 +307,7 @@ class InventoryController(LoadableMixin):
 
         search_for = element if type(element) == int else element.id
 
-        for i in self.items:
-            if i.id == search_for:
-                return True
-
-        return False
+        return search_for in self._stacks
 
     def __len__(self):
         return self.size
@@ -254,7 +344,7 @@ class InventoryController(LoadableMixin):
             raise ValueError(f"Can't drop stack! {stack_index} is out of range,"
                              f" inventory is of size {len(self.items)}")
 
-        del self.items[stack_index]
+        self._remove_stacks([self.items[stack_index]])
 
     def is_collidable(self, item_id: int, quantity: int) -> bool:
         """
@@ -306,13 +396,14 @@ class InventoryController(LoadableMixin):
 
         from game.systems.item import item_manager
 
-        leftover = quantity - item_manager.get_instance(item_id).max_quantity
+        max_quantity = item_manager.get_ref(item_id).max_quantity
+        leftover = quantity - max_quantity
 
         if leftover >= 0:
-            self.items.append(Stack(item_id, item_manager.get_instance(item_id).max_quantity))
+            self._append_stack(Stack(item_id, max_quantity))
             return leftover
 
-        self.items.append(Stack(item_id, quantity))
+        self._append_stack(Stack(item_id, quantity))
         return 0
 
     def insert_item(self, item_id: int, quantity: int) -> int:
@@ -335,8 +426,9 @@ class InventoryController(LoadableMixin):
         max_stack_size: int = None
 
         # Insert items into existing stacks if possible
-        for stack in self._all_stacks(item_id):
-            max_stack_size = stack.ref.max_quantity
+        for stack in self._stacks.get(item_id, ()):
+            if max_stack_size is None:
+                max_stack_size = stack.ref.max_quantity
 
             if stack.quantity < max_stack_size:  # If stack is not full
                 if remaining_quantity > (
@@ -349,6 +441,9 @@ class InventoryController(LoadableMixin):
                     remaining_quantity = 0  # Set rq to zero
                     break  # Exit the loop
 
+        if item_id in self._totals:
+            self._totals[item_id] += quantity - remaining_quantity
+
         # Look up max stack size if it wasn't already done
         if not max_stack_size:
             from game.systems.item import item_manager  # Any global-scoped import of item_manager circular imports
@@ -404,3 +499,115 @@ class InventoryController(LoadableMixin):
 
         inv = InventoryController(capacity, json[manifest_key])
         return inv
+
+
+class InventoryTransaction:
+    """
+    A batch of consumes and inserts that is applied to an InventoryController as a single unit.
+
+    Changes are recorded with `consume` and `insert` and take effect when the transaction is committed, either by
+    calling `commit` or on leaving a `with` block without an error:
+
+        with inventory.transaction() as transaction:
+            transaction.consume(ingredient_id, 3).insert(product_id, 1)
+
+    Quantities of the same item are combined, so each item is consumed, inserted and consolidated once no matter how
+    many times it is recorded. Consumes are validated before anything is changed, then applied before the inserts. If
+    the batch cannot be applied in full, the inventory is rolled back to its state before the commit and the error is
+    raised.
+    """
+
+    def __init__(self, inventory: InventoryController, allow_overflow: bool = False):
+        self.inventory: InventoryController = inventory
+        self.allow_overflow: bool = allow_overflow
+        self.committed: bool = False
+
+        self._consumes: dict[int, int] = {}  # item_id -> quantity
+        self._inserts: dict[int, int] = {}  # item_id -> quantity
+
+        # The quantity of each item that did not fit, if allow_overflow is set. Filled in by commit.
+        self.overflow: dict[int, int] = {}
+
+    def __enter__(self) -> InventoryTransaction:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    @staticmethod
+    def _validate_args(item_id: int, quantity: int) -> None:
+        if type(item_id) != int or type(quantity) != int:
+            raise TypeError(
+                f"item_id and quantity must be of type int! Got type "
+                f"{type(item_id)} and {type(quantity)} instead.")
+
+        if quantity < 0:
+            raise ValueError(f"quantity must be non-negative! Got {quantity}")
+
+    def consume(self, item_id: int, quantity: int) -> InventoryTransaction:
+        """
+        Record a quantity of an item to remove from the inventory.
+        """
+        self._validate_args(item_id, quantity)
+        self._consumes[item_id] = self._consumes.get(item_id, 0) + quantity
+        return self
+
+    def insert(self, item_id: int, quantity: int) -> InventoryTransaction:
+        """
+        Record a quantity of an item to add to the inventory.
+        """
+        self._validate_args(item_id, quantity)
+        self._inserts[item_id] = self._inserts.get(item_id, 0) + quantity
+        return self
+
+    def validate(self) -> None:
+        """
+        Check that the inventory holds enough of every item to be consumed.
+
+        Raises: ValueError if it does not
+        """
+        for item_id, quantity in self._consumes.items():
+            if self.inventory.total_quantity(item_id) < quantity:
+                raise ValueError(f"Cannot consume {quantity} of item::{item_id}! Only "
+                                 f"{self.inventory.total_quantity(item_id)} in the inventory.")
+
+    def commit(self) -> dict[int, int]:
+        """
+        Apply the recorded changes to the inventory.
+
+        Returns: The quantity of each inserted item that did not fit. Always empty unless allow_overflow is set.
+
+        Raises: ValueError if there is not enough of an item to consume, or if an insert does not fit and
+            allow_overflow is not set. The inventory is left unchanged.
+        """
+        if self.committed:
+            raise RuntimeError("Transaction has already been committed!")
+
+        self.validate()
+
+        inventory = self.inventory
+        snapshot = inventory._snapshot()
+        overflow: dict[int, int] = {}
+        try:
+            for item_id, quantity in self._consumes.items():
+                inventory._consume(item_id, quantity)
+
+            for item_id in self._consumes:
+                inventory._consolidate_item(item_id)
+
+            for item_id, quantity in self._inserts.items():
+                leftover = inventory.insert_item(item_id, quantity)
+                if leftover > 0:
+                    overflow[item_id] = leftover
+
+            if overflow and not self.allow_overflow:
+                raise ValueError(f"Not enough room in the inventory! Overflowing items: {overflow}")
+
+        except BaseException:
+            inventory._restore(snapshot)
+            raise
+
+        self.committed = True
+        self.overflow = overflow
+        return dict(overflow)
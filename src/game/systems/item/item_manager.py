@@ -23,10 +23,18 @@ class ItemManager(Manager):
     """
 
     ITEM_ASSET_PATH = "items"
+    INDEXES = {
+        "cls": lambda item: [type(item).__name__],
+        "name": lambda item: [item.name],
+        "slot": lambda item: [item.slot] if hasattr(item, "slot") else [],
+        "tag": lambda item: list(getattr(item, "tags", {})),
+        "currency": lambda item: list(item._market_values)
+    }
 
     def __init__(self):
         super().__init__()
         self._manifest: dict[int, Item] = {}
+        self._refs: dict[int, Item] = {}  # item id -> shared proxy of the master Item
 
     def register_item(self, item_object: Item | list[Item]) -> None:
         """
@@ -40,6 +48,8 @@ class ItemManager(Manager):
                                  f"registered!")
 
             self._manifest[item_object.id] = item_object
+            self._refs[item_object.id] = weakref.proxy(item_object)
+            self._index(item_object.id, item_object)
 
         elif isinstance(item_object, list):
             for obj in item_object:
@@ -120,7 +130,7 @@ class ItemManager(Manager):
             logger.error(self._manifest)
             raise ValueError(f"No such item with ID {item_id}!")
 
-        return weakref.proxy(self._manifest[item_id])
+        return self._refs[item_id]
 
     def load(self) -> None:
         """
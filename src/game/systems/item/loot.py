@@ -1,11 +1,11 @@
 from abc import ABC
-from random import randint
 
 from loguru import logger
 
 from game.cache import from_cache, cached
 from game.structures.loadable import LoadableMixin
 from game.structures.loadable_factory import LoadableFactory
+from game.util.rng import rng
 
 
 class LootTable(LoadableMixin):
@@ -142,14 +142,14 @@ class LootableMixin(ABC):
         """
         Generate a random number to determine how many drops should be generated
         """
-        idx = randint(0, len(self.loot_table.drop_table) - 1)
+        idx = rng.randint(0, len(self.loot_table.drop_table) - 1)
         return self.loot_table.drop_table[idx]
 
     def _get_item_from_pool(self) -> int:
         """
         Generate a random number to determine which item should drop
         """
-        return self.loot_table.item_table[randint(0, len(self.loot_table.item_table) - 1)]
+        return self.loot_table.item_table[rng.randint(0, len(self.loot_table.item_table) - 1)]
 
     def get_loot(self) -> dict[int, int]:
         """
@@ -73,7 +73,10 @@ class ShopAction(Action):
                 self.ware_of_interest = self.wares[user_input]
                 self.set_state(self.States.WARE_SELECTED)
 
-        @FiniteStateDevice.state_content(self, self.States.DISPLAY_WARES)
+        @FiniteStateDevice.state_content(
+            self, self.States.DISPLAY_WARES, memoize=True,
+            depends_on=[lambda: from_cache('player').coin_purse.fingerprint]
+        )
         def content():
             return ComponentFactory.get(
                 [self.get_text_header(), self.activation_text],
@@ -71,7 +71,11 @@ class Room(LoadableMixin, FiniteStateDevice):
 
             self.set_state(self.States.REQ_MET)
 
-        @FiniteStateDevice.state_content(self, self.States.DISPLAY_OPTIONS)
+        @FiniteStateDevice.state_content(
+            self, self.States.DISPLAY_OPTIONS, memoize=True,
+            depends_on=[lambda: tuple(a.visible for a in self.actions),
+                        lambda: room.room_manager.is_visited(self.id)]
+        )
         def content():
             return ComponentFactory.get(
                 [(self.first_enter_text + "\n" if room.room_manager.is_visited(self.id) else "") + self.enter_text],
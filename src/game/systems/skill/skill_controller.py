@@ -1,3 +1,5 @@
+import copy
+
 from game.structures.messages import StringContent
 from game.systems.skill import skill_manager
 from game.systems.skill.skills import Skill
@@ -35,6 +37,19 @@ class SkillController:
     def __contains__(self, item: int) -> bool:
         return self.skills.__contains__(item)
 
+    def __deepcopy__(self, memodict={}):
+        """
+        Copy the level and xp of each Skill. Level-up events are deep-copied
+        when they trigger, so they are shared between copies.
+        """
+        sc = self.__class__.__new__(self.__class__)
+        sc.obtain_all = self.obtain_all
+        sc.skills = {
+            skill_id: copy.copy(skill) for skill_id, skill in self.skills.items()
+        }
+
+        return sc
+
     def __getitem__(self, item: int) -> Skill:
         return self.skills.__getitem__(item)
 
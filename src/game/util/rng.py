@@ -0,0 +1,70 @@
+"""
+The session-wide source of randomness.
+
+Every random decision made by the game draws from the RandomService singleton
+`rng`. Seeding it makes a session reproducible, and each combat reseeds it with
+a seed of its own so that a single combat can be replayed in isolation.
+"""
+import random
+from typing import Sequence
+
+
+class RandomService:
+    """
+    A seedable wrapper around a single random.Random instance.
+
+    Only the operations used by the game are exposed, so that every random
+    decision is routed through the same generator.
+    """
+
+    SEED_BITS: int = 64
+
+    def __init__(self, seed: int = None):
+        self._random: random.Random = random.Random()
+        self.current_seed: int | None = None
+        self.seed(seed)
+
+    def seed(self, seed: int = None) -> int:
+        """
+        Reseed the service.
+
+        Args:
+            seed: The new seed. If None, a seed is drawn from the OS.
+
+        Returns: The seed that was used
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(self.SEED_BITS)
+
+        if type(seed) is not int:
+            raise TypeError(f"seed must be of type int! Got {type(seed)}")
+
+        self._random.seed(seed)
+        self.current_seed = seed
+        return seed
+
+    def spawn_seed(self) -> int:
+        """
+        Draw a seed for a dependent generator. Seeds spawned from a seeded
+        service are themselves deterministic.
+        """
+        return self._random.getrandbits(self.SEED_BITS)
+
+    def random(self) -> float:
+        return self._random.random()
+
+    def randint(self, a: int, b: int) -> int:
+        return self._random.randint(a, b)
+
+    def choice(self, seq: Sequence) -> any:
+        return self._random.choice(seq)
+
+    def getstate(self) -> tuple:
+        return self._random.getstate()
+
+    def setstate(self, state: tuple) -> None:
+        self._random.setstate(state)
+
+
+# The RandomService shared by the whole session
+rng = RandomService()
@@ -2,7 +2,7 @@ from enum import Enum
 
 from game.structures.enums import InputType
 from game.structures.messages import ComponentFactory
-from game.structures.state_device import FiniteStateDevice
+from game.structures.state_device import FiniteStateDevice, state_tracer
 
 import pytest
 
@@ -77,6 +77,44 @@ def test_init_state_history():
     assert len(md.state_history) == 1
 
 
+def test_state_history_bounded():
+    """Verify that state_history only keeps the most recent states"""
+    md = MockFiniteStateDevice()
+
+    for _ in range(md.STATE_HISTORY_LENGTH * 2):
+        md.set_state(md.States.A)
+        md.set_state(md.States.B)
+
+    assert len(md.state_history) == md.STATE_HISTORY_LENGTH
+    assert md.state_history[-1] == md.States.B
+    assert md.state_history[-2] == md.States.A
+
+
+def test_state_tracer(tmp_path):
+    """Verify that transitions are streamed to the trace file when enabled"""
+    trace_path = tmp_path / "trace.log"
+    md = MockFiniteStateDevice()
+
+    state_tracer.enable(str(trace_path))
+    try:
+        md.set_state(md.States.A)
+        md.set_state(md.States.B)
+    finally:
+        state_tracer.disable()
+
+    md.set_state(md.States.C)  # Not traced
+
+    lines = trace_path.read_text().splitlines()
+    assert len(lines) == 2
+
+    timestamp, device, from_state, to_state = lines[0].split("\t")
+    assert float(timestamp) > 0
+    assert device == str(md)
+    assert from_state == str(md.States.DEFAULT)
+    assert to_state == str(md.States.A)
+    assert lines[1].split("\t")[2:] == [str(md.States.A), str(md.States.B)]
+
+
 @pytest.mark.parametrize("state", MockFiniteStateDevice.States)
 def test_init_state_data(state):
     """Verify that the state data of each state in a FiniteStateDevice are correctly initialized"""
@@ -232,3 +270,174 @@ def test_user_branching_state_behavior():
     md.input(None)
     md.input(1)
     assert md.current_state.value == md.States.C.value
+
+
+# FiniteStateDevice whose states are declared at class level
+class MockDeclaredStateDevice(FiniteStateDevice):
+    class States(Enum):
+        DEFAULT = 0
+        A = 1
+        TERMINATE = -1
+
+    def __init__(self, silent_a: bool = False):
+        super().__init__(InputType.SILENT, self.States)
+        self.silent_a = silent_a
+        self.counter: int = 0
+
+    @FiniteStateDevice.logic_provider(States.DEFAULT, InputType.SILENT)
+    def _default_logic(self, _: any) -> None:
+        self.counter += 1
+        self.set_state(self.States.A)
+
+    @FiniteStateDevice.logic_provider(
+        States.A,
+        lambda self: InputType.SILENT if self.silent_a else InputType.INT,
+        input_min=0,
+        input_max=lambda self: self.counter
+    )
+    def _a_logic(self, user_input: int) -> None:
+        self.counter += user_input
+        self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(States.A)
+    def _a_content(self) -> dict:
+        return ComponentFactory.get([str(self.counter)])
+
+
+def test_declared_states_compiled_once():
+    a = MockDeclaredStateDevice()
+    b = MockDeclaredStateDevice()
+
+    for state in MockDeclaredStateDevice.States:
+        assert a.state_data[state.value] is b.state_data[state.value]
+        assert a.state_data[state.value] is \
+               MockDeclaredStateDevice._compiled_states[state.value]
+
+    assert len(a.state_data[0]) == len(a.state_data_dict)
+
+
+def test_declared_states_behavior():
+    md = MockDeclaredStateDevice()
+
+    md.input(None)
+    assert md.current_state == md.States.A
+    assert md.input_type == InputType.INT
+    assert md.domain_min == 0
+    assert md.domain_max == 1
+    assert md.components["content"] == ["1"]
+
+    assert not md.input(2)  # Above dynamic max
+    assert md.input(1)
+    assert md.counter == 2
+    assert md.current_state == md.States.TERMINATE
+
+
+def test_declared_states_dynamic_input_type():
+    md = MockDeclaredStateDevice(silent_a=True)
+
+    md.input(None)
+    assert md.input_type == InputType.SILENT
+    assert md.components == ComponentFactory.get()
+
+
+def test_declared_states_instance_override_does_not_leak():
+    a = MockDeclaredStateDevice()
+    b = MockDeclaredStateDevice()
+
+    @FiniteStateDevice.state_content(a, a.States.A, override=True)
+    def content() -> dict:
+        return ComponentFactory.get(["overridden"])
+
+    a.input(None)
+    b.input(None)
+
+    assert a.components["content"] == ["overridden"]
+    assert b.components["content"] == ["1"]
+
+    # The copied state keeps its declared logic and dynamic domain
+    assert a.domain_max == 1
+    assert a.input(1)
+    assert a.counter == 2
+
+
+def test_declared_logic_signature_checked():
+    with pytest.raises(ValueError):
+        class BadLogic(FiniteStateDevice):
+            @FiniteStateDevice.logic_provider(FiniteStateDevice.States.DEFAULT,
+                                              InputType.ANY)
+            def _default_logic(self) -> None:
+                pass
+
+    with pytest.raises(ValueError):
+        class BadContent(FiniteStateDevice):
+            @FiniteStateDevice.content_provider(FiniteStateDevice.States.DEFAULT)
+            def _default_content(self, _: any) -> dict:
+                return ComponentFactory.get()
+
+
+# FiniteStateDevice whose content is memoized on a dependency
+class MockMemoStateDevice(FiniteStateDevice):
+    class States(Enum):
+        DEFAULT = 0
+        TERMINATE = -1
+
+    def __init__(self):
+        super().__init__(InputType.INT, self.States)
+        self.version: int = 0
+        self.renders: int = 0
+
+    @FiniteStateDevice.logic_provider(States.DEFAULT, InputType.INT)
+    def _default_logic(self, _: int) -> None:
+        pass
+
+    @FiniteStateDevice.content_provider(States.DEFAULT, memoize=True,
+                                        depends_on=[lambda self: self.version])
+    def _default_content(self) -> dict:
+        self.renders += 1
+        return ComponentFactory.get([str(self.version)])
+
+
+def test_memoized_content_reused_until_dependency_changes():
+    md = MockMemoStateDevice()
+
+    first = md.components
+    assert md.components is first
+    assert md.renders == 1
+
+    md.version += 1
+    assert md.components["content"] == ["1"]
+    assert md.renders == 2
+
+    md.invalidate_content()
+    md.components
+    assert md.renders == 3
+
+
+def test_memoized_content_invalidated_by_state_change():
+    md = MockMemoStateDevice()
+
+    md.components
+    md.set_state(md.States.DEFAULT)
+    md.components
+    assert md.renders == 2
+
+
+def test_instance_memoized_content():
+    md = MockFiniteStateDevice()
+    renders = []
+    token = [0]
+
+    @FiniteStateDevice.state_content(md, md.States.A, override=True,
+                                     memoize=True, depends_on=[lambda: token[0]])
+    def content() -> dict:
+        renders.append(None)
+        return ComponentFactory.get([str(token[0])])
+
+    md.input(None)
+    md.components
+    md.components
+    assert len(renders) == 1
+
+    token[0] = 1
+    assert md.components["content"] == ["1"]
+    assert len(renders) == 2
@@ -33,3 +33,34 @@ def test_init_effects():
     assert len(a.effects) is not None
     assert re in a.effects
 
+
+def test_registered_ability_is_frozen():
+    from game.structures.enums import CombatPhase
+    from ..utils import temporary_ability
+
+    re = ResourceEffect("_tr_health", -10)
+    ab = Ability(name="temp_ab", description="", on_use="",
+                 target_mode=TargetMode.SINGLE,
+                 effects={CombatPhase.START_PHASE: [re]})
+
+    with temporary_ability([ab]) as ability_manager:
+        ref = ability_manager.get_ref("temp_ab")
+        assert ref is ab
+        assert ref.frozen
+
+        with pytest.raises(AttributeError):
+            ref.damage = 100
+
+        # Instances are private and mutable
+        inst = ability_manager.get_instance("temp_ab")
+        assert inst is not ab
+        assert not inst.frozen
+        inst.damage = 100
+        assert ab.damage == 1
+
+        # Effects are instantiated fresh every time
+        effects = ref.instantiate_effects()[CombatPhase.START_PHASE]
+        assert len(effects) == 1
+        assert effects[0] is not re
+        assert ref.instantiate_effects()[CombatPhase.START_PHASE][0] is not \
+               effects[0]
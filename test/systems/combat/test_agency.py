@@ -37,8 +37,9 @@ is_restorative_items_cases = [
 @pytest.mark.parametrize("item_id, result", is_restorative_items_cases)
 def test_is_restorative_item(item_id: int, result: bool):
     inst = from_cache("managers.ItemManager").get_instance(item_id)
+    tables = _get_intelligent_agent().agent_tables
 
-    assert CombatEntity._is_restorative_item(inst, EXPECTED_PRIMARY_RESOURCE) == result
+    assert (EXPECTED_PRIMARY_RESOURCE in tables.restored_resources(inst)) == result
 
 
 # List of Item IDs in, List of expected Item IDs out
@@ -74,3 +75,64 @@ def test_offensive_abilities(ability_names, expected_names):
     entity = _get_intelligent_agent(abilities=ability_names)
 
     assert set(expected_names) == set([a.name for a in entity.offensive_abilities])
+
+
+def test_agent_tables_follow_learned_abilities():
+    entity = _get_intelligent_agent(abilities=[f"{TEST_PREFIX}Ability 1"])
+
+    tables = entity.agent_tables
+    profiles = tables.abilities
+    assert [p.name for p in profiles] == [f"{TEST_PREFIX}Ability 1"]
+
+    # Profiles are only rebuilt when the learned abilities change
+    assert entity.agent_tables.abilities is profiles
+
+    entity.ability_controller.learn(f"{TEST_PREFIX}Ability 2")
+    assert {p.name for p in entity.agent_tables.abilities} == \
+           {f"{TEST_PREFIX}Ability 1", f"{TEST_PREFIX}Ability 2"}
+
+    damages = [p.damage for p in entity.agent_tables.offensive]
+    assert damages == sorted(damages, reverse=True)
+
+
+def test_agent_tables_not_shared_by_copies():
+    import copy
+
+    entity = _get_intelligent_agent(abilities=[f"{TEST_PREFIX}Ability 1"])
+    entity.agent_tables
+
+    copied = copy.deepcopy(entity)
+    copied.ability_controller.learn(f"{TEST_PREFIX}Ability 2")
+
+    assert copied._agent_tables is not entity._agent_tables
+    assert len(copied.agent_tables.abilities) == 2
+    assert len(entity.agent_tables.abilities) == 1
+
+
+def test_in_danger():
+    import copy
+
+    entity = _get_intelligent_agent()
+    primary_resource = entity.resource_controller.primary_resource
+    assert not entity.in_danger
+
+    primary_resource.adjust(-0.9)
+    assert entity.in_danger
+
+    # A copy watches its own resource rather than the original's
+    copied = copy.deepcopy(entity)
+    copied.resource_controller.primary_resource.adjust(1.0)
+    assert not copied.in_danger
+    assert entity.in_danger
+
+    primary_resource.adjust(1.0)
+    assert not entity.in_danger
+
+
+@pytest.mark.parametrize("item_id, result", is_restorative_items_cases)
+def test_restored_resources(item_id: int, result: bool):
+    entity = _get_intelligent_agent()
+    inst = from_cache("managers.ItemManager").get_ref(item_id)
+
+    assert (EXPECTED_PRIMARY_RESOURCE in
+            entity.agent_tables.restored_resources(inst)) == result
@@ -0,0 +1,55 @@
+import pytest
+
+from game.cache import from_cache
+from game.systems.combat.combat_engine.battle_state import BattleState
+
+
+def _battle() -> tuple[BattleState, list, list]:
+    entity_manager = from_cache("managers.EntityManager")
+    allies = [entity_manager[e_id] for e_id in (-110, -111)]
+    enemies = [entity_manager[e_id] for e_id in (-112, -113)]
+    return BattleState(allies, enemies), allies, enemies
+
+
+def test_slots():
+    state, allies, enemies = _battle()
+
+    assert len(state) == 4
+    assert state.slot_of(enemies[0]) == 2
+    assert state.side_of(allies[1]) == BattleState.ALLY
+    assert state.side_of(enemies[1]) == BattleState.ENEMY
+    assert state.living(BattleState.ALLY) == allies
+    assert state.living(BattleState.ENEMY) == enemies
+
+    outsider = from_cache("managers.EntityManager")[-110]
+    assert outsider not in state
+    with pytest.raises(ValueError):
+        state.slot_of(outsider)
+
+    with pytest.raises(ValueError):
+        BattleState(allies, [allies[0]])
+
+
+def test_mirrors_primary_resource():
+    state, allies, enemies = _battle()
+    health = enemies[0].resource_controller.primary_resource
+
+    health.adjust(-1)
+    assert state.health_of(enemies[0]) == health.value
+
+    health.value = 0
+    assert not state.is_alive(enemies[0])
+    assert state.living(BattleState.ENEMY) == [enemies[1]]
+
+    # The returned list is a copy
+    state.living(BattleState.ENEMY).clear()
+    assert state.living(BattleState.ENEMY) == [enemies[1]]
+
+    health.value = 1
+    assert state.is_alive(enemies[0])
+    assert state.living(BattleState.ENEMY) == enemies
+
+    # A released state stops listening
+    state.release()
+    health.value = 0
+    assert state.is_alive(enemies[0])
@@ -70,22 +70,21 @@ def test_duplicate_combats():
         engine2 = get_generic_combat_instance()
 
 
-def test_compute_turn_order():
+def test_turn_order():
     """
     Test that CombatEngine correctly determines turn order in a trivial case
     """
     delete_element("combat")
 
     engine = get_generic_combat_instance()
-    engine._compute_turn_order()
 
-    logger.debug([ce.name for ce in engine._turn_order])
+    logger.debug([ce.name for ce in engine.turn_order])
 
-    assert engine._turn_order[0].name == f"{TEST_PREFIX}Enemy 2"
-    assert engine._turn_order[1].name == f"{TEST_PREFIX}Enemy 1"
-    assert engine._turn_order[2].name == f"{TEST_PREFIX}Ally 2"
-    assert engine._turn_order[3].name == f"{TEST_PREFIX}Ally 1"
-    assert engine._turn_order[4].name == "Player"
+    assert engine.turn_order[0].name == f"{TEST_PREFIX}Enemy 2"
+    assert engine.turn_order[1].name == f"{TEST_PREFIX}Enemy 1"
+    assert engine.turn_order[2].name == f"{TEST_PREFIX}Ally 2"
+    assert engine.turn_order[3].name == f"{TEST_PREFIX}Ally 1"
+    assert engine.turn_order[4].name == "Player"
 
 
 def test_active_entity():
@@ -95,14 +94,39 @@ def test_active_entity():
     delete_element("combat")
 
     engine = get_generic_combat_instance()
+    expected = engine.turn_order
+
     engine.set_state(engine.States.START_TURN_CYCLE)  # Skip to state
     engine.input("")  # Run State
-    engine.input("")  # Run the following state (START_ENTITY_TURN) to set up engine logic
 
-    for i in range(len(engine._turn_order)):
-        assert engine.active_entity.name == engine._turn_order[
-            engine.current_turn].name  # Active entity should be the fastest entity
-        engine.current_turn += 1
+    for entity in expected:
+        engine.set_state(engine.States.START_ENTITY_TURN)
+        engine.input("")  # Take the next turn
+        assert engine.active_entity is entity
+
+    # Every entity has acted, so the next turn starts a new cycle
+    engine.set_state(engine.States.START_ENTITY_TURN)
+    engine.input("")
+    assert engine.active_entity is None
+    assert engine.current_state == engine.States.START_TURN_CYCLE
+
+
+def test_set_turn_speed():
+    """
+    Test that changing an entity's turn_speed mid-combat reorders its pending
+    turn
+    """
+    delete_element("combat")
+
+    engine = get_generic_combat_instance()
+    player = from_cache("player")
+    turn_speed = player.turn_speed
+
+    try:
+        engine.set_turn_speed(player, 4.5)
+        assert engine.turn_order[1] is player
+    finally:
+        player.turn_speed = turn_speed
 
 
 def test_phase_handle_triggers():
@@ -126,8 +150,13 @@ def test_phase_handle_triggers():
         engine.PHASE_HANDLERS[phase].append(DebugHandler)
 
     # Call the HANDLE_PHASE state logic by hand
-    with pytest.raises(RuntimeError):
-        engine.state_data[engine.States.HANDLE_PHASE.value]['logic']("")
+    try:
+        with pytest.raises(RuntimeError):
+            engine.state_data[engine.States.HANDLE_PHASE.value]['logic']("")
+    finally:
+        # PHASE_HANDLERS is shared by all engines
+        for phase in engine.PHASE_HANDLERS:
+            engine.PHASE_HANDLERS[phase].remove(DebugHandler)
 
 
 def test_get_relative_enemies():
@@ -238,3 +267,88 @@ def test_get_target_group(source_entity_type, ability, valid_group):
 
     # Check that all expected entities are in the returned group
     assert all([(ent in resulting_group) for ent in expected_group])
+
+
+def test_termination_counters():
+    """
+    Test that the default termination conditions track their groups incrementally and request termination checks
+    only when they become met.
+    """
+    delete_element("combat")
+
+    engine = get_generic_combat_instance()
+    try:
+        loss, win = engine._termination_conditions
+        assert not win.is_conditions_met()
+        assert not loss.is_conditions_met()
+
+        engine._termination_check_pending = False
+        first, second = engine._enemies
+
+        # Killing one of two enemies does not meet the win condition
+        first.resource_controller.primary_resource.value = 0
+        assert not win.is_conditions_met()
+        assert not engine._termination_check_pending
+
+        second.resource_controller.primary_resource.value = 0
+        assert win.is_conditions_met()
+        assert engine._termination_check_pending
+
+        # Reviving an enemy un-meets the condition
+        first.resource_controller.primary_resource.value = 1
+        assert not win.is_conditions_met()
+
+    finally:
+        engine.state_data[engine.States.TERMINATE.value]['logic'](None)
+
+    # Terminating the combat unsubscribes the conditions from the player
+    listeners = from_cache("player").resource_controller.primary_resource._listeners
+    assert not any(callback.func.__self__ in (loss, win) for callback in listeners)
+
+
+def test_battle_state_released():
+    """
+    Test that the engine's BattleState tracks deaths and stops listening to the participants when combat ends.
+    """
+    delete_element("combat")
+
+    engine = get_generic_combat_instance()
+    try:
+        first, second = engine._enemies
+        first.resource_controller.primary_resource.value = 0
+
+        assert engine.is_dead(first)
+        assert engine.enemies == [second]
+        assert engine.get_relative_enemies(engine._player_ref) == [second]
+
+    finally:
+        engine.state_data[engine.States.TERMINATE.value]['logic'](None)
+
+    listeners = from_cache("player").resource_controller.primary_resource._listeners
+    assert not any(callback.func.__self__ is engine.battle_state for callback in listeners)
+
+
+def test_silent_advance_logs_no_warning():
+    """
+    Test that advancing a combat through its silent states, which revisits the same states once per phase, does not
+    log any warnings.
+    """
+    import game
+
+    delete_element("combat")
+
+    controller = game.state_device_controller
+    controller.state_device_stack.clear()
+    engine = get_generic_combat_instance()
+    controller.add_state_device(engine)
+
+    warnings = []
+    sink = logger.add(warnings.append, level="WARNING")
+    try:
+        controller.get_current_frame()
+    finally:
+        logger.remove(sink)
+        engine.state_data[engine.States.TERMINATE.value]['logic'](None)
+
+    assert controller.advance_stats[-1].steps > 0
+    assert warnings == []
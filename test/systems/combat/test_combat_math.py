@@ -3,7 +3,8 @@ import pytest
 from game.structures.enums import TargetMode
 from game.systems.combat import Ability
 from game.systems.combat.combat_engine.combat_helpers import \
-    calculate_target_resistance, calculate_damage_to_entity
+    calculate_target_resistance, calculate_damage_to_entity, \
+    calculate_damage_to_entities
 from game.systems.entity.entities import CombatEntity
 from game.systems.item.item import Equipment
 from game.systems.inventory import EquipmentController
@@ -207,3 +208,51 @@ def test_dmg_to_multi_armor_multi_res():
                 assert ce_inst.equipment_controller.total_dmg_resistance == 7
 
                 assert calculate_damage_to_entity(ab_inst, ce_inst) == 2
+
+
+def test_dmg_to_entities_matches_scalar():
+    """
+    Test that batched damage matches calculate_damage_to_entity for targets
+    with differing loadouts, including disabled slots.
+    """
+    with temporary_item([
+        Equipment("head", -256, "", "", "head", 0, 3,
+                  tags={"a": 0.3, "b": 0.15}),
+        Equipment("chest", -257, "", "", "chest", 0, 4,
+                  tags={"a": 0.1})
+    ]):
+        with temporary_ability([
+            Ability(name="temp_ab", description="", on_use="",
+                    target_mode=TargetMode.ALL_ENEMY, damage=25,
+                    tags={"a": None, "b": None})
+        ]) as ability_manager:
+            with temporary_entity([
+                CombatEntity(id=-256, name="bare"),
+                CombatEntity(id=-257, name="helmed",
+                             equipment_controller=EquipmentController(
+                                 equipment=[-256])),
+                CombatEntity(id=-258, name="armored",
+                             equipment_controller=EquipmentController(
+                                 equipment=[-256, -257]))
+            ]) as entity_manager:
+                ab_inst = ability_manager.get_ref("temp_ab")
+                targets = [entity_manager.get_instance(i)
+                           for i in [-256, -257, -258, -258, -257]]
+                targets[3].equipment_controller["chest"] = False
+
+                expected = [calculate_damage_to_entity(ab_inst, t)
+                            for t in targets]
+
+                assert calculate_damage_to_entities(ab_inst, targets) == \
+                       expected
+                assert len(set(expected)) > 1
+
+
+def test_dmg_to_entities_type_checks():
+    with temporary_ability([
+        Ability(name="temp_ab", description="", on_use="",
+                target_mode=TargetMode.ALL_ENEMY, damage=1)
+    ]) as ability_manager:
+        with pytest.raises(TypeError):
+            calculate_damage_to_entities(ability_manager.get_ref("temp_ab"),
+                                         [None])
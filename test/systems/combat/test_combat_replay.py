@@ -0,0 +1,154 @@
+import dataclasses
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from game.cache import delete_element, from_cache
+from game.structures.errors import CombatError
+from game.systems.combat.combat_engine.combat_engine import CombatEngine
+from game.systems.combat.combat_engine.replay import CombatReplay, \
+    fingerprint_entity
+from game.systems.combat.combat_engine.simulator import CombatSimulator, \
+    HeadlessStateController
+from game.systems.entity.prototype import EntityPrototype
+from game.systems.event.events import TextEvent
+from game.util.rng import RandomService, rng
+
+
+def test_random_service_seeded():
+    a = RandomService(7)
+    b = RandomService(7)
+
+    assert a.current_seed == 7
+    assert [a.randint(0, 100) for _ in range(10)] == \
+           [b.randint(0, 100) for _ in range(10)]
+    assert a.spawn_seed() == b.spawn_seed()
+
+    with pytest.raises(TypeError):
+        a.seed("7")
+
+
+def test_random_service_unseeded():
+    assert type(RandomService().current_seed) is int
+
+
+def test_replay_json():
+    replay = CombatReplay(5, [-110], [-112, -113], [1, "", 2])
+
+    assert "digest" not in replay.to_json()
+    assert CombatReplay.from_json(replay.to_json()) == replay
+
+    with pytest.raises(ValueError):
+        CombatReplay.from_json({"seed": 5})
+
+
+def test_simulated_fight_replays_exactly():
+    delete_element("combat")
+
+    # Naive agents choose their moves at random
+    simulator = CombatSimulator([-110, -111], [-112, -113], naive=True)
+    result = simulator.run_fight()
+
+    assert result.replay.headless
+    assert result.replay.digest is not None
+
+    # Disturb the session RNG before replaying
+    rng.seed(result.replay.seed + 1)
+    rng.random()
+
+    replayed = simulator.replay(
+        CombatReplay.from_json(result.replay.to_json()))
+
+    assert replayed.replay.digest == result.replay.digest
+    assert replayed.outcome == result.outcome
+    assert replayed.turn_cycles == result.turn_cycles
+    assert replayed.damage_dealt == result.damage_dealt
+    assert replayed.damage_taken == result.damage_taken
+
+
+def test_replay_rejects_changed_player():
+    delete_element("combat")
+    simulator = CombatSimulator([-110, -111], [-112, -113], naive=True)
+    replay = simulator.run_fight().replay
+
+    assert replay.player_fingerprint == \
+           CombatReplay.from_json(replay.to_json()).player_fingerprint
+
+    player = EntityPrototype(from_cache("player")).spawn()
+    before = fingerprint_entity(player)
+    player.resource_controller.primary_resource.adjust(-1)
+    assert fingerprint_entity(player) != before
+
+    # A replay recorded with a player in a different state
+    changed = dataclasses.replace(
+        replay, player_fingerprint=fingerprint_entity(player))
+    with pytest.raises(CombatError):
+        simulator.replay(changed)
+
+    assert from_cache("combat") is None
+
+
+def test_fights_are_seeded_from_session_rng():
+    delete_element("combat")
+    simulator = CombatSimulator([-110], [-112], naive=True)
+
+    rng.seed(3)
+    first = [simulator.run_fight().replay.seed for _ in range(2)]
+    after = rng.random()
+
+    rng.seed(3)
+    second = [simulator.run_fight().replay.seed for _ in range(2)]
+
+    # Each fight gets its own seed, and a seeded session reproduces them
+    assert first[0] != first[1]
+    assert first == second
+    assert rng.random() == after
+
+
+def test_inputs_recorded_during_combat():
+    delete_element("combat")
+    controller = HeadlessStateController(suppress_text=False)
+    controller.add_state_device(TextEvent("Recorded"))
+
+    engine = CombatEngine([-110], [-112], seed=11)
+    try:
+        assert controller.deliver_input("")
+    finally:
+        delete_element("combat")
+
+    assert engine.replay_log.seed == 11
+    assert engine.replay_log.inputs == [""]
+
+
+# Runs seeded fights in a fresh interpreter and prints their digests
+_DIGEST_SCRIPT = """
+import sys
+sys.path[:0] = ["src", "test"]
+from loguru import logger
+logger.remove()
+from game import engine, state_device_controller
+import systems
+from game.util.rng import rng
+from game.systems.combat.combat_engine.simulator import CombatSimulator
+rng.seed(1234)
+for naive in (True, False):
+    simulator = CombatSimulator([-110, -111], [-112, -113], naive=naive)
+    print([simulator.run_fight().replay.digest for _ in range(3)])
+"""
+
+
+def test_digests_independent_of_hash_seed():
+    root = pathlib.Path(__file__).parents[3]
+
+    def run(hash_seed: str) -> str:
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        return subprocess.run([sys.executable, "-c", _DIGEST_SCRIPT], cwd=root,
+                              env=env, capture_output=True, text=True,
+                              check=True).stdout
+
+    first = run("1")
+    assert first.count("[") == 2
+    assert run("2") == first
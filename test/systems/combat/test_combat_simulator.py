@@ -0,0 +1,190 @@
+import pytest
+
+import game
+from game.cache import cache_element, delete_element, from_cache, get_cache, \
+    get_config
+from game.game_state_controller import SilentStateBudgetExceeded
+from game.structures.errors import CombatError
+from game.systems.combat.combat_engine.combat_engine import CombatEngine
+from game.systems.combat.combat_engine.simulator import CombatSimulator, \
+    HeadlessStateController, Outcome, SimulationReport, FightResult, \
+    auto_resolve, _release
+from game.systems.entity.prototype import EntityPrototype
+from game.systems.event.events import TextEvent, CombatEvent
+from game.systems.item.loot import LootTable
+
+from ..utils import temporary_entity
+
+
+def get_simulator(**kwargs) -> CombatSimulator:
+    return CombatSimulator([-110, -111], [-112, -113], naive=False, **kwargs)
+
+
+def test_run_serial():
+    delete_element("combat")
+    player = from_cache("player")
+    controller = game.state_device_controller
+
+    report = get_simulator().run_serial(3)
+
+    assert report.fights == 3
+    assert len(report.turn_cycles) == 3
+    assert all(cycles > 0 for cycles in report.turn_cycles)
+    assert sum(report.damage_dealt) > 0
+
+    # Global state is restored after simulating
+    assert from_cache("combat") is None
+    assert from_cache("player") is player
+    assert game.state_device_controller is controller
+
+
+def test_timeout():
+    delete_element("combat")
+
+    # Neither side knows any abilities, so nobody can win
+    report = CombatSimulator([], [-109], player_id=-109,
+                             max_turn_cycles=3).run_serial(1)
+
+    assert report.timeouts == 1
+    assert report.win_rate == 0.0
+    assert report.turn_cycles == [4]
+
+
+def test_run_process_pool():
+    delete_element("combat")
+
+    report = get_simulator().run(4, workers=2)
+
+    assert report.fights == 4
+
+
+def test_active_combat_rejected():
+    delete_element("combat")
+    simulator = get_simulator()
+
+    cache_element("combat", object())
+    try:
+        with pytest.raises(CombatError):
+            simulator.run_serial(1)
+    finally:
+        delete_element("combat")
+
+
+def test_headless_controller_discards_text():
+    controller = HeadlessStateController()
+    controller.add_state_device(TextEvent("Discarded"))
+
+    assert len(controller.state_device_stack) == 0
+
+
+def test_headless_run_bounds_silent_states():
+    delete_element("combat")
+    previous_controller = game.state_device_controller
+    controller = HeadlessStateController(max_silent_steps=100)
+    game.state_device_controller = controller
+
+    # The engine never leaves NEXT_PHASE, so no turn cycle ever ends
+    engine = CombatEngine([-110, -111], [-112, -113])
+    engine.state_data[engine.States.NEXT_PHASE.value]['logic'] = lambda _: None
+
+    try:
+        with pytest.raises(SilentStateBudgetExceeded):
+            controller.run(engine, max_turn_cycles=10)
+    finally:
+        _release(engine)
+        game.state_device_controller = previous_controller
+
+    assert controller.advance_stats[-1].steps == 100
+
+
+def test_report_merge():
+    a = SimulationReport()
+    a.add(FightResult(Outcome.WIN, 2, 10, 5))
+    b = SimulationReport()
+    b.add(FightResult(Outcome.LOSS, 4, 6, 20))
+    a.merge(b)
+
+    assert a.fights == 2
+    assert a.win_rate == 0.5
+    assert a.summary()["turn_cycles"]["mean"] == 3
+
+
+@pytest.fixture
+def player_copy():
+    """
+    Stand in a copy of the player, since auto-resolved combats change it.
+    """
+    cache = get_cache()
+    player = cache["player"]
+    cache["player"] = EntityPrototype(player).spawn()
+    try:
+        yield cache["player"]
+    finally:
+        cache["player"] = player
+
+
+def test_auto_resolve(player_copy):
+    delete_element("combat")
+    controller = game.state_device_controller
+
+    engine = CombatEngine([-110, -111], [-112], auto_resolve=True)
+    result, transcript = auto_resolve(engine)
+
+    assert result.outcome in (Outcome.WIN, Outcome.LOSS)
+    assert len(transcript) > 0
+    assert from_cache("combat") is None
+    assert game.state_device_controller is controller
+
+    # The live player took part
+    assert engine._player_ref is player_copy
+
+
+def test_auto_resolve_full_inventory(player_copy):
+    from game.systems.entity.entities import CombatEntity
+
+    delete_element("combat")
+    enemy = CombatEntity(id=-257, name="Looted",
+                         loot_table_instance=LootTable(-1, {-110: 1.0}, {2: 1.0}))
+
+    # Fill every slot of the inventory with full stacks of another item
+    inventory = player_copy.inventory
+    while inventory.size > 0:
+        inventory.drop_stack(0)
+    for _ in range(inventory.capacity):
+        inventory.new_stack(-111, 3)
+
+    with temporary_entity([enemy]):
+        engine = CombatEngine([], [-257], auto_resolve=True)
+        engine._enemies[0].resource_controller.primary_resource.value = 0
+        result, transcript = auto_resolve(engine)
+
+    # Loot that doesn't fit is left behind rather than prompting the player
+    assert result.outcome == Outcome.WIN
+    assert -110 not in inventory
+    assert any("No room for" in entry for entry in transcript
+               if type(entry) is str)
+
+
+def test_auto_resolve_event(player_copy):
+    delete_element("combat")
+    previous_controller = game.state_device_controller
+    controller = HeadlessStateController(suppress_text=False)
+    game.state_device_controller = controller
+
+    try:
+        controller.add_state_device(
+            CombatEvent([-110, -111], [-112], auto_resolve=True))
+        controller._advance_if_silent()
+        summary = controller._get_state_device()
+
+    finally:
+        game.state_device_controller = previous_controller
+
+    # The whole combat collapses into a single frame
+    assert type(summary) is TextEvent
+    assert len(controller.state_device_stack) == 2
+    assert controller.state_device_stack[0][0].current_state == \
+           CombatEvent.States.TERMINATE
+    assert summary.text[0] in (get_config()["combat"]["victory_message"],
+                               get_config()["combat"]["loss_message"])
+    assert from_cache("combat") is None
@@ -0,0 +1,95 @@
+import copy
+
+import pytest
+
+from game.systems.combat.effect import EffectPool, ResourceEffect, CombatEffect
+from game.systems.entity.entities import CombatEntity
+
+from .. import TEST_PREFIX
+
+
+def _template(quantity: int = -5) -> ResourceEffect:
+    return ResourceEffect(f"{TEST_PREFIX}health", quantity, "{target} hurt",
+                          duration=3, on_remove="{target} recovered")
+
+
+def test_copy_preserves_template():
+    template = _template()
+    effect = copy.deepcopy(template)
+
+    assert effect is not template
+    assert effect.duration == 3
+    assert effect.on_remove == "{target} recovered"
+
+
+def test_acquire_copies_when_empty():
+    pool = EffectPool()
+    template = _template()
+
+    effect = pool.acquire(template)
+
+    assert effect is not template
+    assert pool.stats.created == 1
+    assert pool.stats.reused == 0
+
+
+def test_release_and_reuse():
+    pool = EffectPool()
+    entity = CombatEntity(id=-1, name="dummy")
+
+    effect = pool.acquire(_template(-5))
+    effect.assign(entity, entity)
+    effect.duration = 0
+    effect.set_state(effect.States.TERMINATE)
+
+    pool.release(effect)
+    assert len(pool) == 1
+    assert not effect.is_assigned()
+
+    template = _template(-7)
+    recycled = pool.acquire(template)
+
+    # The expired instance is reused and matches a fresh copy of the template
+    assert recycled is effect
+    assert len(pool) == 0
+    assert recycled._adjust_quantity == -7
+    assert recycled.duration == 3
+    assert recycled.on_remove == template.on_remove
+    assert recycled.current_state == recycled.States.DEFAULT
+    assert pool.stats.reused == 1
+    assert pool.stats.released == 1
+
+
+def test_max_size():
+    pool = EffectPool(max_size=1)
+
+    pool.release(_template())
+    pool.release(_template())
+
+    assert len(pool) == 1
+    assert pool.stats.released == 1
+    assert pool.stats.discarded == 1
+
+    with pytest.raises(ValueError):
+        EffectPool(max_size=-1)
+
+
+def test_unpoolable_discarded():
+    class Unpoolable(CombatEffect):
+        def _setup_states(self):
+            pass
+
+    pool = EffectPool()
+    pool.release(Unpoolable(default_input_type=None,
+                            states=CombatEffect.States))
+
+    assert len(pool) == 0
+    assert pool.stats.discarded == 1
+
+
+def test_reinitialize_type_mismatch():
+    class Other(ResourceEffect):
+        pass
+
+    with pytest.raises(TypeError):
+        _template().reinitialize(Other(f"{TEST_PREFIX}health", 1))
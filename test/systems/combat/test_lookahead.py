@@ -0,0 +1,170 @@
+import time
+
+import pytest
+
+from game.cache import delete_element, get_config
+from game.structures.enums import TargetMode
+from game.systems.combat.combat_engine.lookahead import AbilitySpec, \
+    CombatantSpec, CombatSnapshot, LookaheadPlanner, search
+from game.systems.combat.combat_engine.simulator import CombatSimulator
+from game.systems.entity.entities import CombatEntity
+
+from .. import TEST_PREFIX
+from ..utils import temporary_entity
+
+
+def _get_snapshot() -> CombatSnapshot:
+    """
+    A duel in which the hero can poke for 2, or spend all of its mana on a
+    strike for 6 that finishes the villain.
+    """
+    poke = AbilitySpec("poke", TargetMode.SINGLE_ENEMY, (2, 2), (), (), ())
+    strike = AbilitySpec("strike", TargetMode.SINGLE_ENEMY, (6, 6),
+                         (("mana", 3),), (("mana", 3),), ())
+    bite = AbilitySpec("bite", TargetMode.SINGLE_ENEMY, (3, 3), (), (), ())
+
+    return CombatSnapshot(
+        (
+            CombatantSpec("hero", 0, {"health": 10, "mana": 3},
+                          (poke, strike)),
+            CombatantSpec("villain", 1, {"health": 10, "mana": 0}, (bite,))
+        ),
+        [{"health": 10, "mana": 3}, {"health": 6, "mana": 0}],
+        [[], []],
+        (0, 1),
+        "health"
+    )
+
+
+def test_snapshot_copy_is_independent():
+    snapshot = _get_snapshot()
+    copied = snapshot.copy()
+
+    copied.apply(0, (1, (1,)))
+
+    assert copied.values[1]["health"] == 0
+    assert copied.values[0]["mana"] == 0
+    assert snapshot.values[1]["health"] == 6
+    assert snapshot.values[0]["mana"] == 3
+    assert copied.outcome() == 1 and snapshot.outcome() == 0
+
+
+def test_legal_actions_respect_requirements():
+    snapshot = _get_snapshot()
+    assert (1, (1,)) in snapshot.legal_actions(0)
+
+    snapshot.values[0]["mana"] = 2
+    assert snapshot.legal_actions(0) == [None, (0, (1,))]
+
+
+def test_effects_expire():
+    snapshot = _get_snapshot()
+    snapshot.effects[1].append(["health", -2, 2])
+
+    snapshot.start_turn(1)
+    snapshot.start_turn(1)
+    snapshot.start_turn(1)
+
+    assert snapshot.values[1]["health"] == 2
+    assert snapshot.effects[1] == []
+
+
+def test_search_finds_finishing_blow():
+    results = search(_get_snapshot(), depth=4, time_budget=1.0,
+                     max_rollouts=200, seed=1)
+
+    best = max(results, key=lambda a: results[a][1] / results[a][0])
+    assert best == (1, (1,))
+    assert sum(count for count, _ in results.values()) == 200
+
+
+def test_planner_respects_time_budget():
+    planner = LookaheadPlanner(time_budget=0.01, max_rollouts=10 ** 9, seed=1)
+
+    start = time.perf_counter()
+    assert planner.plan(_get_snapshot()) == (1, (1,))
+    assert time.perf_counter() - start < 0.5
+
+
+def test_lookahead_agent_in_combat():
+    delete_element("combat")
+    agent = CombatEntity(id=-256, name="Lookahead", naive=False,
+                         lookahead=True,
+                         abilities=[f"{TEST_PREFIX}Ability 1",
+                                    f"{TEST_PREFIX}Ability 4"])
+
+    with temporary_entity([agent]):
+        report = CombatSimulator([], [-112], player_id=-256,
+                                 max_turn_cycles=5).run_serial(1)
+
+    # The agent attacks on every one of its turns
+    assert report.losses == 0
+    assert report.damage_dealt[0] >= 5
+
+
+def test_planner_repeats_recorded_rollouts():
+    results = search(_get_snapshot(), depth=4, time_budget=None,
+                     max_rollouts=300, seed=1)
+    assert sum(count for count, _ in results.values()) == 300
+
+    planner = LookaheadPlanner(time_budget=0.01, max_rollouts=10 ** 9, seed=1)
+    action = planner.plan(_get_snapshot())
+    assert len(planner.last_rollouts) == 1
+
+    # A budget that would stop the search after a single rollout is ignored
+    # when the recorded counts are repeated
+    repeat = LookaheadPlanner(time_budget=10 ** -9, seed=1)
+    assert repeat.plan(_get_snapshot(), planner.last_rollouts) == action
+    assert repeat.last_rollouts == planner.last_rollouts
+
+    with pytest.raises(ValueError):
+        repeat.plan(_get_snapshot(), [1, 1])
+
+
+def test_lookahead_fight_replays_exactly():
+    delete_element("combat")
+    agent = CombatEntity(id=-256, name="Lookahead", naive=False,
+                         lookahead=True,
+                         abilities=[f"{TEST_PREFIX}Ability 1",
+                                    f"{TEST_PREFIX}Ability 4"])
+
+    with temporary_entity([agent]):
+        simulator = CombatSimulator([], [-112, -113], player_id=-256,
+                                    max_turn_cycles=5)
+
+        for _ in range(3):
+            result = simulator.run_fight()
+
+            # The replay repeats the recorded rollouts even on a machine too
+            # slow to make more than one within the time budget
+            settings = get_config()["combat"]["lookahead"]
+            time_budget = settings["time_budget"]
+            settings["time_budget"] = 10 ** -9
+            try:
+                replayed = simulator.replay(result.replay)
+            finally:
+                settings["time_budget"] = time_budget
+
+            # Every lookahead decision was recorded and repeated
+            assert len(result.replay.rollouts) > 0
+            assert replayed.replay.rollouts == result.replay.rollouts
+            assert replayed.replay.digest == result.replay.digest
+            assert replayed.damage_dealt == result.damage_dealt
+
+
+def test_lookahead_takes_precedence_over_naive():
+    agent = CombatEntity(id=-256, name="Lookahead", lookahead=True)
+    agent.lookahead_choice_logic = lambda: "lookahead"
+
+    # naive defaults to True
+    assert agent.naive
+    assert agent._choice_logic() == "lookahead"
+
+
+def test_executor_shutdown():
+    planner = LookaheadPlanner(workers=2, max_rollouts=20, seed=1)
+    assert planner.plan(_get_snapshot()) is not None
+    assert LookaheadPlanner._executor is not None
+
+    LookaheadPlanner.shutdown_executor()
+    assert LookaheadPlanner._executor is None
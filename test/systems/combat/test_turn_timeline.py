@@ -0,0 +1,75 @@
+import pytest
+
+from game.systems.combat.combat_engine.turn_timeline import TurnTimeline
+from game.systems.entity.entities import CombatEntity
+
+
+def _entities(*speeds) -> list[CombatEntity]:
+    return [CombatEntity(id=-1, name=f"e{i}", turn_speed=speed)
+            for i, speed in enumerate(speeds)]
+
+
+def _cycle(timeline: TurnTimeline, cycle: int) -> list[str]:
+    names = []
+    while (entity := timeline.pop(cycle)) is not None:
+        names.append(entity.name)
+
+    return names
+
+
+def test_cycle_order():
+    timeline = TurnTimeline(_entities(1, 3, 2, 3))
+
+    # Descending speed, ties broken by join order
+    assert _cycle(timeline, 1) == ["e1", "e3", "e2", "e0"]
+    assert _cycle(timeline, 2) == ["e1", "e3", "e2", "e0"]
+    assert timeline.pop(2) is None
+
+
+def test_fractional_speed():
+    timeline = TurnTimeline(_entities(1.5, 1.25, 2))
+
+    assert [e.name for e in timeline.order()] == ["e2", "e0", "e1"]
+
+
+def test_remove():
+    entities = _entities(1, 2, 3)
+    timeline = TurnTimeline(entities)
+
+    timeline.pop(1)
+    timeline.remove(entities[1])
+    timeline.remove(entities[1])  # Removing twice does nothing
+
+    assert entities[1] not in timeline
+    assert len(timeline) == 2
+    assert _cycle(timeline, 1) == ["e0"]
+    assert _cycle(timeline, 2) == ["e2", "e0"]
+
+
+def test_update_speed():
+    entities = _entities(1, 2, 3)
+    timeline = TurnTimeline(entities)
+
+    assert timeline.pop(1) is entities[2]
+
+    # A speed change reorders the pending turn within the current cycle
+    entities[0].turn_speed = 5
+    timeline.update_speed(entities[0])
+    assert _cycle(timeline, 1) == ["e0", "e1"]
+
+    # The entity that already acted keeps its place in the next cycle
+    entities[2].turn_speed = 0.5
+    timeline.update_speed(entities[2])
+    assert _cycle(timeline, 2) == ["e0", "e1", "e2"]
+
+    timeline.remove(entities[2])
+    with pytest.raises(ValueError):
+        timeline.update_speed(entities[2])
+
+
+def test_add_duplicate():
+    entities = _entities(1)
+    timeline = TurnTimeline(entities)
+
+    with pytest.raises(ValueError):
+        timeline.add(entities[0])
@@ -84,3 +84,23 @@ def test_max_crafts(recipe_id: int, inventory_contents: list[tuple[int, int]], r
                )
 
     assert p.crafting_controller.get_max_crafts(recipe_id) == results
+
+
+def test_perform_recipe():
+    p = Player(name="Crafty Boy",
+               id=1,
+               inventory=InventoryController(
+                   items=[(-110, 7), (-111, 9), (-112, 3)]
+               ),
+               recipes=[-114]
+               )
+
+    p.crafting_controller.perform_recipe(-114, 3)
+
+    assert p.inventory.total_quantity(-110) == 1
+    assert p.inventory.total_quantity(-111) == 0
+    assert p.inventory.total_quantity(-112) == 0
+    assert p.inventory.total_quantity(-113) == 6
+
+    with pytest.raises(ValueError):
+        p.crafting_controller.perform_recipe(-114, 1)
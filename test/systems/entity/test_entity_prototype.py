@@ -0,0 +1,95 @@
+from game.structures.enums import CombatPhase
+from game.systems.combat.effect import ResourceEffect
+from game.systems.entity.entities import CombatEntity
+from game.systems.entity.prototype import EntityPrototype
+from game.systems.item.loot import LootTable
+
+from ..utils import temporary_entity
+
+
+def test_spawn_is_independent():
+    ce = CombatEntity(name="_tr_Prototype", id=-150, abilities=["_tr_Ability 1"])
+    ce.inventory.new_stack(-110, 2)
+
+    prototype = EntityPrototype(ce)
+    first = prototype.spawn()
+    second = prototype.spawn()
+
+    assert first is not ce and second is not first
+    assert type(first) is CombatEntity
+    assert first.name == ce.name and first.id == ce.id
+
+    # Resources
+    first.resource_controller["_tr_health"].adjust(-5)
+    assert second.resource_controller["_tr_health"].value == \
+           ce.resource_controller["_tr_health"].value
+
+    # Inventory
+    first.inventory.consume_item(-110, 1)
+    assert second.inventory.total_quantity(-110) == 2
+    assert ce.inventory.total_quantity(-110) == 2
+
+    # Abilities
+    first.ability_controller.abilities.add("_tr_Ability 2")
+    assert "_tr_Ability 2" not in second.ability_controller.abilities
+    assert "_tr_Ability 2" not in ce.ability_controller.abilities
+
+    # Effects
+    first.acquire_effect(ResourceEffect("_tr_health", 1), CombatPhase.START_PHASE)
+    assert len(second.active_effects[CombatPhase.START_PHASE]) == 0
+    assert len(ce.active_effects[CombatPhase.START_PHASE]) == 0
+
+    # Equipment
+    assert first.equipment_controller._slots is not \
+           second.equipment_controller._slots
+
+
+def test_spawn_rebinds_owners():
+    ce = CombatEntity(name="_tr_Prototype", id=-150)
+
+    spawned = EntityPrototype(ce).spawn()
+
+    assert spawned.ability_controller.owner is spawned
+    assert spawned.equipment_controller.owner is spawned
+
+
+def test_spawn_shares_loot_table():
+    lt = LootTable(-1, {-110: 1.0}, {1: 1.0})
+    ce = CombatEntity(name="_tr_Prototype", id=-150, loot_table_instance=lt)
+
+    spawned = EntityPrototype(ce).spawn()
+
+    assert spawned.loot_table is lt
+
+
+def test_get_instance_recompiles_replaced_entity():
+    ce = CombatEntity(name="_tr_Prototype", id=-150)
+
+    with temporary_entity([ce]) as manager:
+        assert manager.get_instance(-150).name == "_tr_Prototype"
+
+        replacement = CombatEntity(name="_tr_Replacement", id=-150)
+        manager._manifest[-150] = replacement
+
+        assert manager.get_instance(-150).name == "_tr_Replacement"
+        manager._manifest[-150] = ce
+
+
+def test_spawn_reflects_template_changes():
+    ce = CombatEntity(name="_tr_Prototype", id=-150)
+
+    with temporary_entity([ce]) as manager:
+        manager.get_instance(-150)
+
+        ce.name = "_tr_Renamed"
+        ce.turn_speed = 7
+        assert manager.get_instance(-150).name == "_tr_Renamed"
+        assert manager.get_instance(-150).turn_speed == 7
+
+        # New attributes require the plan to be rebuilt
+        ce.extra = [1]
+        assert not hasattr(manager.get_instance(-150), "extra")
+
+        manager.invalidate_prototype(-150)
+        spawned = manager.get_instance(-150)
+        assert spawned.extra == [1] and spawned.extra is not ce.extra
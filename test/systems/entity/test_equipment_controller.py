@@ -1,3 +1,5 @@
+import pytest
+
 from game.cache import from_cache
 from game.systems.entity.entities import CombatEntity
 from game.systems.item.item import Equipment
@@ -44,3 +46,56 @@ def test_total_dmg_res():
 
     assert ce.equipment_controller.total_dmg_resistance == res
     assert ce.equipment_controller.total_dmg_buff == dmg
+
+
+def test_aggregates_follow_slot_changes():
+    from ..utils import temporary_item
+
+    with temporary_item([
+        Equipment("helm", -256, "", "", "head", 1, 2, tags={"a": 0.2}),
+        Equipment("hat", -257, "", "", "head", 0, 7, tags={"a": 0.5, "b": 0.1}),
+        Equipment("mail", -258, "", "", "chest", 4, 3, tags={"a": 0.1})
+    ]):
+        ce = _get_test_entity([-256, -258])
+        ec = ce.equipment_controller
+
+        assert ec.total_dmg_resistance == 5
+        assert ec.total_dmg_buff == 5
+        assert sorted(ec.all_tag_resistance["a"]) == [0.1, 0.2]
+        assert ec.sum_tag_resistance["a"] == pytest.approx(0.2 * 1.1)
+
+        # Swapping an item replaces its contribution
+        ec.equip(-257)
+        assert ec.total_dmg_resistance == 10
+        assert ec.total_dmg_buff == 4
+        assert ec.all_tag_resistance["b"] == [0.1]
+
+        # Disabled slots do not contribute
+        ec["head"] = False
+        assert ec.total_dmg_resistance == 3
+        assert "b" not in ec.all_tag_resistance
+        assert "b" not in ec.sum_tag_resistance
+
+        ec["head"] = True
+        assert ec.total_dmg_resistance == 10
+
+        ec.unequip("chest")
+        assert ec.total_dmg_resistance == 7
+        assert ec.all_tag_resistance["a"] == [0.5]
+
+        # Slots are exposed as copies, so they can't bypass the aggregates
+        ec["head"].item_id = None
+        assert ec["head"].item_id == -257
+        assert ec.total_dmg_resistance == 7
+
+
+def test_aggregates_copied_independently():
+    import copy
+
+    ce = _get_test_entity([-114, -115])
+    copied = copy.deepcopy(ce)
+
+    copied.equipment_controller.unequip("chest")
+
+    assert ce.equipment_controller.total_dmg_resistance == 8
+    assert copied.equipment_controller.total_dmg_resistance == 3
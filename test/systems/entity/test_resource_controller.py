@@ -1,3 +1,7 @@
+import copy
+
+import pytest
+
 from game.cache import from_cache
 from game.systems.entity import Resource
 from game.systems.entity.entities import CombatEntity
@@ -19,3 +23,122 @@ def test_entity_get_item():
             if entity.name.startswith(TEST_PREFIX):
                 for resource in from_cache("managers.ResourceManager")._manifest:
                     assert type(entity.resource_controller[resource]) == Resource
+
+
+def test_resource_subscribe():
+    resource = Resource(f"{TEST_PREFIX}resource", 10, "A test resource")
+    changes = []
+
+    def callback(r: Resource):
+        changes.append((r.value, r.max))
+
+    resource.subscribe(callback)
+    resource.adjust(-3)
+    resource.adjust(0)  # No change, no notification
+    resource.max = 20
+
+    assert changes == [(7, 10), (7, 20)]
+
+    # Copies do not inherit listeners
+    copy.deepcopy(resource).adjust(-1)
+    assert len(changes) == 2
+
+    resource.unsubscribe(callback)
+    resource.adjust(-1)
+    assert len(changes) == 2
+
+
+def test_shared_schema():
+    first = CombatEntity(id=-1, name="first").resource_controller
+    second = CombatEntity(id=-1, name="second").resource_controller
+
+    assert first.schema is second.schema
+    assert first.schema is copy.deepcopy(first).schema
+    assert first.names == tuple(from_cache("managers.ResourceManager")._manifest)
+
+
+def test_views():
+    controller = CombatEntity(id=-1, name="dummy").resource_controller
+    name = f"{TEST_PREFIX}health"
+    resource = controller[name]
+
+    # The same view is returned every time, and writes through to the controller
+    assert controller[name] is resource
+    resource.adjust(-5)
+    assert controller.get_value(name) == resource.value == resource.max - 5
+
+    # Copies are independent of the controller
+    resource_copy = copy.deepcopy(resource)
+    resource_copy.adjust(-1)
+    assert resource.value == resource.max - 5
+
+    controller_copy = copy.deepcopy(controller)
+    controller_copy[name].adjust(-1)
+    assert resource.value == resource.max - 5
+    assert controller_copy[name] is not resource
+
+    # Overloading a resource copies its state into the controller
+    controller.set_instance(Resource(name, 90, "Overloaded", value=80))
+    assert controller[name] is resource
+    assert (resource.value, resource.max, resource.base_max) == (80, 90, 90)
+
+
+def test_bulk_adjust():
+    controller = CombatEntity(id=-1, name="dummy").resource_controller
+    health, mana = f"{TEST_PREFIX}health", f"{TEST_PREFIX}mana"
+    changes = []
+    controller[health].subscribe(lambda r: changes.append(r.value))
+
+    controller.adjust_all(-10)
+    assert changes == [controller.get_max(health) - 10]
+    for name in controller.names:
+        assert controller.get_value(name) == max(0, controller.get_max(name) - 10)
+
+    controller.adjust_all(-1.0, [mana])
+    assert controller.get_value(mana) == 0
+    assert controller.get_value(health) == controller.get_max(health) - 10
+
+    controller.restore_all()
+    assert controller.fingerprint == tuple(
+        (name, controller.get_max(name), controller.get_max(name)) for name in controller.names)
+
+    # Unchanged resources do not notify
+    changes.clear()
+    controller.restore_all([health])
+    assert changes == []
+
+    with pytest.raises(TypeError):
+        controller.adjust_all("1")
+
+
+def test_watch_threshold():
+    controller = CombatEntity(id=-1, name="dummy").resource_controller
+    name = f"{TEST_PREFIX}health"
+    resource = controller[name]
+    crossings = []
+
+    depleted = controller.watch_threshold(name, 1, lambda r, below: crossings.append(("depleted", below)))
+    low = controller.watch_threshold(name, 0.5, lambda r, below: crossings.append(("low", below)))
+    assert not depleted.below and not low.below
+
+    resource.adjust(-0.75)
+    assert low.below and not depleted.below
+
+    # Staying on the same side of a threshold does not call back
+    resource.adjust(-1)
+    controller.adjust_all(-resource.max)
+    assert depleted.below
+
+    # Float thresholds follow changes to max
+    controller.restore_all()
+    resource.max *= 4
+    assert low.below
+
+    assert crossings == [("low", True), ("depleted", True), ("depleted", False), ("low", False), ("low", True)]
+
+    depleted.cancel()
+    low.cancel()
+    assert resource._listeners == []
+
+    with pytest.raises(TypeError):
+        controller.watch_threshold(name, "1")
@@ -178,3 +178,32 @@ def test_random_attach_detach(item_ids: list[int], seed):
                 raise TypeError("Unexpected resource modifier type")
 
         verify_maxes()
+
+
+def test_repeated_attach_detach():
+    """
+    Verify that a modifier may be attached more than once, and that each detach removes a single attachment
+    """
+    dummy_entity = CombatEntity(0, 0, name="Dummy", id=-110)
+    controller = dummy_entity.resource_controller
+    tr_health_initial = controller.get_max(f"{TEST_PREFIX}health")
+
+    e_instance = item_manager.get_instance(-116)
+    for _ in range(3):
+        controller.attach_modifier(e_instance)
+
+    assert controller.get_modifiers(f"{TEST_PREFIX}health", float) == [e_instance] * 3
+    assert controller.get_max(f"{TEST_PREFIX}health") == round(tr_health_initial * (1 + 0.1 * 3))
+
+    controller.detach_modifier(e_instance)
+    assert len(controller.get_modifiers(f"{TEST_PREFIX}health", float)) == 2
+
+    controller.detach_modifier(e_instance)
+    controller.detach_modifier(e_instance)
+
+    # Totals are exact once every modifier is detached
+    assert controller.get_max(f"{TEST_PREFIX}health") == tr_health_initial
+    assert controller._percent_modifiers[controller.schema.index[f"{TEST_PREFIX}health"]] == 0.0
+
+    with pytest.raises(RuntimeError):
+        controller.detach_modifier(e_instance)
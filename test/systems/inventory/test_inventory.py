@@ -34,6 +34,20 @@ def test_full():
     assert iv.full
 
 
+def test_fingerprint():
+    """Test that InventoryController::fingerprint changes with the contents of the inventory"""
+    iv = InventoryController()
+    empty = iv.fingerprint
+
+    iv.new_stack(-110, 2)
+    filled = iv.fingerprint
+    assert filled != empty
+    assert iv.fingerprint == filled
+
+    iv.consume_item(-110, 1)
+    assert iv.fingerprint != filled
+
+
 def test_size():
     """Trivially test that InventoryController::size increments as stacks are created"""
     iv = InventoryController()
@@ -379,3 +393,93 @@ def test_from_json():
     assert iv.total_quantity(-110) == 1
     assert iv.total_quantity(-111) == 2
     assert len(iv) == 2
+
+
+def test_index_consistency():
+    """Test that the item index matches the stacks after a random sequence of mutations"""
+    import copy
+    import random
+
+    rand = random.Random(2024)
+    iv = InventoryController(capacity=12)
+
+    for _ in range(300):
+        item_id = rand.choice([-110, -111, -112])
+        match rand.randint(0, 3):
+            case 0 | 1:
+                iv.insert_item(item_id, rand.randint(1, 5))
+            case 2:
+                iv.consume_item(item_id, rand.randint(1, 5))
+            case 3:
+                if iv.size > 0:
+                    iv.drop_stack(rand.randint(0, iv.size - 1))
+
+        for copied in (iv, copy.deepcopy(iv)):
+            for i in (-110, -111, -112):
+                stacks = [stack for stack in copied.items if stack.id == i]
+                assert copied.total_quantity(i) == sum(stack.quantity for stack in stacks)
+                assert (i in copied) == (len(stacks) > 0)
+                assert all(a is b for a, b in zip(copied._all_stacks(i), stacks))
+
+
+def test_consume_item_leaves_other_stacks():
+    """Test that consuming an item only rearranges the stacks of that item"""
+    iv = InventoryController()
+    iv.new_stack(-111, 1)
+    iv.new_stack(-110, 1)
+    iv.new_stack(-111, 1)
+    iv.new_stack(-110, 2)
+
+    assert iv.consume_item(-110, 1)
+    assert iv.fingerprint == ((-111, 1), (-111, 1), (-110, 2))
+
+
+def test_transaction():
+    """Test that a transaction combines and applies its consumes and inserts"""
+    iv = InventoryController()
+    iv.new_stack(-110, 1)
+    iv.new_stack(-111, 3)
+    iv.new_stack(-110, 2)
+
+    with iv.transaction() as transaction:
+        transaction.consume(-110, 1).consume(-110, 1).insert(-112, 2).insert(-112, 1)
+
+    assert transaction.committed
+    assert iv.fingerprint == ((-111, 3), (-110, 1), (-112, 3))
+
+    with pytest.raises(RuntimeError):
+        transaction.commit()
+
+
+def test_transaction_rollback():
+    """Test that a transaction that cannot be applied in full leaves the inventory unchanged"""
+    iv = InventoryController()
+    iv.capacity = 2
+    iv.new_stack(-110, 1)
+    iv.new_stack(-110, 2)
+    before = iv.fingerprint
+
+    # Not enough to consume
+    with pytest.raises(ValueError):
+        iv.transaction().consume(-110, 4).commit()
+
+    # Inserts overflow after the consume has been applied
+    with pytest.raises(ValueError):
+        iv.transaction().consume(-110, 1).insert(-111, 7).commit()
+
+    assert iv.fingerprint == before
+    assert iv.total_quantity(-110) == 3
+    assert -111 not in iv
+
+    # An error inside the block discards the transaction
+    with pytest.raises(KeyError):
+        with iv.transaction() as transaction:
+            transaction.consume(-110, 3)
+            raise KeyError()
+
+    assert iv.fingerprint == before
+
+    # Overflow may be reported instead
+    transaction = iv.transaction(allow_overflow=True).consume(-110, 3).insert(-111, 7)
+    assert transaction.commit() == {-111: 1}
+    assert iv.total_quantity(-111) == 6
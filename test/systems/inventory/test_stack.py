@@ -1,3 +1,5 @@
+import pytest
+
 from game.systems.inventory.inventory_controller import Stack
 
 
@@ -11,4 +13,20 @@ def test_init():
     assert st.id == -110
 
     assert st.ref is not None
-    assert st.ref.id == -110
\ No newline at end of file
+    assert st.ref.id == -110
+
+
+def test_lazy_ref():
+    """
+    Test that a Stack is a plain record, and that its Item is looked up on access from a shared table
+    """
+    st = Stack(-110, 2)
+
+    assert not hasattr(st, "__dict__")
+    assert st.ref is Stack(-110, 1).ref
+    assert st.ref.max_quantity > 0
+
+    # Unknown ids are only reported once the Item is needed
+    unknown = Stack(-999999, 1)
+    with pytest.raises(ValueError):
+        unknown.ref
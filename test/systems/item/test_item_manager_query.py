@@ -0,0 +1,59 @@
+import pytest
+
+from game.cache import from_cache
+from game.structures.enums import TargetMode
+from game.systems.item.item import Equipment, Item
+
+from ..utils import temporary_item
+
+
+def test_query_by_class_and_slot():
+    item_manager = from_cache("managers.ItemManager")
+
+    rings = item_manager.query(cls="Equipment", slot="ring")
+    assert item_manager.get_ref(-114).name in [r.name for r in rings]
+    assert all(isinstance(r, Equipment) and r.slot == "ring" for r in rings)
+
+    legs = {i.id for i in item_manager.query(slot="legs")}
+    assert {-116, -117, -118, -119}.issubset(legs)
+
+
+def test_query_by_currency():
+    item_manager = from_cache("managers.ItemManager")
+
+    assert -110 in [i.id for i in item_manager.query(currency=-111)]
+    assert -111 not in [i.id for i in item_manager.query(currency=-111)]
+
+
+def test_query_skips_removed_items():
+    item_manager = from_cache("managers.ItemManager")
+
+    with temporary_item([Item("_tr_Query Item", -200, "", 1)]):
+        assert [i.id for i in item_manager.query(name="_tr_Query Item")] == \
+               [-200]
+
+    assert item_manager.query(name="_tr_Query Item") == []
+
+
+def test_query_unknown_index():
+    with pytest.raises(ValueError):
+        from_cache("managers.ItemManager").query(colour="red")
+
+
+def test_query_command():
+    item_manager = from_cache("managers.ItemManager")
+
+    assert "-114" in item_manager.handle_command("query cls=Equipment slot=ring")
+    assert "-115" not in item_manager.handle_command(
+        "query cls=Equipment slot=ring"
+    )
+
+
+def test_query_command_enum_key():
+    ability_manager = from_cache("managers.AbilityManager")
+
+    names = ability_manager.handle_command("query target_mode=all_enemies")
+    assert names == [
+        a.name for a in ability_manager.query(target_mode=TargetMode.ALL_ENEMY)
+    ]
+    assert "Shortcuts are Great" in names
@@ -0,0 +1,128 @@
+from enum import Enum
+
+import pytest
+
+import game
+from game.game_state_controller import GameStateController, \
+    SilentStateBudgetExceeded
+from game.structures.enums import InputType
+from game.structures.messages import ComponentFactory
+from game.structures.state_device import FiniteStateDevice
+from game.systems.event.events import TextEvent
+
+
+class LoopingStateDevice(FiniteStateDevice):
+    """
+    A device that bounces between two silent states forever.
+    """
+
+    class States(Enum):
+        DEFAULT = 0
+        A = 1
+        B = 2
+        TERMINATE = -1
+
+    def __init__(self):
+        super().__init__(InputType.SILENT, self.States)
+
+    @FiniteStateDevice.logic_provider(States.DEFAULT, InputType.SILENT)
+    def _default_logic(self, _: any) -> None:
+        self.set_state(self.States.A)
+
+    @FiniteStateDevice.logic_provider(States.A, InputType.SILENT)
+    def _a_logic(self, _: any) -> None:
+        self.set_state(self.States.B)
+
+    @FiniteStateDevice.logic_provider(States.B, InputType.SILENT)
+    def _b_logic(self, _: any) -> None:
+        self.set_state(self.States.A)
+
+
+class SettlingStateDevice(FiniteStateDevice):
+    """
+    A device that passes through two silent states before requesting input.
+    """
+
+    class States(Enum):
+        DEFAULT = 0
+        A = 1
+        B = 2
+        TERMINATE = -1
+
+    def __init__(self):
+        super().__init__(InputType.SILENT, self.States)
+
+    @FiniteStateDevice.logic_provider(States.DEFAULT, InputType.SILENT)
+    def _default_logic(self, _: any) -> None:
+        self.set_state(self.States.A)
+
+    @FiniteStateDevice.logic_provider(States.A, InputType.SILENT)
+    def _a_logic(self, _: any) -> None:
+        self.set_state(self.States.B)
+
+    @FiniteStateDevice.logic_provider(States.B, InputType.ANY)
+    def _b_logic(self, _: any) -> None:
+        self.set_state(self.States.TERMINATE)
+
+    @FiniteStateDevice.content_provider(States.B)
+    def _b_content(self) -> dict:
+        return ComponentFactory.get(["Settled"])
+
+
+def test_step_count_recorded():
+    controller = GameStateController()
+    controller.add_state_device(SettlingStateDevice())
+
+    frame = controller.get_current_frame()
+
+    assert frame.components["content"] == ["Settled"]
+    assert controller.advance_stats[-1].steps == 2
+
+
+def test_silent_cycle_step_budget():
+    controller = GameStateController(max_silent_steps=50)
+    controller.add_state_device(LoopingStateDevice())
+
+    with pytest.raises(SilentStateBudgetExceeded) as e:
+        controller.get_current_frame()
+
+    assert controller.advance_stats[-1].steps == 50
+    assert "LoopingStateDevice.States.A -> LoopingStateDevice.States.B" in \
+           str(e.value)
+
+
+def test_silent_cycle_time_budget():
+    controller = GameStateController(max_silent_steps=10 ** 9,
+                                     silent_time_budget=0.01)
+    controller.add_state_device(LoopingStateDevice())
+
+    with pytest.raises(SilentStateBudgetExceeded):
+        controller.get_current_frame()
+
+    assert controller.advance_stats[-1].elapsed >= 0.01
+
+
+def test_dead_devices_burned_only_when_reported():
+    controller = GameStateController()
+    device = SettlingStateDevice()
+    controller.add_state_device(device)
+
+    # Not reported via set_dead, so the device is not burned
+    controller.state_device_stack[-1][1].dead = True
+    assert controller._get_state_device() is device
+
+    controller.set_dead()
+    assert controller._get_state_device() is not device
+
+
+def test_terminated_device_burned():
+    controller = game.state_device_controller
+    controller.state_device_stack.clear()
+    controller.add_state_device(TextEvent("Hello"))
+
+    controller.get_current_frame()
+    controller.deliver_input("")
+    controller.get_current_frame()
+
+    assert controller.advance_stats[-1].devices_burned == 1
+    assert not isinstance(controller._get_state_device(), TextEvent)